@@ -0,0 +1,118 @@
+# app/Logic/ConcurrencyController.py
+
+import logging
+import time
+import psutil
+
+
+class ConcurrencyController:
+    """
+    Подбирает количество активных слотов по нагрузке на машину.
+
+    Раз в sample_interval секунд снимает загрузку CPU и памяти системы, а
+    также CPU и RSS дерева дочерних процессов. Если CPU или память выше
+    верхнего порога — число слотов уменьшается, если и CPU, и память ниже
+    нижнего порога — увеличивается; между порогами (гистерезис) значение не
+    меняется. После каждого изменения выдерживается cooldown замеров.
+
+    Замер дерева процессов задаёт цену слота: его доля CPU (tree_cpu / target,
+    в долях всех ядер) и RSS (tree_rss / target, с потомками — Chrome,
+    chromedriver). Слоты добавляются, только если загрузка после добавления
+    step слотов такой цены останется ниже верхних порогов: иначе контроллер
+    колебался бы между ростом и сбросом, когда один слот — это браузер на
+    сотни мегабайт.
+    """
+
+    def __init__(self, min_slots, max_slots, cpu_high=85.0, cpu_low=60.0, memory_high=85.0,
+                 memory_low=70.0, sample_interval=2.0, step=1, cooldown=2):
+        self.min_slots = max(1, min(min_slots, max_slots))
+        self.max_slots = max_slots
+        self.cpu_high = cpu_high
+        self.cpu_low = cpu_low
+        self.memory_high = memory_high
+        self.memory_low = memory_low
+        self.sample_interval = sample_interval
+        self.step = step
+        self.cooldown = cooldown
+        # Начинаем с минимума и наращиваем, пока машина справляется
+        self.target = self.min_slots
+        self._samples_since_change = cooldown
+        self._next_sample = 0.0
+        self._processes = {}  # Ключ: pid, Значение: psutil.Process (для замеров cpu_percent)
+        self._cpu_count = psutil.cpu_count() or 1
+        psutil.cpu_percent(interval=None)  # Первый вызов задаёт точку отсчёта
+
+    def seconds_until_sample(self):
+        return max(0.0, self._next_sample - time.monotonic())
+
+    def sample_tree(self, root_pids):
+        """
+        Возвращает суммарные CPU (%) и RSS (байт) процессов root_pids и всех их потомков.
+        """
+        seen = {}
+        for pid in root_pids:
+            try:
+                root = self._processes.get(pid) or psutil.Process(pid)
+                seen[pid] = root
+                for child in root.children(recursive=True):
+                    seen[child.pid] = self._processes.get(child.pid, child)
+            except psutil.Error:
+                continue
+        self._processes = seen
+
+        cpu = 0.0
+        rss = 0
+        for process in seen.values():
+            try:
+                cpu += process.cpu_percent(interval=None)
+                rss += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return cpu, rss
+
+    def sample_system(self):
+        """
+        Возвращает загрузку CPU системы (%), занятую память (%) и объём памяти (байт).
+        """
+        memory = psutil.virtual_memory()
+        return psutil.cpu_percent(interval=None), memory.percent, memory.total
+
+    def update(self, root_pids):
+        """
+        Снимает замер, если подошло время, и пересчитывает целевое количество слотов.
+
+        :param root_pids: PID процессов пула (их потомки учитываются автоматически).
+        :return: Новое значение target, если оно изменилось, иначе None.
+        """
+        now = time.monotonic()
+        if now < self._next_sample:
+            return None
+        self._next_sample = now + self.sample_interval
+
+        cpu, memory, memory_total = self.sample_system()
+        tree_cpu, tree_rss = self.sample_tree(root_pids)
+        # Цена одного слота в процентах загрузки системы
+        slot_cpu = tree_cpu / self._cpu_count / self.target
+        slot_memory = tree_rss / memory_total * 100 / self.target if memory_total else 0.0
+        self._samples_since_change += 1
+        logging.debug(f"Нагрузка: CPU {cpu:.0f}%, память {memory:.0f}%, "
+                      f"процессы пула: CPU {tree_cpu:.0f}%, RSS {tree_rss / 2 ** 20:.0f} МБ, "
+                      f"на слот: CPU {slot_cpu:.1f}%, память {slot_memory:.1f}%, "
+                      f"активных слотов {self.target}")
+
+        if self._samples_since_change <= self.cooldown:
+            return None
+
+        target = self.target
+        if cpu > self.cpu_high or memory > self.memory_high:
+            target = max(self.min_slots, self.target - self.step)
+        elif (cpu < self.cpu_low and memory < self.memory_low
+              and cpu + slot_cpu * self.step <= self.cpu_high
+              and memory + slot_memory * self.step <= self.memory_high):
+            target = min(self.max_slots, self.target + self.step)
+
+        if target == self.target:
+            return None
+        self.target = target
+        self._samples_since_change = 0
+        return target
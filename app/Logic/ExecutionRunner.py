@@ -0,0 +1,422 @@
+# app/Logic/ExecutionRunner.py
+
+import logging
+import threading
+import time
+from collections import deque
+from app.Logic.WorkerPool import ReadyWaiter, WorkerPool
+
+# Режимы планирования (значения general_settings.scheduling_mode)
+SCHEDULING_CHAIN = "Цепочка"  # вся цепочка задач выполняется одним процессом
+SCHEDULING_PIPELINE = "Конвейер"  # каждая задача цепочки — отдельная единица работы
+SCHEDULING_MODES = (SCHEDULING_CHAIN, SCHEDULING_PIPELINE)
+
+# Вид ресурса задач без подсказки resources.kind в манифесте
+DEFAULT_RESOURCE_KIND = "default"
+
+# Время (с), за которое выполнения должны завершиться после stop()
+DEFAULT_DRAIN_TIMEOUT = 10
+# Время (с) на обработку отмены задачами после истечения drain_timeout
+CANCEL_GRACE = 1.0
+
+
+class ExecutionRunner:
+    """
+    Цикл выдачи выполнений процессам пула без зависимости от Qt.
+
+    Используется LogicThread в интерфейсе и консольным запуском (app.cli).
+    Изменения состояния передаются через status_callback(str).
+
+    Выполнение цепочки разбито на этапы. В режиме «Цепочка» этап один — вся
+    цепочка в одном процессе. В режиме «Конвейер» каждая задача — отдельный
+    этап, который выполняется пулом своего вида ресурса (resources.kind из
+    манифеста) с собственным лимитом параллельности из resource_limits;
+    цепочки переходят между пулами по мере завершения этапов.
+
+    Остановка (stop) плавная: новые этапы не выдаются, а начатые выполнения
+    дорабатывают без отмены не дольше drain_timeout секунд. По истечении
+    срока задачи получают отмену через CancellationToken и CANCEL_GRACE
+    секунд на её обработку; оставшиеся процессы и их потомки завершаются
+    принудительно, итог остановки записывается в stop_report.
+
+    При suspend_on_pause пауза приостанавливает процессы пула и их потомков
+    (psutil suspend) и освобождает CPU; время паузы не учитывается в
+    показателях производительности (active_seconds, throughput).
+    """
+
+    def __init__(self, thread_count, tasks, mode, execution_count, tasks_directory, log_queue,
+                 max_executions_per_worker=0, task_index=None, status_callback=None,
+                 scheduling_mode=SCHEDULING_CHAIN, resource_limits=None, concurrency_controller=None,
+                 concurrency_callback=None, drain_timeout=DEFAULT_DRAIN_TIMEOUT, suspend_on_pause=True,
+                 worker_concurrency=1):
+        self.thread_count = thread_count  # Максимальное количество параллельных процессов
+        self.tasks = tasks  # Список всех выбранных задач
+        self.mode = mode  # "Ограничение" или "Бесконечный"
+        self.execution_count = execution_count  # Общее количество выполнений
+        self.status_callback = status_callback or (lambda status: None)
+        self.scheduling_mode = scheduling_mode
+        # Ключ: вид ресурса, Значение: количество процессов (по умолчанию thread_count)
+        self.resource_limits = resource_limits or {}
+        # Автомасштабирование: ConcurrencyController ограничивает число активных
+        # слотов; пулы создаются на максимум, лишние процессы простаивают
+        self.concurrency_controller = concurrency_controller
+        self.concurrency_callback = concurrency_callback or (lambda slots: None)
+        # Одновременных выполнений в одном процессе пула (asyncio, см. worker_entry)
+        self.worker_concurrency = max(1, worker_concurrency)
+
+        # Этапы цепочки: список (вид ресурса, задачи этапа)
+        if scheduling_mode == SCHEDULING_PIPELINE:
+            self.stages = [(self._resource_kind(task_index, task_name), [task_name])
+                           for task_name in tasks]
+        else:
+            self.stages = [(DEFAULT_RESOURCE_KIND, list(tasks))]
+
+        # Отдельный пул на каждый вид ресурса; номера процессов не пересекаются
+        self.pools = {}
+        # Ожидание событий всех пулов одним селектором (см. ReadyWaiter)
+        self._waiter = ReadyWaiter()
+        first_number = 1
+        for kind, _ in self.stages:
+            if kind in self.pools:
+                continue
+            if self.scheduling_mode == SCHEDULING_PIPELINE:
+                slot_count = self.resource_limits.get(kind, thread_count)
+            else:
+                slot_count = thread_count
+            self.pools[kind] = WorkerPool(
+                slot_count=slot_count,
+                log_queue=log_queue,
+                tasks_directory=tasks_directory,
+                max_executions_per_worker=max_executions_per_worker,
+                task_index=task_index,
+                first_number=first_number,
+                concurrency=self.worker_concurrency)
+            first_number += slot_count
+        # Не больше активных цепочек, чем мест во всех пулах
+        self.max_chains_in_flight = sum(
+            pool.capacity for pool in self.pools.values())
+        self.queues = {kind: deque() for kind in self.pools}  # Ожидающие этапы
+        self.chain_stage = {}  # Ключ: execution_id, Значение: индекс текущего этапа
+
+        self._is_running = True
+        self.executions_started = 0  # Количество запущенных выполнений
+
+        # Плавная остановка
+        self.drain_timeout = drain_timeout
+        self._stop_requested_at = None  # time.monotonic() вызова stop()
+        self._drain_deadline = None
+        self.stop_report = None  # Итог остановки, заполняется в run()
+
+        # Механизм паузы
+        self.pause_condition = threading.Condition()
+        self.paused = False
+        self.suspend_on_pause = suspend_on_pause  # Приостанавливать процессы пула на паузе
+        self.paused_seconds = 0.0  # Суммарное время на паузе
+
+        # Показатели производительности
+        self.executions_finished = 0
+        self.executions_failed = 0  # Из них завершились ошибкой или отменой
+        self._started_at = None
+
+    @staticmethod
+    def _resource_kind(task_index, task_name):
+        entry = (task_index or {}).get(task_name) or {}
+        return (entry.get('resources') or {}).get('kind', DEFAULT_RESOURCE_KIND)
+
+    def busy_count(self):
+        return sum(pool.busy_count() for pool in self.pools.values())
+
+    def run(self):
+        """
+        Выполняет цепочку задач заданное количество раз (или бесконечно) и
+        возвращается после завершения всех выполнений или вызова stop().
+        """
+        try:
+            logging.debug(f"ExecutionRunner запущен с thread_count={
+                          self.thread_count}, execution_count={self.execution_count}, mode={self.mode}, "
+                          f"scheduling_mode={self.scheduling_mode}, worker_concurrency={self.worker_concurrency}")
+            if self.scheduling_mode == SCHEDULING_PIPELINE:
+                logging.info("Конвейер: " + ", ".join(
+                    f"'{tasks[0]}' -> {kind} ({self.pools[kind].slot_count} процессов)"
+                    for kind, tasks in self.stages))
+            for pool in self.pools.values():
+                pool.start()
+            self._started_at = time.monotonic()
+            self.status_callback("Запущен")
+            self.concurrency_callback(self.active_slots())
+
+            while self._is_running and (self.mode == "Бесконечный" or self.executions_started < self.execution_count):
+                self._check_paused()
+                self._autoscale()
+                self._admit_chains()
+                self._dispatch()
+
+                # Блокирующее ожидание завершения этапов, падения процессов
+                # или пробуждения из stop()/pause()
+                if self._collect_finished():
+                    break
+
+            # Ожидание завершения всех выполнений перед выходом; пауза действует
+            # и здесь — в режиме «Конвейер» цепочки ещё переходят между этапами
+            while self._is_running and self.chain_stage:
+                self._check_paused()
+                self._autoscale()
+                self._dispatch()
+                self._collect_finished()
+
+            if self._is_running:
+                for pool in self.pools.values():
+                    pool.shutdown()
+            else:
+                self._drain()
+
+        except Exception as e:
+            logging.error(f"ExecutionRunner: Произошла ошибка: {e}")
+            self.status_callback("Ошибка")
+        finally:
+            # Принудительно завершить оставшиеся процессы и их потомков
+            interrupted = self.busy_count()
+            for pool in self.pools.values():
+                pool.terminate()
+            self._waiter.close()
+            if self._started_at is not None:
+                self._report_throughput()
+            if self._stop_requested_at is not None:
+                self._report_stop(interrupted)
+
+    def _check_paused(self):
+        """
+        Если выполнение на паузе, ожидает её снятия (или stop()).
+        """
+        with self.pause_condition:
+            if self.paused and self._is_running:
+                self._wait_paused()
+
+    def _wait_paused(self):
+        """
+        Ожидает снятия паузы; вызывается под pause_condition.
+        """
+        paused_at = time.monotonic()
+        suspended = []
+        if self.suspend_on_pause:
+            for pool in self.pools.values():
+                suspended.append((pool, pool.suspend()))
+            logging.info(f"Пауза: приостановлено процессов: {
+                         sum(len(processes) for _, processes in suspended)}")
+        while self.paused and self._is_running:
+            self.status_callback("Пауза")
+            self.pause_condition.wait()
+            if not self.paused:
+                self.status_callback("Запущен")
+        if suspended:
+            resumed = sum(pool.resume(processes) for pool, processes in suspended)
+            logging.info(f"Пауза снята: возобновлено процессов: {resumed}")
+        self.paused_seconds += time.monotonic() - paused_at
+
+    def active_seconds(self):
+        """
+        Время работы без учёта пауз в секундах.
+        """
+        if self._started_at is None:
+            return 0.0
+        return time.monotonic() - self._started_at - self.paused_seconds
+
+    def throughput(self):
+        """
+        Завершённых выполнений в минуту без учёта времени на паузе.
+        """
+        active_seconds = self.active_seconds()
+        return self.executions_finished * 60 / active_seconds if active_seconds > 0 else 0.0
+
+    def _report_throughput(self):
+        logging.info(f"Завершено выполнений: {self.executions_finished} за {
+                     self.active_seconds():.1f} с работы (пауза {self.paused_seconds:.1f} с), "
+                     f"{self.throughput():.1f} в минуту")
+
+    def _drain(self):
+        """
+        Даёт начатым выполнениям завершиться до истечения drain_timeout.
+        Этапы, ещё не переданные процессам, отбрасываются. По истечении срока
+        задачи получают отмену и CANCEL_GRACE секунд на её обработку.
+        """
+        if not self._collect_until():
+            drain_timeout = self._drain_deadline - self._stop_requested_at
+            logging.warning(f"Выполнения не завершились за {
+                            drain_timeout:.1f} с, задачам передана отмена: {self.busy_count()}")
+            for pool in self.pools.values():
+                pool.cancel()  # Задачи видят отмену через CancellationToken
+            # При stop(drain_timeout=0) процессы завершаются сразу
+            grace = min(CANCEL_GRACE, drain_timeout)
+            if not self._collect_until(time.monotonic() + grace):
+                logging.warning(f"Выполнения не завершились после отмены, "
+                                f"процессы будут завершены принудительно: {self.busy_count()}")
+                return
+        # Свободные процессы завершаются штатно за оставшееся время
+        remaining = max(0.0, self._drain_deadline - time.monotonic())
+        for pool in self.pools.values():
+            pool.shutdown(timeout=remaining)
+
+    def _collect_until(self, deadline=None):
+        """
+        Собирает завершения, пока есть начатые выполнения и не наступил deadline.
+
+        :param deadline: time.monotonic() окончания; None — текущий срок остановки
+                         (повторный stop() может его сократить).
+        :return: True, если все начатые выполнения завершились.
+        """
+        while self.busy_count():
+            remaining = (self._drain_deadline if deadline is None else deadline) - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._collect_finished(timeout=remaining)
+        return True
+
+    def _report_stop(self, interrupted):
+        self.stop_report = {
+            'latency': time.monotonic() - self._stop_requested_at,
+            'interrupted': interrupted,
+            'workers_killed': sum(pool.workers_killed for pool in self.pools.values()),
+            'orphans_killed': sum(pool.orphans_killed for pool in self.pools.values()),
+            'leaked_processes': sum(pool.leaked_processes for pool in self.pools.values()),
+        }
+        log = logging.warning if self.stop_report['leaked_processes'] else logging.info
+        log("Остановка завершена за {latency:.2f} с: прервано выполнений {interrupted}, "
+            "процессов пула завершено принудительно {workers_killed}, "
+            "дочерних процессов добито {orphans_killed}, "
+            "не удалось завершить {leaked_processes}".format(**self.stop_report))
+
+    def active_slots(self):
+        """
+        Текущее эффективное количество параллельных слотов.
+        """
+        if self.concurrency_controller is None:
+            return self.max_chains_in_flight
+        return sum(self._pool_cap(pool) for pool in self.pools.values())
+
+    def _pool_cap(self, pool):
+        """
+        Доля слотов пула, разрешённая контроллером нагрузки.
+        """
+        if self.concurrency_controller is None:
+            return pool.capacity
+        controller = self.concurrency_controller
+        return max(1, round(pool.capacity * controller.target / controller.max_slots))
+
+    def _autoscale(self):
+        if self.concurrency_controller is None:
+            return
+        pids = []
+        for pool in self.pools.values():
+            pids.extend(pool.worker_pids())
+        target = self.concurrency_controller.update(pids)
+        if target is not None:
+            logging.info(f"Автомасштабирование: активных слотов {
+                         self.active_slots()}")
+            self.concurrency_callback(self.active_slots())
+
+    def _admit_chains(self):
+        """
+        Запускает новые цепочки, пока не достигнут лимит запусков и есть место.
+        """
+        while (self._is_running and len(self.chain_stage) < self.active_slots()
+               and (self.mode != "Ограничение" or self.executions_started < self.execution_count)):
+            self.executions_started += 1
+            self.chain_stage[self.executions_started] = 0
+            self.queues[self.stages[0][0]].append(self.executions_started)
+
+    def _dispatch(self):
+        """
+        Передаёт ожидающие этапы свободным процессам соответствующих пулов.
+        """
+        for kind, pool in self.pools.items():
+            queue = self.queues[kind]
+            cap = self._pool_cap(pool)
+            while self._is_running and queue and pool.has_idle_slot() and pool.busy_count() < cap:
+                execution_id = queue.popleft()
+                stage_tasks = self.stages[self.chain_stage[execution_id]][1]
+                process_number = pool.submit(execution_id, stage_tasks.copy())
+                logging.info(f"Процесс {process_number} получил выполнение {
+                             execution_id} с задачами: {stage_tasks}")
+                self.status_callback(f"Запущено процессов: {
+                                     self.busy_count()}")
+
+    def _collect_finished(self, timeout=None):
+        """
+        Обрабатывает завершённые этапы и переводит цепочки на следующий этап.
+
+        :param timeout: Максимальное время ожидания событий в секундах (None — без ограничения).
+        :return: True, если достигнут лимит выполнений и работа завершена.
+        """
+        wait_objects = [pool.wait_objects() for pool in self.pools.values()]
+        # При автомасштабировании просыпаемся к следующему замеру нагрузки
+        if timeout is None and self.concurrency_controller is not None:
+            timeout = self.concurrency_controller.seconds_until_sample()
+        ready = self._waiter.wait(wait_objects, timeout)
+
+        for kind, pool in self.pools.items():
+            for process_number, execution_id, ok in pool.process_ready(ready):
+                stage = self.chain_stage[execution_id] + 1
+                if ok and stage < len(self.stages) and self._is_running:
+                    self.chain_stage[execution_id] = stage
+                    self.queues[self.stages[stage][0]].append(execution_id)
+                    continue
+                del self.chain_stage[execution_id]
+                self.executions_finished += 1
+                if not ok:
+                    self.executions_failed += 1
+                logging.info(f"Выполнение {execution_id} завершилось{'' if ok else ' с ошибкой'}, "
+                             f"номер процесса: {process_number}")
+                self.status_callback(f"Запущено процессов: {
+                                     self.busy_count()}")
+
+        # Если достигнут лимит запусков, и нет активных выполнений, завершить работу
+        if self.mode == "Ограничение" and self.executions_started >= self.execution_count and not self.chain_stage:
+            logging.info(
+                "Достигнут лимит выполнений. Выполнение завершается.")
+            self.status_callback("Завершено")
+            return True
+        return False
+
+    def _wakeup(self):
+        for pool in self.pools.values():
+            pool.wakeup()
+
+    def stop(self, drain_timeout=None):
+        """
+        Запрашивает плавную остановку. Безопасно вызывать из любого потока,
+        в том числе повторно — с меньшим drain_timeout.
+
+        :param drain_timeout: Время на завершение начатых выполнений в секундах
+                              (None — self.drain_timeout, 0 — завершить сразу).
+        """
+        if drain_timeout is None:
+            drain_timeout = self.drain_timeout
+        now = time.monotonic()
+        if self._stop_requested_at is None:
+            self._stop_requested_at = now
+            self._drain_deadline = now + drain_timeout
+        else:
+            self._drain_deadline = min(self._drain_deadline, now + drain_timeout)
+        # Новые этапы не выдаются; отмену задачи получат в _drain по истечении срока
+        self._is_running = False
+        with self.pause_condition:
+            self.paused = False  # Убираем паузу, чтобы цикл мог выйти из wait
+            self.pause_condition.notify_all()
+        self._wakeup()
+        # Незавершившиеся процессы принудительно завершаются в run() после отмены
+
+    def pause(self):
+        with self.pause_condition:
+            self.paused = True
+        self._wakeup()
+
+    def resume(self):
+        """
+        :return: True, если выполнение было на паузе и возобновлено.
+        """
+        with self.pause_condition:
+            if not self.paused:
+                return False
+            self.paused = False
+            self.pause_condition.notify_all()
+            return True
@@ -0,0 +1,420 @@
+# app/Logic/WorkerPool.py
+
+import heapq  # Для эффективного управления доступными номерами
+import logging
+import selectors
+import sys
+import time
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+
+from app.Logic.worker_entry import worker_loop
+from app.utils import process_tree
+from app.utils.log_gate import shared_log_level
+from app.utils.log_transport import PipeLogTransport
+
+# Постоянный селектор для ожидания событий пула (см. ReadyWaiter)
+USE_SELECTOR = sys.platform != "win32"
+
+
+class ReadyWaiter:
+    """
+    Ожидание готовности объектов пулов (каналов, sentinel) на постоянном селекторе.
+
+    multiprocessing.connection.wait() на каждый вызов создаёт селектор и
+    регистрирует в нём все объекты — на сотне слотов это сотни системных
+    вызовов на каждое событие супервизора. Здесь селектор пересоздаётся,
+    только когда меняется хотя бы один из списков wait_objects() пулов
+    (пул кэширует список до смены процессов).
+
+    Постоянный селектор — только на POSIX: на Windows DefaultSelector
+    (select) принимает лишь сокеты, а каналы и sentinel процессов там —
+    дескрипторы объектов ядра. Там ожидание идёт через
+    multiprocessing.connection.wait (WaitForMultipleObjects).
+    """
+
+    def __init__(self, use_selector=None):
+        """
+        :param use_selector: Ждать на постоянном селекторе (None — на POSIX).
+        """
+        self.use_selector = USE_SELECTOR if use_selector is None else use_selector
+        self._selector = None
+        self._lists = ()
+
+    def wait(self, object_lists, timeout=None):
+        """
+        :param object_lists: Списки объектов ожидания (WorkerPool.wait_objects()).
+        :param timeout: Максимальное время ожидания в секундах (None — без ограничения).
+        :return: Список готовых объектов, как у multiprocessing.connection.wait.
+        """
+        if not self.use_selector:
+            return wait([obj for objects in object_lists for obj in objects], timeout)
+        if (self._selector is None or len(object_lists) != len(self._lists)
+                or any(a is not b for a, b in zip(object_lists, self._lists))):
+            self.close()
+            self._selector = selectors.DefaultSelector()
+            for objects in object_lists:
+                for obj in objects:
+                    self._selector.register(obj, selectors.EVENT_READ)
+            self._lists = tuple(object_lists)
+        return [key.fileobj for key, _ in self._selector.select(timeout)]
+
+    def close(self):
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        self._lists = ()
+
+
+class WorkerPool:
+    """
+    Пул долгоживущих дочерних процессов, закреплённых за номерами процессов.
+
+    Каждый номер процесса (слот) обслуживается одним процессом, который
+    держит импорты и TaskManager «тёплыми» и получает билеты выполнения через
+    собственный канал. После max_executions_per_worker выполнений процесс
+    слота перезапускается.
+
+    При concurrency > 1 процесс одновременно выполняет до concurrency
+    билетов в своём цикле asyncio (см. worker_entry.serve_concurrent), и
+    номер слота остаётся доступным, пока у процесса есть свободные места.
+
+    Остановка кооперативная: cancel() пишет в канал отмены каждого процесса,
+    и задачи видят отмену через CancellationToken. Процессы,
+    не успевшие завершиться, и их потомки (Chrome, chromedriver) завершаются
+    через psutil; счётчики workers_killed, orphans_killed и leaked_processes
+    позволяют отчитаться о результате остановки.
+    """
+
+    def __init__(self, slot_count, log_queue, tasks_directory, max_executions_per_worker=0, task_index=None,
+                 first_number=1, concurrency=1, log_level=None):
+        self.slot_count = slot_count
+        # Одновременных выполнений на процесс
+        self.concurrency = max(1, concurrency)
+        self.capacity = self.slot_count * self.concurrency
+        # Номер первого слота: несколько пулов одного запуска не пересекаются по номерам
+        self.first_number = first_number
+        self.log_queue = log_queue
+        # Общий уровень логирования: процессы не отправляют записи ниже него
+        self.log_level = log_level if log_level is not None else shared_log_level()
+        self.tasks_directory = tasks_directory
+        # 0 — процессы не перезапускаются
+        self.max_executions_per_worker = max_executions_per_worker
+        # Индекс реестра задач: процессы не сканируют и не импортируют все задачи заново
+        self.task_index = task_index
+        self.workers = {}  # Ключ: process_number, Значение: (Process, Connection)
+        self.busy = {}  # Ключ: process_number, Значение: множество execution_id
+        self.executions = {}  # Ключ: process_number, Значение: билетов, выданных текущему процессу
+        self._busy_total = 0
+        self.closed = False
+        # Признак кооперативной отмены. До процессов он доходит по отдельным
+        # каналам, а не через multiprocessing.Event: процесс, убитый во время
+        # Event.wait(), оставляет счётчик ожидающих, и следующий set() зависает
+        self.cancelled = False
+        self._cancel_writers = {}  # Ключ: process_number, Значение: Connection канала отмены
+        self.workers_killed = 0  # Процессов пула, завершённых принудительно
+        self.orphans_killed = 0  # Потомков, переживших свой процесс пула и завершённых
+        self.leaked_processes = 0  # Потомков, которые не удалось завершить
+        # Канал пробуждения: позволяет прервать блокирующее ожидание в poll()
+        # из другого потока (стоп, пауза, возобновление)
+        self._wakeup_reader, self._wakeup_writer = Pipe(duplex=False)
+        # Кэш объектов ожидания для poll(); сбрасывается при смене процессов
+        self._wait_map = None
+        self._waiter = ReadyWaiter()
+        # Номера процессов, у которых есть свободные места; изначально все
+        self.available_numbers = list(
+            range(first_number, first_number + self.slot_count))
+        # Превращаем список в мин-кучу для эффективного получения наименьшего номера
+        heapq.heapify(self.available_numbers)
+        self._available = set(self.available_numbers)  # Номера, находящиеся в куче
+
+    def start(self):
+        """
+        Запускает процессы для всех слотов пула.
+        """
+        for process_number in range(self.first_number, self.first_number + self.slot_count):
+            self._spawn(process_number)
+
+    def _spawn(self, process_number):
+        parent_conn, child_conn = Pipe()
+        cancel_reader, cancel_writer = Pipe(duplex=False)
+        # С PipeLogTransport каждый процесс пишет логи в собственный канал
+        log_target = self.log_queue
+        if isinstance(self.log_queue, PipeLogTransport):
+            log_target = self.log_queue.open_channel()
+        p = Process(target=worker_loop, args=(
+            process_number, child_conn, log_target, self.tasks_directory,
+            self.max_executions_per_worker, self.task_index, cancel_reader, self.concurrency,
+            self.log_level), daemon=True)
+        p.start()
+        child_conn.close()
+        cancel_reader.close()
+        if log_target is not self.log_queue:
+            log_target.close()
+        self.workers[process_number] = (p, parent_conn)
+        self._cancel_writers[process_number] = cancel_writer
+        if self.cancelled:
+            self._send_cancel(cancel_writer)
+        self.executions[process_number] = 0
+        self._wait_map = None
+        logging.info(f"Запущен дочерний процесс пула: PID {
+                     p.pid}, номер процесса: {process_number}")
+
+    def _retire(self, process_number, timeout=5):
+        self._retire_many([process_number], timeout)
+
+    def _retire_many(self, process_numbers, timeout=5, force=False):
+        """
+        Дожидается завершения процессов слотов (или завершает их) вместе с потомками.
+
+        :param process_numbers: Номера слотов.
+        :param timeout: Общее время на штатное завершение в секундах.
+        :param force: Завершить процессы сразу, не дожидаясь их выхода.
+        """
+        retired = [(process_number, *self.workers.pop(process_number))
+                   for process_number in process_numbers]
+        self._wait_map = None
+        # Снимок потомков до выхода процессов: после него они уйдут к init
+        children = process_tree.descendants(
+            [p.pid for _, p, _ in retired if p.is_alive()])
+        if not force:
+            deadline = time.monotonic() + timeout
+            for _, p, _ in retired:
+                p.join(max(0.0, deadline - time.monotonic()))
+        stuck = [p for _, p, _ in retired if p.is_alive()]
+        for p in stuck:
+            p.terminate()
+        for p in stuck:
+            p.join(1)
+            if p.is_alive():
+                p.kill()
+                p.join()
+        self.workers_killed += len(stuck)
+
+        killed, survivors = process_tree.kill_processes(children)
+        if killed:
+            logging.warning(f"Завершено {killed} дочерних процессов, оставшихся после процессов пула "
+                            f"(браузеры, драйверы).")
+        self.orphans_killed += killed
+        self.leaked_processes += len(survivors)
+        for process_number, _, conn in retired:
+            conn.close()
+            self._cancel_writers.pop(process_number).close()
+
+    def has_idle_slot(self):
+        return bool(self.available_numbers)
+
+    def worker_pids(self):
+        return [p.pid for p, _ in list(self.workers.values()) if p.pid]
+
+    def busy_count(self):
+        return self._busy_total
+
+    def suspend(self):
+        """
+        Приостанавливает процессы пула вместе с потомками (браузерами).
+
+        :return: Список приостановленных psutil.Process для resume().
+        """
+        return process_tree.suspend_tree(self.worker_pids())
+
+    def resume(self, suspended):
+        """
+        Возобновляет процессы, приостановленные suspend().
+
+        :return: Количество возобновлённых процессов.
+        """
+        return process_tree.resume_processes(suspended)
+
+    def cancel(self):
+        """
+        Сообщает задачам всех процессов пула о кооперативной отмене.
+        """
+        if self.cancelled:
+            return
+        self.cancelled = True
+        for cancel_writer in self._cancel_writers.values():
+            self._send_cancel(cancel_writer)
+
+    @staticmethod
+    def _send_cancel(cancel_writer):
+        try:
+            cancel_writer.send_bytes(b"\0")
+        except (BrokenPipeError, OSError):
+            pass  # Процесс уже завершился
+
+    def submit(self, execution_id, tasks):
+        """
+        Передаёт билет выполнения процессу с наименьшим свободным номером.
+
+        :param execution_id: Порядковый номер выполнения.
+        :param tasks: Список названий задач для выполнения.
+        :return: Номер процесса, получившего билет.
+        """
+        process_number = heapq.heappop(self.available_numbers)
+        self._available.discard(process_number)
+        _, conn = self.workers[process_number]
+        conn.send((execution_id, tasks))
+        self.busy.setdefault(process_number, set()).add(execution_id)
+        self._busy_total += 1
+        self.executions[process_number] += 1
+        self._offer(process_number)
+        return process_number
+
+    def _exhausted(self, process_number):
+        # Процесс получил все билеты до перезапуска и больше не принимает новые
+        return bool(self.max_executions_per_worker
+                    and self.executions[process_number] >= self.max_executions_per_worker)
+
+    def _offer(self, process_number):
+        """
+        Возвращает номер в кучу свободных, если у процесса есть место.
+        """
+        if (process_number in self._available or process_number not in self.workers
+                or self._exhausted(process_number)
+                or len(self.busy.get(process_number, ())) >= self.concurrency):
+            return
+        heapq.heappush(self.available_numbers, process_number)
+        self._available.add(process_number)
+
+    def _release(self, process_number, execution_id):
+        executions = self.busy.get(process_number)
+        if executions is None or execution_id not in executions:
+            return
+        executions.discard(execution_id)
+        self._busy_total -= 1
+        if not executions:
+            del self.busy[process_number]
+        self._offer(process_number)
+
+    def wakeup(self):
+        """
+        Прерывает блокирующее ожидание в poll(). Безопасно вызывать из любого потока.
+        """
+        try:
+            self._wakeup_writer.send_bytes(b"\0")
+        except (BrokenPipeError, OSError):
+            pass
+
+    def _drain_wakeups(self):
+        while self._wakeup_reader.poll():
+            self._wakeup_reader.recv_bytes()
+
+    def wait_objects(self):
+        """
+        Возвращает объекты для multiprocessing.connection.wait: каналы слотов,
+        sentinel процессов и канал пробуждения. Позволяет ожидать события
+        нескольких пулов одним вызовом wait().
+        """
+        if self._wait_map is None:
+            conn_to_number = {}
+            sentinel_to_number = {}
+            for process_number, (p, conn) in list(self.workers.items()):
+                conn_to_number[conn] = process_number
+                sentinel_to_number[p.sentinel] = process_number
+            wait_list = list(conn_to_number) + list(sentinel_to_number) + [self._wakeup_reader]
+            self._wait_map = (conn_to_number, sentinel_to_number, wait_list)
+        return self._wait_map[2]
+
+    def poll(self, timeout=None):
+        """
+        Ожидает событий пула: ответов процессов, их завершения (sentinel) или
+        вызова wakeup(), после чего обрабатывает их (см. process_ready).
+
+        :param timeout: Максимальное время ожидания событий в секундах (None — без ограничения).
+        :return: Список кортежей (process_number, execution_id, ok) завершённых выполнений.
+        """
+        return self.process_ready(self._waiter.wait([self.wait_objects()], timeout))
+
+    def process_ready(self, ready):
+        """
+        Собирает завершённые выполнения и перезапускает упавшие или
+        отработавшие свой лимит процессы.
+
+        :param ready: Готовые объекты, полученные от wait(); чужие объекты игнорируются.
+        :return: Список кортежей (process_number, execution_id, ok) завершённых
+                 выполнений; ok — False, если задача завершилась ошибкой или процесс упал.
+        """
+        self.wait_objects()
+        conn_to_number, sentinel_to_number, _ = self._wait_map
+
+        finished = []
+        if self._wakeup_reader in ready:
+            self._drain_wakeups()
+        for obj in ready:
+            if obj in conn_to_number:
+                process_number = conn_to_number[obj]
+                if process_number not in self.busy:
+                    continue
+                # В канале может быть несколько ответов одновременно работающих выполнений
+                while process_number in self.busy and obj.poll():
+                    try:
+                        execution_id, ok = obj.recv()
+                    except (EOFError, OSError):
+                        # Процесс упал — обработаем по sentinel
+                        break
+                    finished.append((process_number, execution_id, ok))
+                    self._release(process_number, execution_id)
+                if (self._exhausted(process_number) and process_number not in self.busy
+                        and not self.closed):
+                    self._retire(process_number)
+                    logging.debug(f"Процесс {
+                                  process_number} достиг лимита выполнений и будет перезапущен.")
+                    self._spawn(process_number)
+                    self._offer(process_number)
+
+        for obj in ready:
+            process_number = sentinel_to_number.get(obj)
+            if process_number is None or process_number not in self.workers:
+                continue
+            p, _ = self.workers[process_number]
+            if p.is_alive() or self.closed:
+                continue
+            logging.warning(f"Дочерний процесс пула неожиданно завершился: PID {
+                            p.pid}, номер процесса: {process_number}, код: {p.exitcode}")
+            for execution_id in sorted(self.busy.get(process_number, ())):
+                finished.append((process_number, execution_id, False))
+                self._release(process_number, execution_id)
+            self._retire(process_number)
+            self._spawn(process_number)
+            self._offer(process_number)
+
+        return finished
+
+    def shutdown(self, timeout=5):
+        """
+        Штатно завершает все процессы пула.
+
+        :param timeout: Общее время на завершение всех процессов в секундах.
+        """
+        self.closed = True
+        for process_number, (p, conn) in list(self.workers.items()):
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        workers = list(self.workers.items())
+        self._retire_many([process_number for process_number, _ in workers], timeout)
+        self._waiter.close()
+        for process_number, (p, _) in workers:
+            logging.info(f"Дочерний процесс завершился: PID {
+                         p.pid}, номер процесса: {process_number}")
+
+    def terminate(self):
+        """
+        Принудительно завершает все процессы пула вместе с их потомками.
+        """
+        self.closed = True
+        self.cancel()
+        workers = [(process_number, p, p.is_alive())
+                   for process_number, (p, _) in self.workers.items()]
+        self._retire_many([process_number for process_number, _, _ in workers], force=True)
+        for process_number, p, alive in workers:
+            if alive:
+                logging.info(f"Дочерний процесс принудительно завершен: PID {
+                             p.pid}, номер процесса: {process_number}")
+        self.busy.clear()
+        self._busy_total = 0
+        self._waiter.close()
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
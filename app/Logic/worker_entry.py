@@ -0,0 +1,342 @@
+# app/Logic/worker_entry.py
+"""
+Точка входа дочерних процессов пула.
+
+Модуль намеренно не импортирует PySide6 и модули интерфейса: при методе
+запуска spawn дочерний процесс загружает только его, логирование и
+TaskManager. Код задач импортируется лениво при первом выполнении.
+"""
+
+import asyncio
+import logging
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler
+from app.design.TaskManager import TaskManager
+from app.utils.cancellation import CancellationToken, TaskCancelled
+from app.utils.log_gate import LogFloodLimiter, watch_log_level
+from app.utils.log_transport import LogChannel, PipeLogHandler
+from app.utils.log_fields import (
+    EVENT_CHAIN_CANCELLED, EVENT_CHAIN_FAILED, EVENT_CHAIN_FINISHED, EVENT_CHAIN_STARTED,
+    EVENT_TASK_FINISHED, EVENT_TASK_STARTED, LogContextFilter, log_context, log_extra)
+
+
+def setup_worker_logging(log_queue, log_level=None):
+    """
+    Настраивает логирование дочернего процесса через QueueHandler.
+
+    Записи ниже общего уровня log_level не создаются, а повторы и потоки
+    записей сверх лимита отсекает LogFloodLimiter — до сериализации и
+    передачи в очередь.
+
+    :param log_queue: Очередь для логирования или LogChannel (PipeLogTransport).
+    :param log_level: Общий уровень логирования (multiprocessing.Value из
+                      log_gate.shared_log_level; None — все записи от DEBUG).
+    :return: Корневой логгер дочернего процесса.
+    """
+    if isinstance(log_queue, LogChannel):
+        handler = PipeLogHandler(log_queue)
+    else:
+        handler = QueueHandler(log_queue)
+    logger = logging.getLogger()
+    # При методе fork процесс наследует обработчики родителя (в том числе его
+    # QueueHandler) — без их удаления каждая запись попадала бы в очередь дважды
+    for inherited_handler in logger.handlers[:]:
+        logger.removeHandler(inherited_handler)
+    # Поля process_number/task из log_context для записей без extra
+    handler.addFilter(LogContextFilter())
+    handler.addFilter(LogFloodLimiter(handler))
+    logger.addHandler(handler)
+    if log_level is None:
+        logger.setLevel(logging.DEBUG)
+    else:
+        logger.setLevel(log_level.value)
+        threading.Thread(target=watch_log_level, args=(log_level, logger),
+                         daemon=True, name="log-level").start()
+    return logger
+
+
+def flush_worker_logging(logger, process_number=None):
+    """
+    Отправляет отложенные сводки LogFloodLimiter и записи, ещё не
+    отправленные обработчиком, перед завершением процесса.
+
+    :param process_number: Номер процесса для сводки об отброшенных записях.
+    """
+    for handler in logger.handlers:
+        for log_filter in handler.filters:
+            if isinstance(log_filter, LogFloodLimiter):
+                log_filter.flush()
+        dropped = getattr(handler, 'dropped', 0)
+        if dropped:
+            logger.warning(f"Процесс {process_number}: отброшено записей лога при переполнении "
+                           f"буфера: {dropped}", extra=log_extra(process_number))
+        handler.flush()
+
+
+def run_task_chain(task_manager, tasks, process_number, logger, cancel_token=None):
+    """
+    Последовательно выполняет цепочку задач с уже инициализированным TaskManager.
+
+    :param task_manager: Экземпляр TaskManager.
+    :param tasks: Список названий задач для выполнения.
+    :param process_number: Номер процесса для логирования.
+    :param logger: Логгер дочернего процесса.
+    :param cancel_token: CancellationToken; после отмены оставшиеся задачи цепочки не запускаются.
+    :return: True, если все задачи выполнены без ошибок.
+    """
+    cancel_token = cancel_token or CancellationToken()
+    with log_context(process_number):
+        # Логируем начало выполнения задач
+        logger.info(f"Процесс {process_number}: начал выполнение задач.",
+                    extra=log_extra(process_number, event=EVENT_CHAIN_STARTED))
+
+        try:
+            for task_name in tasks:
+                cancel_token.raise_if_cancelled()
+                # Записи задачи получают её имя и номер процесса из контекста
+                with log_context(process_number, task_name):
+                    # Логируем запуск каждой задачи
+                    logger.info(
+                        f"Процесс {process_number}: запустил задачу '{task_name}'.",
+                        extra=log_extra(process_number, task_name, EVENT_TASK_STARTED))
+
+                    # Выполнение задачи
+                    task_manager.execute_task(
+                        localized_task_name=task_name,
+                        shared_resources=None,
+                        thread_number=process_number,
+                        settings=None,
+                        cancel_token=cancel_token)
+
+                    # Логируем завершение каждой задачи
+                    logger.info(
+                        f"Процесс {process_number}: завершил выполнение задачи '{task_name}'.",
+                        extra=log_extra(process_number, task_name, EVENT_TASK_FINISHED))
+            return True
+
+        except TaskCancelled:
+            logger.info(f"Процесс {process_number}: выполнение отменено.",
+                        extra=log_extra(process_number, event=EVENT_CHAIN_CANCELLED))
+            return False
+
+        except Exception as e:
+            # Логируем ошибку, если задача не завершена
+            logger.error(f"Процесс {process_number}: ошибка выполнения задач: {e}",
+                         extra=log_extra(process_number, event=EVENT_CHAIN_FAILED))
+            return False
+
+        finally:
+            logger.info(f"Процесс {process_number}: все задачи завершены.",
+                        extra=log_extra(process_number, event=EVENT_CHAIN_FINISHED))
+
+
+async def run_task_chain_async(task_manager, tasks, process_number, logger, cancel_token, executor,
+                               task_limits):
+    """
+    Асинхронный вариант run_task_chain для процесса, выполняющего несколько
+    цепочек одновременно.
+
+    :param executor: Executor для синхронных задач.
+    :param task_limits: Функция имя задачи -> asyncio.Semaphore, ограничивающий
+                        одновременные выполнения задачи этого типа в процессе.
+    :return: True, если все задачи выполнены без ошибок.
+    """
+    # Каждая цепочка выполняется в своей asyncio.Task со своей копией
+    # контекста, поэтому log_context не смешивает одновременные цепочки
+    with log_context(process_number):
+        logger.info(f"Процесс {process_number}: начал выполнение задач.",
+                    extra=log_extra(process_number, event=EVENT_CHAIN_STARTED))
+
+        try:
+            for task_name in tasks:
+                cancel_token.raise_if_cancelled()
+                async with task_limits(task_name):
+                    with log_context(process_number, task_name):
+                        logger.info(
+                            f"Процесс {process_number}: запустил задачу '{task_name}'.",
+                            extra=log_extra(process_number, task_name, EVENT_TASK_STARTED))
+                        await task_manager.execute_task_async(
+                            localized_task_name=task_name,
+                            shared_resources=None,
+                            thread_number=process_number,
+                            settings=None,
+                            cancel_token=cancel_token,
+                            executor=executor)
+                        logger.info(
+                            f"Процесс {process_number}: завершил выполнение задачи '{task_name}'.",
+                            extra=log_extra(process_number, task_name, EVENT_TASK_FINISHED))
+            return True
+
+        except TaskCancelled:
+            logger.info(f"Процесс {process_number}: выполнение отменено.",
+                        extra=log_extra(process_number, event=EVENT_CHAIN_CANCELLED))
+            return False
+
+        except Exception as e:
+            logger.error(f"Процесс {process_number}: ошибка выполнения задач: {e}",
+                         extra=log_extra(process_number, event=EVENT_CHAIN_FAILED))
+            return False
+
+        finally:
+            logger.info(f"Процесс {process_number}: все задачи завершены.",
+                        extra=log_extra(process_number, event=EVENT_CHAIN_FINISHED))
+
+
+async def serve_concurrent(process_number, conn, logger, task_manager, cancel_token, max_executions,
+                           concurrency):
+    """
+    Цикл процесса пула, одновременно выполняющего до concurrency билетов.
+
+    Билеты читаются из канала отдельным потоком (на Windows цикл asyncio не
+    умеет ждать каналы multiprocessing). Задачи с async def run() работают
+    корутинами в цикле процесса, синхронные — в пуле потоков. Для типа
+    задачи лимит одновременных выполнений задаётся resources.concurrency в
+    manifest.yaml (по умолчанию — concurrency).
+
+    :return: Количество принятых билетов.
+    """
+    loop = asyncio.get_running_loop()
+    tickets = asyncio.Queue()
+    executor = ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix=f"process-{process_number}")
+    semaphores = {}  # Ключ: имя задачи, Значение: asyncio.Semaphore
+
+    def task_limits(task_name):
+        semaphore = semaphores.get(task_name)
+        if semaphore is None:
+            limit = task_manager.get_task_resources(task_name).get('concurrency') or concurrency
+            semaphore = semaphores[task_name] = asyncio.Semaphore(limit)
+        return semaphore
+
+    def read_tickets():
+        while True:
+            try:
+                ticket = conn.recv()
+            except (EOFError, OSError):
+                ticket = None
+            loop.call_soon_threadsafe(tickets.put_nowait, ticket)
+            if ticket is None:
+                return
+
+    async def execute(execution_id, tasks):
+        ok = await run_task_chain_async(task_manager, tasks, process_number, logger, cancel_token,
+                                        executor, task_limits)
+        try:
+            conn.send((execution_id, ok))
+        except (BrokenPipeError, OSError):
+            pass
+
+    threading.Thread(target=read_tickets, daemon=True,
+                     name=f"process-{process_number}-tickets").start()
+    running = set()
+    accepted = 0
+    while not max_executions or accepted < max_executions:
+        ticket = await tickets.get()
+        if ticket is None:
+            break
+        accepted += 1
+        execution = asyncio.create_task(execute(*ticket))
+        running.add(execution)
+        execution.add_done_callback(running.discard)
+
+    if running:
+        await asyncio.gather(*running)
+    executor.shutdown(wait=True)
+    return accepted
+
+
+def watch_cancellation(cancel_conn, cancel_token):
+    """
+    Отменяет cancel_token, когда родитель пишет в канал отмены или закрывает его.
+    """
+    try:
+        cancel_conn.recv_bytes()
+    except (EOFError, OSError):
+        pass  # Родитель закрыл канал или завершился — выполнять дальше незачем
+    cancel_token.cancel()
+
+
+def worker_loop(process_number, conn, log_queue, tasks_directory, max_executions=0, task_index=None,
+                cancel_conn=None, concurrency=1, log_level=None):
+    """
+    Главный цикл долгоживущего процесса пула.
+
+    Процесс один раз инициализирует логирование и TaskManager, после чего
+    получает из канала билеты выполнения вида (execution_id, tasks) и после
+    каждого выполнения отправляет обратно (execution_id, ok). None в канале
+    означает штатное завершение.
+
+    :param process_number: Номер слота, за которым закреплён процесс.
+    :param conn: Дочерний конец канала (multiprocessing.Pipe) слота.
+    :param log_queue: Очередь для логирования.
+    :param tasks_directory: Директория с задачами.
+    :param max_executions: Количество выполнений до перезапуска процесса (0 — без ограничения).
+    :param task_index: Индекс реестра задач родительского процесса (None — сканировать директорию).
+    :param cancel_conn: Дочерний конец канала отмены, в который родитель пишет при остановке.
+    :param concurrency: Одновременных выполнений в процессе (больше 1 — см. serve_concurrent).
+    :param log_level: Общий уровень логирования (см. setup_worker_logging).
+    """
+    # При методе fork процесс наследует Python-обработчики сигналов родителя:
+    # SIGTERM должен завершать процесс, а Ctrl+C обрабатывает только родитель
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    logger = setup_worker_logging(log_queue, log_level)
+    try:
+        serve(process_number, conn, logger, tasks_directory, max_executions, task_index,
+              cancel_conn, concurrency)
+    finally:
+        flush_worker_logging(logger, process_number)
+
+
+def serve(process_number, conn, logger, tasks_directory, max_executions, task_index, cancel_conn,
+          concurrency):
+    """
+    Обслуживает билеты выполнения процесса пула (см. worker_loop).
+    """
+    cancel_token = CancellationToken()
+    if cancel_conn is not None:
+        threading.Thread(target=watch_cancellation, args=(cancel_conn, cancel_token),
+                         daemon=True, name="cancellation-conn").start()
+
+    try:
+        task_manager = TaskManager(
+            tasks_directory=tasks_directory, log_helper=None, registry_index=task_index)
+    except Exception as e:
+        logger.error(
+            f"Процесс {process_number}: не удалось инициализировать TaskManager: {e}",
+            extra=log_extra(process_number, event=EVENT_CHAIN_FAILED))
+        return
+
+    logger.debug(f"Процесс {process_number}: готов к приёму выполнений.")
+
+    if concurrency > 1:
+        executions = asyncio.run(serve_concurrent(
+            process_number, conn, logger, task_manager, cancel_token, max_executions, concurrency))
+        logger.debug(f"Процесс {process_number}: завершает работу после {
+                     executions} выполнений.")
+        return
+
+    executions = 0
+    while not max_executions or executions < max_executions:
+        try:
+            ticket = conn.recv()
+        except (EOFError, OSError):
+            break
+        if ticket is None:
+            break
+
+        execution_id, tasks = ticket
+        ok = run_task_chain(task_manager, tasks,
+                            process_number, logger, cancel_token)
+        executions += 1
+
+        try:
+            conn.send((execution_id, ok))
+        except (BrokenPipeError, OSError):
+            break
+
+    logger.debug(f"Процесс {process_number}: завершает работу после {
+                 executions} выполнений.")
@@ -0,0 +1,175 @@
+# app/cli.py
+"""
+Запуск цепочки задач из конфигурации без графического интерфейса.
+
+Пример:
+
+    python -m app.cli Configs/Actual.yaml
+    python -m app.cli Configs/Actual.yaml --threads 20 --log-file run.log
+"""
+
+import argparse
+import logging
+import multiprocessing
+import signal
+import sys
+
+import yaml
+
+from app.design.TaskManager import TaskManager
+from app.Logic.ExecutionRunner import ExecutionRunner, SCHEDULING_CHAIN, SCHEDULING_MODES, DEFAULT_DRAIN_TIMEOUT
+from app.Logic.ConcurrencyController import ConcurrencyController
+from app.utils.headless_logging import setup_headless_logging
+from app.utils.log_transport import OVERFLOW_BLOCK, OVERFLOW_POLICIES, PipeLogTransport
+
+EXECUTION_MODES = ("Ограничение", "Бесконечный")
+
+
+def load_run_settings(config_path):
+    """
+    Читает конфигурацию, сохранённую MainWindow, и возвращает общие
+    настройки и список имён задач в порядке, в котором их показывает TasksTab.
+
+    :param config_path: Путь к YAML-файлу конфигурации.
+    :return: Кортеж (general_settings, task_names).
+    """
+    with open(config_path, 'r', encoding='utf-8') as file:
+        config_data = yaml.safe_load(file) or {}
+
+    general_settings = config_data.get("general_settings", {})
+    tasks_settings = config_data.get("tasks_settings", {}) or {}
+    task_names = [task_config.get('task_name')
+                  for task_config in tasks_settings.values()
+                  if task_config.get('task_name')]
+    return general_settings, task_names
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="Запуск задач SEORADAR из конфигурации без GUI.")
+    parser.add_argument("config", help="Путь к конфигурации, например Configs/Actual.yaml")
+    parser.add_argument("--tasks-directory", default="app/tasks",
+                        help="Директория с задачами (по умолчанию app/tasks)")
+    parser.add_argument("--threads", type=int,
+                        help="Переопределить thread_count")
+    parser.add_argument("--mode", choices=EXECUTION_MODES,
+                        help="Переопределить execution_mode")
+    parser.add_argument("--count", type=int,
+                        help="Переопределить execution_count")
+    parser.add_argument("--scheduling", choices=SCHEDULING_MODES,
+                        help="Переопределить scheduling_mode")
+    parser.add_argument("--autoscale", action=argparse.BooleanOptionalAction,
+                        help="Переопределить autoscale (--threads задаёт максимум слотов)")
+    parser.add_argument("--worker-concurrency", type=int,
+                        help="Переопределить worker_concurrency: одновременных выполнений в процессе")
+    parser.add_argument("--drain-timeout", type=float,
+                        help="Переопределить drain_timeout: секунды на завершение выполнений после сигнала")
+    parser.add_argument("--log-file",
+                        help="Писать логи в файл вместо stdout")
+    parser.add_argument("--log-level", default="INFO",
+                        choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+                        help="Минимальный уровень выводимых логов")
+    parser.add_argument("--log-transport", default="pipe", choices=("pipe", "queue"),
+                        help="Передача логов процессов: пакетами по каналам с ограниченным "
+                             "буфером (pipe) или через multiprocessing.Queue (queue)")
+    parser.add_argument("--log-overflow", default=OVERFLOW_BLOCK, choices=OVERFLOW_POLICIES,
+                        help="Поведение при заполненном буфере логов процесса (для --log-transport pipe)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    multiprocessing.freeze_support()  # Необходимо для Windows
+    args = parse_args(argv)
+
+    if args.log_transport == "pipe":
+        log_queue = PipeLogTransport(overflow=args.log_overflow)
+    else:
+        log_queue = multiprocessing.Queue()
+    listener = setup_headless_logging(
+        log_queue, log_file=args.log_file, level=getattr(logging, args.log_level))
+
+    try:
+        general_settings, task_names = load_run_settings(args.config)
+    except (OSError, yaml.YAMLError) as e:
+        logging.error(f"Ошибка при загрузке настроек из файла: {e}")
+        listener.stop()
+        return 2
+
+    thread_count = args.threads or general_settings.get("thread_count", 5)
+    mode = args.mode or general_settings.get("execution_mode", "Ограничение")
+    if mode == "Ограничение":
+        execution_count = args.count or general_settings.get("execution_count", 10)
+    else:
+        execution_count = float('inf')  # Для бесконечного режима
+
+    task_manager = TaskManager(
+        tasks_directory=args.tasks_directory, log_helper=None)
+    unknown_tasks = [name for name in task_names
+                     if name not in task_manager.get_task_names()]
+    if unknown_tasks:
+        logging.error(f"Задачи не найдены в {args.tasks_directory}: {unknown_tasks}")
+        listener.stop()
+        return 2
+    if not task_names:
+        logging.error("В конфигурации нет задач для запуска.")
+        listener.stop()
+        return 2
+
+    autoscale = general_settings.get("autoscale", False)
+    if args.autoscale is not None:
+        autoscale = args.autoscale
+    concurrency_controller = None
+    if autoscale:
+        concurrency_controller = ConcurrencyController(
+            min_slots=general_settings.get("autoscale_min", 1), max_slots=thread_count)
+
+    runner = ExecutionRunner(
+        thread_count=thread_count,
+        tasks=task_names,
+        mode=mode,
+        execution_count=execution_count,
+        tasks_directory=args.tasks_directory,
+        log_queue=log_queue,
+        max_executions_per_worker=general_settings.get("max_executions_per_worker", 0),
+        task_index=task_manager.get_registry_index(),
+        status_callback=lambda status: logging.debug(f"Статус: {status}"),
+        scheduling_mode=args.scheduling or general_settings.get(
+            "scheduling_mode", SCHEDULING_CHAIN),
+        resource_limits=general_settings.get("resource_limits", {}),
+        concurrency_controller=concurrency_controller,
+        concurrency_callback=lambda slots: logging.debug(f"Активных слотов: {slots}"),
+        drain_timeout=args.drain_timeout if args.drain_timeout is not None else general_settings.get(
+            "drain_timeout", DEFAULT_DRAIN_TIMEOUT),
+        worker_concurrency=args.worker_concurrency or general_settings.get("worker_concurrency", 1))
+
+    received_signals = []
+
+    def handle_signal(signum, frame):
+        received_signals.append(signum)
+        if len(received_signals) == 1:
+            logging.info(f"Получен сигнал завершения: {
+                         signum}. Ожидание завершения выполнений.")
+            runner.stop()
+        else:
+            # Повторный Ctrl+C — не ждать завершения выполнений
+            logging.info(f"Получен повторный сигнал завершения: {
+                         signum}. Принудительное завершение.")
+            runner.stop(drain_timeout=0)
+
+    signal.signal(signal.SIGINT, handle_signal)  # Обработка Ctrl+C
+    signal.signal(signal.SIGTERM, handle_signal)  # Обработка SIGTERM
+
+    logging.info(f"Запуск задач {task_names}: thread_count={
+                 thread_count}, mode={mode}, execution_count={execution_count}")
+    try:
+        runner.run()
+    finally:
+        logging.info("Выполнение завершено.")
+        listener.stop()
+        log_queue.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
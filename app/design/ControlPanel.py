@@ -37,6 +37,11 @@ class ControlPanel(QWidget):
         # Добавление разделителя
         layout.addStretch()
 
+        # Эффективное количество параллельных слотов (меняется при автомасштабировании)
+        self.concurrency_label = QLabel("Активных слотов: -")
+        self.concurrency_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.concurrency_label)
+
         # Добавление QLabel для отображения статуса
         self.status_label = QLabel("Статус: Остановлено")
         self.status_label.setAlignment(Qt.AlignCenter)
@@ -83,3 +88,7 @@ class ControlPanel(QWidget):
         """
         self.status_label.setText(f"Статус: {status_message}")
         logging.debug(f"ControlPanel: Статус обновлён на '{status_message}'.")
+
+    def update_concurrency(self, slots):
+        self.concurrency_label.setText(f"Активных слотов: {slots}")
+        logging.debug(f"ControlPanel: Активных слотов: {slots}")
@@ -0,0 +1,199 @@
+# app/design/LogTab/LogFilterProxyModel.py
+
+from bisect import bisect_left
+from PySide6.QtCore import QAbstractProxyModel, QModelIndex, Qt
+
+from .LogFilters import filter_rows, log_matches
+
+
+class LogFilterProxyModel(QAbstractProxyModel):
+    """
+    Фильтр LogTableModel по типу, тексту, времени и структурным полям.
+
+    Прокси хранит возрастающий список seq записей, прошедших фильтры; строка
+    прокси — позиция в этом списке. Список вычисляется заранее (set_result,
+    обычно из LogFilterTask в фоновом потоке), поэтому смена фильтров
+    обходится GUI-потоку в сброс модели, а не в проверку каждой строки.
+    Без фильтров прокси отображает строки исходной модели один к одному.
+
+    Строки, добавленные в исходную модель, проверяются по одной при вставке;
+    вытесненные из начала исходной модели удаляются из начала списка.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.selected_filter = "Все"
+        self.search_text = ""
+        self.start = None  # Секунды эпохи, None — без ограничения
+        self.end = None
+        self.fields = None  # Словарь {имя поля: значение}, None — без фильтра по полям
+        self.seqs = None  # seq записей, прошедших фильтры (None — фильтры не заданы)
+        self.head = 0  # Позиция первой действующей записи в seqs
+        self._removing = 0  # Строк прокси, удаляемых вслед за исходной моделью
+
+    # Фильтры
+
+    def has_filters(self, selected_filter, search_text, start, end, fields=None):
+        return (selected_filter != "Все" or bool(search_text) or start is not None or end is not None
+                or any(value is not None for value in (fields or {}).values()))
+
+    def set_filters(self, selected_filter, search_text, start, end, fields=None):
+        """
+        Устанавливает фильтры и сразу фильтрует все строки в текущем потоке.
+
+        :param selected_filter: Тип логов ("Все" — без фильтра).
+        :param search_text: Текст для поиска в нижнем регистре.
+        :param start: Начало временного интервала в секундах эпохи (None — без ограничения).
+        :param end: Конец временного интервала в секундах эпохи (None — без ограничения).
+        :param fields: Словарь {имя поля: значение} (None — без фильтра по полям).
+        """
+        store = self.sourceModel().store
+        seqs = None
+        if self.has_filters(selected_filter, search_text, start, end, fields):
+            seqs = filter_rows(store, selected_filter, search_text, start, end, fields)
+        self.set_result(selected_filter, search_text, start, end, fields, seqs, store.next_seq)
+
+    def set_result(self, selected_filter, search_text, start, end, fields, seqs, next_seq):
+        """
+        Применяет результат фильтрации, вычисленный для записей до next_seq.
+
+        Записи, добавленные после снимка, проверяются здесь по одной, а
+        вытесненные за время фильтрации отбрасываются.
+
+        :param seqs: Список seq по возрастанию (None — фильтры не заданы).
+        :param next_seq: Граница снимка, по которому вычислен seqs.
+        """
+        store = self.sourceModel().store
+        self.beginResetModel()
+        self.selected_filter = selected_filter
+        self.search_text = search_text
+        self.start = start
+        self.end = end
+        self.fields = fields
+        if seqs is None:
+            self.seqs = None
+        else:
+            seqs = seqs[bisect_left(seqs, store.first_seq):]
+            for seq in range(max(next_seq, store.first_seq), store.next_seq):
+                if self._accepts(store, seq):
+                    seqs.append(seq)
+            self.seqs = seqs
+        self.head = 0
+        self.endResetModel()
+
+    def _accepts(self, store, seq):
+        row = seq - store.first_seq
+        _, log_type, message = store.get(row)
+        # Время сравнивается по тому же ключу, что и в seq_range
+        return log_matches(store.sort_key_at(row), log_type, message,
+                           self.selected_filter, self.search_text, self.start, self.end,
+                           self.fields, store.fields_at(row) if self.fields else None)
+
+    # Сигналы исходной модели
+
+    def setSourceModel(self, source_model):
+        super().setSourceModel(source_model)
+        source_model.rowsAboutToBeInserted.connect(self._on_rows_about_to_be_inserted)
+        source_model.rowsInserted.connect(self._on_rows_inserted)
+        source_model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        source_model.rowsRemoved.connect(self._on_rows_removed)
+        source_model.modelAboutToBeReset.connect(self.beginResetModel)
+        source_model.modelReset.connect(self._on_model_reset)
+
+    def _on_rows_about_to_be_inserted(self, parent, first, last):
+        if self.seqs is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+
+    def _on_rows_inserted(self, parent, first, last):
+        if self.seqs is None:
+            self.endInsertRows()
+            return
+        store = self.sourceModel().store
+        accepted = [store.first_seq + row for row in range(first, last + 1)
+                    if self._accepts(store, store.first_seq + row)]
+        if accepted:
+            count = self.rowCount()
+            self.beginInsertRows(QModelIndex(), count, count + len(accepted) - 1)
+            self.seqs.extend(accepted)
+            self.endInsertRows()
+
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        # Исходная модель удаляет строки только из начала (вытеснение)
+        if self.seqs is None:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            return
+        store = self.sourceModel().store
+        stop = bisect_left(self.seqs, store.first_seq + last + 1, self.head)
+        self._removing = stop - self.head
+        if self._removing:
+            self.beginRemoveRows(QModelIndex(), 0, self._removing - 1)
+
+    def _on_rows_removed(self, parent, first, last):
+        if self.seqs is None:
+            self.endRemoveRows()
+            return
+        if self._removing:
+            self.head += self._removing
+            self._removing = 0
+            # Сжимаем список, когда удалённое начало занимает большую его часть
+            if self.head > len(self.seqs) // 2:
+                del self.seqs[:self.head]
+                self.head = 0
+            self.endRemoveRows()
+
+    def _on_model_reset(self):
+        if self.seqs is not None:
+            self.seqs = []
+            self.head = 0
+        self.endResetModel()
+
+    # QAbstractProxyModel
+
+    def seq_at(self, row):
+        """
+        :return: seq записи строки прокси.
+        """
+        if self.seqs is None:
+            return self.sourceModel().store.first_seq + row
+        return self.seqs[self.head + row]
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self.seqs is None:
+            return self.sourceModel().rowCount()
+        return len(self.seqs) - self.head
+
+    def columnCount(self, parent=QModelIndex()):
+        return self.sourceModel().columnCount()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < self.rowCount() and 0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        store = self.sourceModel().store
+        return self.sourceModel().index(self.seq_at(proxy_index.row()) - store.first_seq,
+                                        proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        if self.seqs is None:
+            return self.index(source_index.row(), source_index.column())
+        seq = self.sourceModel().store.first_seq + source_index.row()
+        position = bisect_left(self.seqs, seq, self.head)
+        if position == len(self.seqs) or self.seqs[position] != seq:
+            return QModelIndex()
+        return self.index(position - self.head, source_index.column())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            return self.sourceModel().headerData(section, orientation, role)
+        return None
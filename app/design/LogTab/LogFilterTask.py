@@ -0,0 +1,55 @@
+# app/design/LogTab/LogFilterTask.py
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from .LogFilters import filter_rows
+
+
+class LogFilterSignals(QObject):
+    """
+    Сигналы LogFilterTask (QRunnable не может объявлять сигналы сам).
+    """
+    progress = Signal(int, int)  # generation, процент
+    finished = Signal(int, object, int)  # generation, список seq (None — без фильтров), next_seq
+
+
+class LogFilterTask(QRunnable):
+    """
+    Фильтрация истории логов в потоке QThreadPool.
+
+    Каждый запрос получает номер поколения; задача прерывается, как только
+    current_generation() перестаёт с ним совпадать (пользователь изменил
+    фильтры), и устаревший результат не отправляется.
+    """
+
+    def __init__(self, store, generation, current_generation, selected_filter, search_text, start, end,
+                 fields=None):
+        """
+        :param store: LogStore.
+        :param generation: Номер поколения запроса.
+        :param current_generation: Функция без аргументов, возвращающая номер актуального запроса.
+        :param fields: Словарь {имя поля: значение} для фильтра по структурным полям.
+        """
+        super().__init__()
+        self.store = store
+        self.generation = generation
+        self.current_generation = current_generation
+        self.filters = (selected_filter, search_text, start, end, fields)
+        # Снимок границы буфера: записи, добавленные позже, проверит прокси
+        self.next_seq = store.next_seq
+        self.signals = LogFilterSignals()
+
+    def is_stale(self):
+        return self.current_generation() != self.generation
+
+    def run(self):
+        if self.is_stale():
+            return
+        seqs = filter_rows(self.store, *self.filters, next_seq=self.next_seq,
+                           should_stop=self.is_stale, progress=self._report_progress)
+        if seqs is None or self.is_stale():
+            return
+        self.signals.finished.emit(self.generation, seqs, self.next_seq)
+
+    def _report_progress(self, done, total):
+        self.signals.progress.emit(self.generation, done * 100 // max(total, 1))
@@ -1,8 +1,14 @@
 # app/design/LogTab/LogFilters.py
 
+from bisect import bisect_left
 from datetime import datetime
 import logging
 
+from app.utils.log_fields import FIELD_NAMES
+
+# Записей между проверками отмены и отчётами о прогрессе в filter_rows
+FILTER_CHUNK_SIZE = 65536
+
 
 def filter_logs(logs, selected_filter, search_text, start_time, end_time):
     """
@@ -15,29 +21,160 @@ def filter_logs(logs, selected_filter, search_text, start_time, end_time):
     :param end_time: Конец временного интервала (datetime.datetime).
     :return: Отфильтрованный список логов.
     """
+    start, end = time_bounds(start_time, end_time)
     filtered = []
     for log in logs:
-        # Фильтрация по типу лога
-        if selected_filter != "Все" and log['log_type'] != selected_filter:
-            continue
-
-        # Фильтрация по тексту поиска
-        if search_text and search_text not in log['message'].lower():
-            continue
-
-        # Фильтрация по времени
         try:
             # Предполагается, что временная метка в формате "YYYY-MM-DD HH:MM:SS"
-            log_time = datetime.strptime(log['timestamp'], '%Y-%m-%d %H:%M:%S')
+            timestamp = datetime.strptime(log['timestamp'], '%Y-%m-%d %H:%M:%S').timestamp()
         except ValueError as e:
             logging.error(f"Невозможно разобрать временную метку лога: {
                           log['timestamp']}. Ошибка: {e}")
             continue  # Пропускаем логи с некорректными временными метками
+        if log_matches(timestamp, log['log_type'], log['message'],
+                       selected_filter, search_text, start, end):
+            filtered.append(log)
+    return filtered
 
-        if not (start_time <= log_time <= end_time):
-            continue
 
-        # Если лог проходит все фильтры, добавляем его в результат
-        filtered.append(log)
+def filter_rows(store, selected_filter, search_text, start, end, fields=None, next_seq=None,
+                should_stop=None, progress=None):
+    """
+    Фильтрует LogStore и возвращает seq подходящих записей.
 
-    return filtered
+    Интервал времени переводится в диапазон строк двоичным поиском, и
+    остальные фильтры проверяются только внутри него. Структурные поля
+    ищутся по индексу полей хранилища, текст — по поисковому индексу;
+    записи старше окна поискового индекса проверяются перебором.
+
+    Может выполняться в фоновом потоке, пока GUI-поток добавляет записи:
+    рассматриваются записи до next_seq, а записи, вытесненные во время
+    фильтрации, могут попасть в результат — вызывающий отбрасывает seq
+    меньше store.first_seq.
+
+    :param store: LogStore.
+    :param selected_filter: Тип логов ("Все" — без фильтра).
+    :param search_text: Текст для поиска в нижнем регистре.
+    :param start: Начало интервала в секундах эпохи (None — без ограничения).
+    :param end: Конец интервала в секундах эпохи (None — без ограничения).
+    :param fields: Словарь {имя поля: значение} (см. app.utils.log_fields; None — без фильтра).
+    :param next_seq: Граница снимка (None — store.next_seq на момент вызова).
+    :param should_stop: Функция без аргументов; True прерывает фильтрацию.
+    :param progress: Функция (обработано, всего), вызываемая при переборе.
+    :return: Список seq по возрастанию или None, если фильтрация прервана.
+    """
+    if next_seq is None:
+        next_seq = store.next_seq
+    first, stop = store.seq_range(start, end, store.first_seq, next_seq)
+    level_code = None if selected_filter == "Все" else store.level_codes.get(selected_filter, -1)
+    capacity, levels, messages = store.capacity, store.levels, store.messages
+
+    by_fields = store.field_search(fields)
+    if by_fields is not None:
+        # Найденное по полям ограничиваем интервалом и проверяем тип и текст
+        seqs = by_fields[bisect_left(by_fields, first):bisect_left(by_fields, stop)]
+        result = []
+        for seq in seqs:
+            slot = seq % capacity
+            if level_code is not None and levels[slot] != level_code:
+                continue
+            if search_text:
+                message = messages[slot]
+                if message is None or search_text not in message.lower():
+                    continue
+            result.append(seq)
+        return result
+
+    matched = store.search(search_text) if search_text else None
+    if matched is not None:
+        indexed_from, matched = matched
+        # Записи старше окна индекса перебираем, найденное индексом
+        # ограничиваем диапазоном интервала
+        result = _scan_rows(store, level_code, search_text, first, min(stop, indexed_from),
+                            should_stop, progress)
+        if result is None:
+            return None
+        seqs = matched[bisect_left(matched, max(first, indexed_from)):bisect_left(matched, stop)]
+        if level_code is not None:
+            seqs = [seq for seq in seqs if levels[seq % capacity] == level_code]
+        result.extend(seqs)
+        return result
+
+    return _scan_rows(store, level_code, search_text, first, stop, should_stop, progress)
+
+
+def _scan_rows(store, level_code, search_text, first, stop, should_stop, progress):
+    """
+    Перебирает записи first <= seq < stop и проверяет тип и текст.
+
+    :return: Список seq по возрастанию или None, если перебор прерван.
+    """
+    capacity, levels, messages = store.capacity, store.levels, store.messages
+    result = []
+    for chunk_start in range(first, stop, FILTER_CHUNK_SIZE):
+        if should_stop is not None and should_stop():
+            return None
+        if progress is not None:
+            progress(chunk_start - first, stop - first)
+        for seq in range(chunk_start, min(chunk_start + FILTER_CHUNK_SIZE, stop)):
+            slot = seq % capacity
+            if level_code is not None and levels[slot] != level_code:
+                continue
+            if search_text:
+                message = messages[slot]
+                if message is None or search_text not in message.lower():
+                    continue
+            result.append(seq)
+    return result
+
+
+def time_bounds(start_time, end_time):
+    """
+    Переводит границы интервала datetime в секунды эпохи.
+
+    :return: Кортеж (start, end); datetime.min и datetime.max дают None — граница не задана.
+    """
+    start = None if start_time == datetime.min else start_time.timestamp()
+    end = None if end_time == datetime.max else end_time.timestamp()
+    return start, end
+
+
+def log_matches(timestamp, log_type, message, selected_filter, search_text, start, end,
+                fields=None, record_fields=None):
+    """
+    Проверяет, проходит ли один лог фильтры по типу, тексту, времени и полям.
+
+    :param timestamp: Время лога в секундах эпохи.
+    :param search_text: Текст для поиска в нижнем регистре.
+    :param start: Начало интервала в секундах эпохи (None — без ограничения).
+    :param end: Конец интервала в секундах эпохи (None — без ограничения).
+    :param fields: Словарь {имя поля: значение} (None — без фильтра по полям).
+    :param record_fields: Кортеж полей лога в порядке FIELD_NAMES (None — поля не заданы).
+    :return: True, если лог нужно показать.
+    """
+    # Фильтрация по типу лога
+    if selected_filter != "Все" and log_type != selected_filter:
+        return False
+
+    # Фильтрация по структурным полям
+    if fields and not fields_match(record_fields, fields):
+        return False
+
+    # Фильтрация по тексту поиска
+    if search_text and search_text not in message.lower():
+        return False
+
+    # Фильтрация по времени
+    if start is not None and timestamp < start:
+        return False
+    return end is None or timestamp <= end
+
+
+def fields_match(record_fields, fields):
+    """
+    :param record_fields: Кортеж полей лога в порядке FIELD_NAMES (None — поля не заданы).
+    :param fields: Словарь {имя поля: значение}; значения None не проверяются.
+    :return: True, если все заданные поля совпадают.
+    """
+    values = dict(zip(FIELD_NAMES, record_fields or ()))
+    return all(value is None or values.get(name) == value for name, value in fields.items())
@@ -0,0 +1,137 @@
+# app/design/LogTab/LogSearchIndex.py
+
+from array import array
+from bisect import bisect_left
+
+NGRAM = 3  # Длина n-грамм индекса
+# Индексируется столько последних записей; более старые ищутся перебором
+DEFAULT_WINDOW = 100_000
+# Доля окна, на которую индекс может его превысить до сжатия очередей
+COMPACT_SLACK = 0.25
+
+
+def trigrams(text):
+    """
+    :param text: Текст в нижнем регистре.
+    :return: Множество уникальных триграмм текста.
+    """
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+class LogSearchIndex:
+    """
+    Инвертированный индекс триграмм по сообщениям последних window записей LogStore.
+
+    Для каждой триграммы хранится очередь seq записей, содержащих её, в
+    порядке добавления — array('Q'), 8 байт на ссылку. Записи, покинувшие
+    окно, не удаляются по одной (для этого пришлось бы заново разбирать их
+    сообщения на триграммы): граница first_seq сдвигается, а когда индекс
+    превышает окно на COMPACT_SLACK, очереди разом обрезаются по ней.
+    Добавление записи стоит только разбора её сообщения.
+
+    Окно меньше ёмкости буфера: индекс по всей истории в миллион записей
+    занимал бы около гигабайта и замедлял добавление. Записи старше окна
+    LogStore.search не возвращает — filter_rows перебирает их сам.
+
+    Поиск подстроки берёт самую короткую очередь среди триграмм запроса и
+    проверяет только её записи — время зависит от числа кандидатов, а не от
+    размера истории.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        """
+        :param window: Сколько последних записей индексируется.
+        """
+        if window <= 0:
+            raise ValueError("Окно индекса должно быть положительным.")
+        self.window = window
+        self.compact_after = window + max(1, int(window * COMPACT_SLACK))
+        self.postings = {}  # Ключ: триграмма, Значение: array('Q') seq записей
+        self.postings_count = 0  # Всего seq во всех очередях (с ещё не обрезанными)
+        self.first_seq = 0  # seq самой старой записи окна
+        self._stored_from = 0  # seq самой старой записи, ещё хранящейся в очередях
+
+    def add(self, seq, message):
+        """
+        Индексирует сообщение записи seq (seq должны возрастать).
+        """
+        postings = self.postings
+        grams = trigrams(message.lower())
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = array('Q', (seq,))
+            else:
+                posting.append(seq)
+        self.postings_count += len(grams)
+        if seq - self.first_seq >= self.window:
+            self.first_seq = seq + 1 - self.window
+            if seq - self._stored_from >= self.compact_after:
+                self.compact()
+
+    def compact(self):
+        """
+        Обрезает в очередях seq записей, покинувших окно.
+        """
+        postings, first_seq = self.postings, self.first_seq
+        count = 0
+        for gram, posting in list(postings.items()):
+            start = bisect_left(posting, first_seq)
+            if start == len(posting):
+                del postings[gram]
+                continue
+            if start:
+                # Новая очередь вместо изменения старой: поиск из другого
+                # потока, уже взявший старую, дочитает её целиком
+                postings[gram] = posting[start:]
+            count += len(posting) - start
+        self.postings_count = count
+        self._stored_from = first_seq
+
+    def clear(self, next_seq=0):
+        """
+        :param next_seq: seq следующей записи хранилища.
+        """
+        self.postings.clear()
+        self.postings_count = 0
+        self.first_seq = self._stored_from = next_seq
+
+    def memory_size(self):
+        """
+        Объём очередей индекса в байтах (без словаря и строк триграмм).
+        """
+        return sum(posting.buffer_info()[1] * posting.itemsize for posting in self.postings.values())
+
+    def search(self, text, store):
+        """
+        Ищет среди записей окна те, сообщения которых содержат text (без учёта регистра).
+
+        :param text: Искомая подстрока.
+        :param store: LogStore, по которому построен индекс (для проверки кандидатов).
+        :return: Список seq найденных записей по возрастанию или None, если
+                 запрос короче триграммы и индекс не помогает.
+        """
+        text = text.lower()
+        grams = trigrams(text)
+        if not grams:
+            return None
+        postings = []
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        shortest = min(postings, key=len)
+        # Кандидаты — только записи окна, ещё хранящиеся в буфере; срез array
+        # копируется целиком, не отпуская GIL, поэтому поиск из потока
+        # фильтрации не видит очередь посреди добавления GUI-потоком
+        first_seq = max(self.first_seq, store.first_seq)
+        candidates = shortest[bisect_left(shortest, first_seq):]
+        # Совпадение всех триграмм необходимо, но не достаточно — проверяем подстроку
+        capacity, messages = store.capacity, store.messages
+        result = []
+        for seq in candidates:
+            message = messages[seq % capacity]
+            if message is not None and text in message.lower():
+                result.append(seq)
+        return result
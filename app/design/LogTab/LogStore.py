@@ -0,0 +1,342 @@
+# app/design/LogTab/LogStore.py
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import datetime
+
+# Коды уровней лога; неизвестные уровни получают следующие свободные коды
+LEVEL_NAMES = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+MAX_LEVEL_CODES = 256
+# Ёмкость кодов задач (array('H')) и событий (array('B')); код 0 — поле не задано
+MAX_TASK_CODES = 65536
+MAX_EVENT_CODES = 256
+# Номер процесса записи без поля process_number
+NO_PROCESS = -1
+
+
+class LogStore:
+    """
+    Кольцевой буфер истории логов фиксированной ёмкости.
+
+    Данные хранятся по столбцам: время — секунды эпохи в array('q'), уровень —
+    однобайтовый код в array('B'), сообщения — список строк. Добавление и
+    вытеснение самой старой записи выполняются за O(1), память ограничена
+    ёмкостью.
+
+    Каждая запись получает порядковый номер seq, не меняющийся при вытеснении;
+    строка row (0 — самая старая из хранимых) соответствует seq = first_seq + row.
+
+    Время записи хранится как есть (timestamps) и показывается без
+    изменений. Для поиска по времени ведётся отдельный неубывающий столбец
+    sort_keys: запись, доставленная позже более новой (из другого процесса),
+    получает в нём время предыдущей. Поэтому интервал времени соответствует
+    непрерывному диапазону строк и находится двоичным поиском (row_range).
+
+    Если задан search_index (LogSearchIndex), сообщения индексируются при
+    добавлении; индекс покрывает последние search_index.window записей.
+
+    Структурные поля записей (process_number, task, event — см.
+    app.utils.log_fields) хранятся отдельными столбцами кодов и всегда
+    индексируются: для каждого значения поля ведётся очередь seq записей
+    (field_postings), поэтому выборка по полю стоит O(найденных записей).
+    Вытесняемый seq, как и в LogSearchIndex, всегда стоит в начале очередей.
+    """
+
+    def __init__(self, capacity, search_index=None):
+        """
+        :param capacity: Максимальное количество хранимых записей.
+        :param search_index: Индекс полнотекстового поиска (None — без индекса).
+        """
+        if capacity <= 0:
+            raise ValueError("Ёмкость хранилища логов должна быть положительной.")
+        self.capacity = capacity
+        self.timestamps = array('q', bytes(8 * capacity))
+        self.sort_keys = array('q', bytes(8 * capacity))  # Неубывающее время для row_range
+        self.levels = array('B', bytes(capacity))
+        self.messages = [None] * capacity
+        self.level_names = list(LEVEL_NAMES)
+        self.level_codes = {name: code for code, name in enumerate(self.level_names)}
+        self.process_numbers = array('i', [NO_PROCESS]) * capacity
+        self.tasks = array('H', bytes(2 * capacity))
+        self.task_names = [None]
+        self.task_codes = {None: 0}
+        self.events = array('B', bytes(capacity))
+        self.event_names = [None]
+        self.event_codes = {None: 0}
+        # Ключ: (имя поля, значение), Значение: deque seq записей с этим значением
+        self.field_postings = {}
+        self.first_seq = 0  # seq самой старой хранимой записи
+        self.next_seq = 0  # seq следующей добавляемой записи
+        self.search_index = search_index
+
+    def __len__(self):
+        return self.next_seq - self.first_seq
+
+    def level_code(self, level_name):
+        """
+        :return: Код уровня лога (новый уровень получает следующий свободный код).
+        """
+        code = self.level_codes.get(level_name)
+        if code is None:
+            if len(self.level_names) >= MAX_LEVEL_CODES:
+                raise ValueError(f"Слишком много уровней лога: {level_name}")
+            code = len(self.level_names)
+            self.level_names.append(level_name)
+            self.level_codes[level_name] = code
+        return code
+
+    @staticmethod
+    def _code(names, codes, value, limit):
+        code = codes.get(value)
+        if code is None:
+            if len(names) >= limit:
+                raise ValueError(f"Слишком много значений поля лога: {value}")
+            code = len(names)
+            names.append(value)
+            codes[value] = code
+        return code
+
+    def append(self, timestamp, level_name, message, process_number=None, task=None, event=None):
+        """
+        Добавляет запись, вытесняя самую старую при заполненном буфере.
+
+        :param timestamp: Время записи в секундах эпохи.
+        :param level_name: Имя уровня ("INFO", "ERROR", ...).
+        :param message: Текст сообщения.
+        :param process_number: Номер процесса (None — не задан).
+        :param task: Имя задачи (None — не задано).
+        :param event: Событие выполнения (None — не задано).
+        :return: Количество вытесненных записей (0 или 1).
+        """
+        return self.extend([(timestamp, level_name, message, process_number, task, event)])
+
+    def extend(self, entries):
+        """
+        Добавляет записи (timestamp, level_name, message) или
+        (timestamp, level_name, message, process_number, task, event).
+
+        :return: Количество вытесненных записей.
+        """
+        # То же, что append() в цикле, но без вызова методов на каждую запись
+        capacity = self.capacity
+        timestamps, sort_keys = self.timestamps, self.sort_keys
+        levels, messages = self.levels, self.messages
+        process_numbers, tasks, events = self.process_numbers, self.tasks, self.events
+        level_codes, task_codes, event_codes = self.level_codes, self.task_codes, self.event_codes
+        field_postings = self.field_postings
+        search_index = self.search_index
+        first_seq, next_seq = self.first_seq, self.next_seq
+        last_key = self._last_sort_key()
+        evicted = 0
+        for entry in entries:
+            timestamp, level_name, message = entry[0], entry[1], entry[2]
+            if next_seq - first_seq == capacity:
+                self._remove_fields(first_seq)
+                first_seq += 1
+                evicted += 1
+            slot = next_seq % capacity
+            code = level_codes.get(level_name)
+            if code is None:
+                code = self.level_code(level_name)
+            timestamps[slot] = timestamp = int(timestamp)
+            if timestamp > last_key:
+                last_key = timestamp
+            sort_keys[slot] = last_key
+            levels[slot] = code
+            messages[slot] = message  # Заменяет сообщение вытесненной записи
+            if len(entry) > 3 and (entry[3] is not None or entry[4] is not None or entry[5] is not None):
+                process_number, task, event = entry[3], entry[4], entry[5]
+                process_numbers[slot] = NO_PROCESS if process_number is None else process_number
+                task_code = task_codes.get(task)
+                if task_code is None:
+                    task_code = self._code(self.task_names, task_codes, task, MAX_TASK_CODES)
+                tasks[slot] = task_code
+                event_code = event_codes.get(event)
+                if event_code is None:
+                    event_code = self._code(self.event_names, event_codes, event, MAX_EVENT_CODES)
+                events[slot] = event_code
+                for key in (('process_number', process_number), ('task', task), ('event', event)):
+                    if key[1] is None:
+                        continue
+                    posting = field_postings.get(key)
+                    if posting is None:
+                        posting = field_postings[key] = deque()
+                    posting.append(next_seq)
+            else:
+                process_numbers[slot] = NO_PROCESS
+                tasks[slot] = 0
+                events[slot] = 0
+            if search_index is not None:
+                search_index.add(next_seq, message)
+            next_seq += 1
+        self.first_seq, self.next_seq = first_seq, next_seq
+        return evicted
+
+    def _remove_fields(self, seq):
+        # Удаляет вытесняемую запись seq из очередей её полей
+        slot = seq % self.capacity
+        for key in self._field_keys(slot):
+            posting = self.field_postings.get(key)
+            if posting and posting[0] == seq:
+                posting.popleft()
+                if not posting:
+                    del self.field_postings[key]
+
+    def _field_keys(self, slot):
+        keys = []
+        if self.process_numbers[slot] != NO_PROCESS:
+            keys.append(('process_number', self.process_numbers[slot]))
+        if self.tasks[slot]:
+            keys.append(('task', self.task_names[self.tasks[slot]]))
+        if self.events[slot]:
+            keys.append(('event', self.event_names[self.events[slot]]))
+        return keys
+
+    def evict(self, count):
+        """
+        Вытесняет count самых старых записей.
+        """
+        count = min(count, len(self))
+        for seq in range(self.first_seq, self.first_seq + count):
+            slot = seq % self.capacity
+            self._remove_fields(seq)
+            self.messages[slot] = None
+        self.first_seq += count
+
+    def clear(self):
+        self.messages = [None] * self.capacity
+        self.first_seq = self.next_seq
+        self.field_postings.clear()
+        if self.search_index is not None:
+            self.search_index.clear(self.next_seq)
+
+    def search(self, text):
+        """
+        Ищет по индексу записи, сообщения которых содержат text (без учёта регистра).
+
+        Индекс покрывает только последние записи: более старые вызывающий
+        код проверяет сам.
+
+        :return: Кортеж (indexed_from, seqs): seqs — найденные seq >= indexed_from
+                 по возрастанию; записи с seq < indexed_from индекс не покрывает.
+                 None, если индекса нет или запрос для него слишком короткий.
+        """
+        if self.search_index is None:
+            return None
+        seqs = self.search_index.search(text, self)
+        if seqs is None:
+            return None
+        # Граница читается после поиска: записи, покинувшие окно за время
+        # поиска, попадут в перебор, а не потеряются
+        indexed_from = self.search_index.first_seq
+        return indexed_from, seqs[bisect_left(seqs, indexed_from):]
+
+    def field_search(self, fields):
+        """
+        Ищет записи по структурным полям через field_postings.
+
+        Перебирается самая короткая очередь среди заданных полей, остальные
+        поля проверяются по столбцам — время пропорционально числу кандидатов.
+
+        :param fields: Словарь {имя поля: значение}; поля со значением None не проверяются.
+        :return: Список seq найденных записей по возрастанию или None, если поля не заданы.
+        """
+        keys = [(name, value) for name, value in (fields or {}).items() if value is not None]
+        if not keys:
+            return None
+        postings = []
+        for key in keys:
+            posting = self.field_postings.get(key)
+            if not posting:
+                return []
+            postings.append(posting)
+        # list(deque) копирует очередь, не отпуская GIL (см. LogSearchIndex.search)
+        candidates = list(min(postings, key=len))
+        if len(keys) == 1:
+            return candidates
+        capacity = self.capacity
+        return [seq for seq in candidates
+                if all(key in self._field_keys(seq % capacity) for key in keys)]
+
+    def _last_sort_key(self):
+        if self.next_seq == self.first_seq:
+            return 0
+        return self.sort_keys[(self.next_seq - 1) % self.capacity]
+
+    def row_range(self, start=None, end=None):
+        """
+        Находит строки с временем в интервале [start, end] двоичным поиском.
+
+        :param start: Начало интервала в секундах эпохи (None — без ограничения).
+        :param end: Конец интервала в секундах эпохи (None — без ограничения).
+        :return: Кортеж (first_row, stop_row) — строки first_row <= row < stop_row.
+        """
+        first_seq = self.first_seq
+        first, stop = self.seq_range(start, end, first_seq, self.next_seq)
+        return first - first_seq, stop - first_seq
+
+    def seq_range(self, start, end, first_seq, next_seq):
+        """
+        Находит seq записей с временем в интервале [start, end] среди seq
+        first_seq <= seq < next_seq. Границы передаются явно, чтобы поток
+        фильтрации работал со снимком буфера, пока GUI добавляет записи.
+
+        Поиск идёт по sort_keys: запись, пришедшая не по порядку, относится
+        к интервалу по времени предыдущей записи, а не по своему.
+
+        :return: Кортеж (first, stop) — seq first <= seq < stop.
+        """
+        seqs = range(first_seq, next_seq)
+        capacity, sort_keys = self.capacity, self.sort_keys
+
+        def sort_key_of(seq):
+            return sort_keys[seq % capacity]
+
+        first = first_seq if start is None else first_seq + bisect_left(seqs, start, key=sort_key_of)
+        stop = next_seq if end is None else first_seq + bisect_right(seqs, end, key=sort_key_of)
+        return first, max(first, stop)
+
+    def _slot(self, row):
+        if not 0 <= row < self.next_seq - self.first_seq:
+            raise IndexError(row)
+        return (self.first_seq + row) % self.capacity
+
+    def timestamp_at(self, row):
+        return self.timestamps[self._slot(row)]
+
+    def sort_key_at(self, row):
+        """
+        :return: Время строки row для фильтра по времени (см. seq_range).
+        """
+        return self.sort_keys[self._slot(row)]
+
+    def level_at(self, row):
+        return self.level_names[self.levels[self._slot(row)]]
+
+    def message_at(self, row):
+        return self.messages[self._slot(row)]
+
+    def fields_at(self, row):
+        """
+        :return: Кортеж (process_number, task, event) строки row; незаданные поля — None.
+        """
+        slot = self._slot(row)
+        process_number = self.process_numbers[slot]
+        return (None if process_number == NO_PROCESS else process_number,
+                self.task_names[self.tasks[slot]], self.event_names[self.events[slot]])
+
+    def get(self, row):
+        """
+        :return: Кортеж (timestamp, level_name, message) строки row.
+        """
+        slot = self._slot(row)
+        return self.timestamps[slot], self.level_names[self.levels[slot]], self.messages[slot]
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self.get(row)
+
+    @staticmethod
+    def format_timestamp(timestamp):
+        return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
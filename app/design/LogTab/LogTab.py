@@ -4,18 +4,21 @@ import logging
 
 from .LogTabUI import LogTabUI
 from .LogTabLogic import LogTabLogic
-from .LogTableModel import LogTableModel  # Import the LogTableModel
+from .LogTableModel import LogTableModel
+from .LogFilterProxyModel import LogFilterProxyModel
 
 
 class LogTab(QWidget):
-    MAX_LOGS = 1000  # Максимальное количество логов
+    MAX_LOGS = 1_000_000  # Ёмкость кольцевого буфера логов
 
     def __init__(self):
         super().__init__()
         self.setStyleSheet("background-color: rgb(50, 50, 50);")
 
-        # Initialize the data model
-        self.model = LogTableModel()  # This will store and manage log data
+        # Модель хранит логи, прокси-модель фильтрует их для таблицы
+        self.model = LogTableModel(self, capacity=self.MAX_LOGS)
+        self.proxy_model = LogFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
 
         # Основной макет
         main_layout = QVBoxLayout()
@@ -28,6 +31,7 @@ class LogTab(QWidget):
         self.on_filter_changed = self.logic.on_filter_changed
         self.on_scrollbar_value_changed = self.logic.on_scrollbar_value_changed
         self.add_log = self.logic.add_log
+        self.add_logs = self.logic.add_logs
         self.save_logs = self.logic.save_logs
         self.clear_logs = self.logic.clear_logs
         self.keyPressEvent = self.logic.keyPressEvent
@@ -1,20 +1,21 @@
-from PySide6.QtCore import Qt, QDateTime, QTimer
+from PySide6.QtCore import Qt, QDateTime, QTimer, QThreadPool
 from PySide6.QtWidgets import QApplication, QFileDialog, QMenu
 from PySide6.QtGui import QKeySequence, QClipboard, QAction
 
 from datetime import datetime
 import logging
 
-from .LogFilters import filter_logs
+from .LogFilterTask import LogFilterTask
 
 
 class LogTabLogic:
     def __init__(self, parent):
         self.parent = parent
 
-        # Хранение всех логов
-        self.all_logs = []  # Инициализация списка всех логов
+        # Все логи хранит модель таблицы (self.parent.model)
         self.pending_logs = []  # Инициализация буфера новых логов
+        self.known_tasks = []  # Задачи, показанные в списке фильтра
+        self._last_timestamp = (None, 0)  # Последняя разобранная метка времени и её значение
 
         # Флаг для отслеживания прокрутки пользователя
         self.user_scrolled_up = False
@@ -30,6 +31,12 @@ class LogTabLogic:
         self.apply_filters_timer.setSingleShot(True)
         self.apply_filters_timer.timeout.connect(self._apply_filters)
 
+        # Фильтрация выполняется в QThreadPool; каждый запрос получает номер
+        # поколения, и результаты устаревших запросов отбрасываются
+        self.filter_generation = 0
+        self.filter_task = None  # Последний запущенный LogFilterTask
+        self.filter_pool = QThreadPool.globalInstance()
+
     def toggle_time_filter(self):
         """
         Переключает состояние фильтра по времени.
@@ -56,34 +63,77 @@ class LogTabLogic:
         """
         Отслеживает, когда пользователь прокручивает текстовое поле.
         """
-        max_value = self.parent.text_edit.verticalScrollBar().maximum()
+        max_value = self.parent.table_view.verticalScrollBar().maximum()
         self.user_scrolled_up = value < max_value
 
     def add_log(self, timestamp, log_type, message):
         """
         Добавляет новый лог в буфер для последующей обработки.
         """
-        log_entry = {
-            'timestamp': timestamp,
-            'log_type': log_type,
-            'message': message
-        }
-        self.pending_logs.append(log_entry)
+        self.pending_logs.append((self._epoch(timestamp), log_type, message))
+
+    def add_logs(self, entries):
+        """
+        Добавляет пакет логов [(timestamp, log_type, message), ...] в буфер.
+        Время — секунды эпохи (QtLogHandler) или строка "YYYY-MM-DD HH:MM:SS".
+        Записи QtLogHandler дополнительно содержат поля (process_number, task, event).
+        """
+        self.pending_logs.extend((self._epoch(entry[0]), *entry[1:]) for entry in entries)
+
+    def _epoch(self, timestamp):
+        # Время хранится в секундах эпохи; строковые метки подряд идущих записей
+        # обычно совпадают, поэтому разбирается только новая метка
+        if isinstance(timestamp, (int, float)):
+            return int(timestamp)
+        if timestamp != self._last_timestamp[0]:
+            try:
+                epoch = int(datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S').timestamp())
+            except ValueError:
+                epoch = int(datetime.now().timestamp())
+            self._last_timestamp = (timestamp, epoch)
+        return self._last_timestamp[1]
 
     def process_pending_logs(self):
         """
         Обрабатывает все логи, добавленные в буфер, и обновляет отображение.
+
+        Модель получает только новые строки (и удаляет вытесненные старые),
+        прокси-модель проверяет фильтрами только их — без перерисовки всей истории.
         """
         if self.pending_logs:
-            self.all_logs.extend(self.pending_logs)
-            self.pending_logs.clear()
+            new_logs, self.pending_logs = self.pending_logs, []
+            # Сверх MAX_LOGS модель вытесняет самые старые логи
+            self.parent.model.append_logs(new_logs)
+            self._update_task_filter()
 
-            # Ограничение количества логов
-            if len(self.all_logs) > self.parent.MAX_LOGS:
-                excess_logs = len(self.all_logs) - self.parent.MAX_LOGS
-                del self.all_logs[:excess_logs]
+            if not self.user_scrolled_up:
+                self.parent.table_view.scrollToBottom()
+
+    def _update_task_filter(self):
+        """
+        Перестраивает список задач фильтра по очередям полей хранилища.
 
-            self.apply_filters()
+        В списке — задачи, записи которых сейчас есть в истории: новая задача
+        появляется с первой записью (в том числе снова после очистки логов),
+        а задача, все записи которой вытеснены, пропадает. Выбранная задача
+        остаётся в списке, чтобы фильтр не сбрасывался сам.
+        """
+        tasks = sorted((value for name, value in self.parent.model.store.field_postings
+                        if name == 'task'), key=str)
+        if tasks == self.known_tasks:
+            return
+        self.known_tasks = tasks
+        combobox = self.parent.task_combobox
+        selected = combobox.currentData()
+        if selected is not None and selected not in tasks:
+            tasks = tasks + [selected]
+        combobox.blockSignals(True)  # Фильтр не меняется — пересчёт не нужен
+        combobox.clear()
+        combobox.addItem("Все задачи", None)
+        for task in tasks:
+            combobox.addItem(str(task), task)
+        combobox.setCurrentIndex(max(0, combobox.findData(selected)))
+        combobox.blockSignals(False)
 
     def apply_filters(self):
         """
@@ -98,39 +148,66 @@ class LogTabLogic:
         selected_filter = self.parent.filter_combobox.currentText()
         search_text = self.parent.search_input.text().lower()
 
-        # Фильтрация временных интервалов
+        # Фильтрация временных интервалов (границы — секунды эпохи)
         if self.parent.time_filter_button.isChecked():
-            start_time = datetime.strptime(
-                self.parent.start_datetime.dateTime().toString("yyyy-MM-dd HH:mm:ss"), "%Y-%m-%d %H:%M:%S")
-            end_time = datetime.strptime(
-                self.parent.end_datetime.dateTime().toString("yyyy-MM-dd HH:mm:ss"), "%Y-%m-%d %H:%M:%S")
+            start = self.parent.start_datetime.dateTime().toSecsSinceEpoch()
+            end = self.parent.end_datetime.dateTime().toSecsSinceEpoch()
 
             # Проверка временных интервалов
-            if start_time > end_time:
+            if start > end:
                 logging.error(
                     "Некорректные временные интервалы: Начало позже конца.")
                 return
         else:
-            # Если фильтр по времени отключён, установим start_time и end_time так, чтобы охватить все возможные логи
-            start_time = datetime.min
-            end_time = datetime.max
+            # Если фильтр по времени отключён, границы не задаются
+            start = end = None
+
+        # Фильтры по структурным полям (None — поле не фильтруется)
+        fields = {
+            'process_number': self.parent.process_spinbox.value() or None,
+            'task': self.parent.task_combobox.currentData(),
+            'event': self.parent.event_combobox.currentData(),
+        }
+
+        # Новый запрос делает все выполняющиеся устаревшими
+        self.filter_generation += 1
+        proxy_model = self.parent.proxy_model
+        store = self.parent.model.store
+        if not proxy_model.has_filters(selected_filter, search_text, start, end, fields):
+            # Без фильтров прокси показывает все строки — фильтровать нечего
+            proxy_model.set_result(selected_filter, search_text, start, end, fields, None, store.next_seq)
+            self._on_filter_done()
+            return
+
+        task = LogFilterTask(store, self.filter_generation, lambda: self.filter_generation,
+                             selected_filter, search_text, start, end, fields)
+        task.signals.progress.connect(self._on_filter_progress)
+        task.signals.finished.connect(
+            lambda generation, seqs, next_seq: self._on_filter_finished(
+                generation, seqs, next_seq, (selected_filter, search_text, start, end, fields)))
+        self.filter_task = task
+        self.filter_pool.start(task)
 
-        # Фильтрация логов
-        filtered_logs = filter_logs(
-            self.all_logs, selected_filter, search_text, start_time, end_time)
+    def _on_filter_progress(self, generation, percent):
+        if generation != self.filter_generation:
+            return
+        progress_bar = self.parent.filter_progress
+        progress_bar.setValue(percent)
+        progress_bar.setVisible(True)
 
-        # Обновление отображения в QTextEdit
-        self.parent.text_edit.clear()
-        for log in filtered_logs:
-            log_entry = f"[{log['timestamp']}] [{
-                log['log_type']}] {log['message']}\n"
-            self.parent.text_edit.append(log_entry)
+    def _on_filter_finished(self, generation, seqs, next_seq, filters):
+        if generation != self.filter_generation:
+            return  # Пока задача работала, фильтры изменились
+        self.parent.proxy_model.set_result(*filters, seqs, next_seq)
+        self._on_filter_done()
+
+    def _on_filter_done(self):
+        self.parent.filter_progress.setVisible(False)
 
         # Используем QTimer.singleShot, чтобы прокрутка произошла после обновления интерфейса
         def adjust_scrollbar():
             if not self.user_scrolled_up:
-                self.parent.text_edit.verticalScrollBar().setValue(
-                    self.parent.text_edit.verticalScrollBar().maximum())
+                self.parent.table_view.scrollToBottom()
 
         QTimer.singleShot(0, adjust_scrollbar)
 
@@ -143,10 +220,9 @@ class LogTabLogic:
                 self.parent, "Сохранить логи", "", "Text Files (*.txt);;All Files (*)")
             if file_path:
                 with open(file_path, 'w', encoding='utf-8') as file:
-                    for log in self.all_logs:
-                        timestamp_str = log['timestamp']
-                        log_type = log['log_type']
-                        message = log['message']
+                    store = self.parent.model.store
+                    for timestamp, log_type, message in store:
+                        timestamp_str = store.format_timestamp(timestamp)
                         file.write(
                             f'"{timestamp_str}","{log_type}","{message}"\n')
                 # Добавляем лог о сохранении
@@ -160,9 +236,9 @@ class LogTabLogic:
         """
         Очищает все логи.
         """
-        self.all_logs.clear()
         self.pending_logs.clear()
-        self.parent.text_edit.clear()  # Очистка текста в QTextEdit
+        self.parent.model.clear_logs()  # Очистка таблицы
+        self._update_task_filter()
         # Добавляем лог о очистке
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         logging.info("Логи очищены.")
@@ -178,11 +254,30 @@ class LogTabLogic:
 
     def copy_selected_rows(self):
         """
-        Копирует выбранные строки в буфер обмена.
+        Копирует выбранные строки в буфер обмена (без выделения — все видимые строки).
+        """
+        table_view = self.parent.table_view
+        proxy_model = self.parent.proxy_model
+        rows = sorted(index.row() for index in table_view.selectionModel().selectedRows())
+        if not rows:
+            rows = range(proxy_model.rowCount())
+        self._copy_rows(rows)
+
+    def copy_all_rows(self):
         """
+        Копирует все видимые (прошедшие фильтры) строки в буфер обмена.
+        """
+        self._copy_rows(range(self.parent.proxy_model.rowCount()))
+
+    def _copy_rows(self, rows):
+        proxy_model = self.parent.proxy_model
+        store = self.parent.model.store
+        lines = []
+        for row in rows:
+            timestamp, log_type, message = store.get(proxy_model.seq_at(row) - store.first_seq)
+            lines.append(f"[{store.format_timestamp(timestamp)}] [{log_type}] {message}")
         clipboard = QApplication.clipboard()
-        text = self.parent.text_edit.toPlainText()  # Получаем весь текст
-        clipboard.setText(text)  # Копируем в буфер обмена
+        clipboard.setText("\n".join(lines))  # Копируем в буфер обмена
 
     def show_context_menu(self, position):
         """
@@ -190,6 +285,9 @@ class LogTabLogic:
         """
         menu = QMenu()
         copy_action = QAction("Копировать все логи", self.parent)
-        copy_action.triggered.connect(self.copy_selected_rows)
+        copy_action.triggered.connect(self.copy_all_rows)
         menu.addAction(copy_action)
-        menu.exec(self.parent.text_edit.viewport().mapToGlobal(position))
+        copy_selected_action = QAction("Копировать выделенное", self.parent)
+        copy_selected_action.triggered.connect(self.copy_selected_rows)
+        menu.addAction(copy_selected_action)
+        menu.exec(self.parent.table_view.viewport().mapToGlobal(position))
@@ -1,12 +1,16 @@
 from PySide6.QtWidgets import (
     QVBoxLayout, QGridLayout, QLabel, QComboBox, QPushButton, QDateTimeEdit,
-    QSizePolicy, QHBoxLayout, QLineEdit, QTextEdit, QMenu, QFileDialog
+    QSizePolicy, QHBoxLayout, QLineEdit, QTextEdit, QMenu, QFileDialog,
+    QTableView, QHeaderView, QAbstractItemView, QProgressBar, QSpinBox
 )
 from PySide6.QtCore import Qt, QDateTime
 from PySide6.QtGui import QKeySequence, QAction
 
 import datetime
 
+from app.utils.log_fields import EVENT_LABELS
+from .LogItemDelegate import LogItemDelegate
+
 
 class LogTabUI:
     def __init__(self, parent):
@@ -17,9 +21,18 @@ class LogTabUI:
         filter_search_layout = self.create_filter_search_layout()
         main_layout.addLayout(filter_search_layout)
 
-        # Отображение логов (используем QTextEdit вместо QTableView)
-        self.parent.text_edit = self.create_text_edit()
-        main_layout.addWidget(self.parent.text_edit)
+        # Отображение логов: виртуализированная таблица над моделью через фильтр,
+        # отрисовываются только видимые строки
+        self.parent.table_view = self.create_table_view()
+        main_layout.addWidget(self.parent.table_view)
+
+        # Прогресс фоновой фильтрации; показывается только при долгом переборе
+        self.parent.filter_progress = QProgressBar()
+        self.parent.filter_progress.setRange(0, 100)
+        self.parent.filter_progress.setFixedHeight(12)
+        self.parent.filter_progress.setTextVisible(False)
+        self.parent.filter_progress.setVisible(False)
+        main_layout.addWidget(self.parent.filter_progress)
 
         # Убедимся, что сохраняются только кнопки для сохранения и очистки логов.
         save_layout = self.create_save_layout()  # Без лишнего поля
@@ -117,6 +130,49 @@ class LogTabUI:
         self.parent.search_input.textChanged.connect(
             self.parent.on_filter_changed)
 
+        # Фильтры по структурным полям записей: процесс, задача, событие
+        self.parent.process_label = QLabel("Процесс:")
+        self.parent.process_label.setStyleSheet("color: white;")
+        self.parent.process_spinbox = QSpinBox()
+        self.parent.process_spinbox.setRange(0, 9999)
+        self.parent.process_spinbox.setSpecialValueText("Все")  # 0 — без фильтра
+        self.parent.process_spinbox.setToolTip(
+            "Показывать логи только выбранного процесса.")
+        self.parent.process_spinbox.setFixedWidth(70)
+        self.parent.process_spinbox.valueChanged.connect(
+            self.parent.on_filter_changed)
+
+        self.parent.task_label = QLabel("Задача:")
+        self.parent.task_label.setStyleSheet("color: white;")
+        self.parent.task_combobox = QComboBox()
+        self.parent.task_combobox.addItem("Все задачи", None)
+        self.parent.task_combobox.setToolTip(
+            "Показывать логи только выбранной задачи.")
+        self.parent.task_combobox.setFixedWidth(150)
+        self.parent.task_combobox.currentIndexChanged.connect(
+            self.parent.on_filter_changed)
+
+        self.parent.event_label = QLabel("Событие:")
+        self.parent.event_label.setStyleSheet("color: white;")
+        self.parent.event_combobox = QComboBox()
+        self.parent.event_combobox.addItem("Все события", None)
+        for event, label in EVENT_LABELS.items():
+            self.parent.event_combobox.addItem(label, event)
+        self.parent.event_combobox.setToolTip(
+            "Показывать только записи выбранного события выполнения.")
+        self.parent.event_combobox.setFixedWidth(150)
+        self.parent.event_combobox.currentIndexChanged.connect(
+            self.parent.on_filter_changed)
+
+        fields_layout = QHBoxLayout()
+        fields_layout.setSpacing(10)
+        fields_layout.addWidget(self.parent.process_spinbox)
+        fields_layout.addWidget(self.parent.task_label)
+        fields_layout.addWidget(self.parent.task_combobox)
+        fields_layout.addWidget(self.parent.event_label)
+        fields_layout.addWidget(self.parent.event_combobox)
+        fields_layout.addStretch()
+
         # Создание макетов для меток и полей
         start_layout = QHBoxLayout()
         start_layout.setSpacing(5)
@@ -144,19 +200,45 @@ class LogTabUI:
         filter_search_layout.addLayout(time_filter_layout, 1, 0, 1, 4)
         filter_search_layout.addWidget(self.parent.search_label, 2, 0)
         filter_search_layout.addWidget(self.parent.search_input, 2, 1, 1, 3)
+        filter_search_layout.addWidget(self.parent.process_label, 3, 0)
+        filter_search_layout.addLayout(fields_layout, 3, 1, 1, 3)
 
         return filter_search_layout  # Возвращаем макет
 
-    def create_text_edit(self):
+    def create_table_view(self):
         """
-        Создаёт QTextEdit для отображения логов.
+        Создаёт QTableView для отображения логов.
         """
-        text_edit = QTextEdit()
-        text_edit.setReadOnly(True)  # Отключаем редактирование
-        text_edit.setLineWrapMode(QTextEdit.NoWrap)  # Отключаем перенос строк
-        text_edit.setMinimumHeight(200)
+        table_view = QTableView()
+        table_view.setModel(self.parent.proxy_model)
+        delegate = LogItemDelegate(table_view)
+        table_view.setItemDelegate(delegate)
+        table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)  # Отключаем редактирование
+        table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        table_view.setWordWrap(False)  # Отключаем перенос строк
+        table_view.setShowGrid(False)
+        table_view.setMinimumHeight(200)
+
+        # Одинаковая высота строк: представлению не нужно измерять каждую строку
+        vertical_header = table_view.verticalHeader()
+        vertical_header.setVisible(False)
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(delegate.row_height)
+
+        horizontal_header = table_view.horizontalHeader()
+        horizontal_header.setSectionResizeMode(0, QHeaderView.Fixed)
+        horizontal_header.setSectionResizeMode(1, QHeaderView.Fixed)
+        horizontal_header.resizeSection(0, 140)
+        horizontal_header.resizeSection(1, 70)
+        horizontal_header.setStretchLastSection(True)
+
+        table_view.verticalScrollBar().valueChanged.connect(
+            self.parent.on_scrollbar_value_changed)
+        table_view.setContextMenuPolicy(Qt.CustomContextMenu)
+        table_view.customContextMenuRequested.connect(self.parent.show_context_menu)
 
-        return text_edit
+        return table_view
 
     def create_save_layout(self):
         """
@@ -1,16 +1,41 @@
 # app/design/LogTab/LogTableModel.py
 
-from PySide6.QtCore import QAbstractTableModel, Qt
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtGui import QColor
+
+from app.utils.log_fields import EVENT_LABELS
+from .LogSearchIndex import LogSearchIndex
+from .LogStore import LogStore
+
+# Цвет текста строк по уровню лога
+LEVEL_COLORS = {
+    'DEBUG': QColor(150, 150, 150),
+    'WARNING': QColor(230, 180, 80),
+    'ERROR': QColor(240, 100, 100),
+    'CRITICAL': QColor(255, 60, 60),
+}
 
 
 class LogTableModel(QAbstractTableModel):
-    def __init__(self, parent=None):
+    """
+    Модель логов для QTableView поверх кольцевого буфера LogStore.
+
+    Новые записи добавляются в конец (append_logs), вытесняемые удаляются из
+    начала с уведомлением представления только о затронутых строках:
+    представление перерисовывает видимые строки, а не всю историю.
+    """
+
+    def __init__(self, parent=None, capacity=1000, indexed=True):
+        """
+        :param capacity: Максимальное количество хранимых логов.
+        :param indexed: Вести индекс полнотекстового поиска по сообщениям.
+        """
         super().__init__(parent)
-        self.logs = []
+        self.store = LogStore(capacity, LogSearchIndex() if indexed else None)
         self.headers = ["Время", "Тип", "Сообщение"]
 
     def rowCount(self, parent=None):
-        return len(self.logs)
+        return len(self.store)
 
     def columnCount(self, parent=None):
         return 3  # Время, Тип, Сообщение
@@ -18,18 +43,35 @@ class LogTableModel(QAbstractTableModel):
     def data(self, index, role=Qt.DisplayRole):
         if not index.isValid():
             return None
-        if index.row() >= len(self.logs) or index.row() < 0:
+        if index.row() >= len(self.store) or index.row() < 0:
             return None
-        log = self.logs[index.row()]
         if role == Qt.DisplayRole:
             if index.column() == 0:
-                return log['timestamp']
+                return self.store.format_timestamp(self.store.timestamp_at(index.row()))
             elif index.column() == 1:
-                return log['log_type']
+                return self.store.level_at(index.row())
             elif index.column() == 2:
-                return log['message']
+                return self.store.message_at(index.row())
+        elif role == Qt.ForegroundRole:
+            return LEVEL_COLORS.get(self.store.level_at(index.row()))
+        elif role == Qt.ToolTipRole:
+            return self.fields_tooltip(index.row())
         return None
 
+    def fields_tooltip(self, row):
+        """
+        :return: Структурные поля строки для всплывающей подсказки (None — полей нет).
+        """
+        process_number, task, event = self.store.fields_at(row)
+        lines = []
+        if process_number is not None:
+            lines.append(f"Процесс: {process_number}")
+        if task is not None:
+            lines.append(f"Задача: {task}")
+        if event is not None:
+            lines.append(f"Событие: {EVENT_LABELS.get(event, event)}")
+        return "\n".join(lines) or None
+
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role != Qt.DisplayRole:
             return None
@@ -38,12 +80,35 @@ class LogTableModel(QAbstractTableModel):
                 return self.headers[section]
         return None
 
+    def append_logs(self, entries):
+        """
+        Добавляет записи в конец модели; при заполненном буфере самые старые вытесняются.
+
+        :param entries: Список кортежей (timestamp в секундах эпохи, log_type, message)
+                        или с полями (..., process_number, task, event).
+        """
+        if not entries:
+            return
+        capacity = self.store.capacity
+        if len(entries) > capacity:
+            entries = entries[-capacity:]
+        excess = len(self.store) + len(entries) - capacity
+        if excess > 0:
+            self.beginRemoveRows(QModelIndex(), 0, excess - 1)
+            self.store.evict(excess)
+            self.endRemoveRows()
+        first = len(self.store)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        self.store.extend(entries)
+        self.endInsertRows()
+
     def update_logs(self, new_logs):
         self.beginResetModel()
-        self.logs = new_logs
+        self.store.clear()
+        self.store.extend(new_logs[-self.store.capacity:])
         self.endResetModel()
 
     def clear_logs(self):
         self.beginResetModel()
-        self.logs = []
+        self.store.clear()
         self.endResetModel()
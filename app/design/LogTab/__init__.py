@@ -4,5 +4,9 @@ from .LogTab import LogTab
 from .LogTabLogic import LogTabLogic
 from .LogTabUI import LogTabUI
 from .LogTableModel import LogTableModel
+from .LogFilterProxyModel import LogFilterProxyModel
+from .LogFilterTask import LogFilterTask
+from .LogStore import LogStore
+from .LogSearchIndex import LogSearchIndex
 from .LogFilters import filter_logs
 from .LogItemDelegate import LogItemDelegate
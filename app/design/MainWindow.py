@@ -12,6 +12,7 @@ from app.design.ControlPanel import ControlPanel
 from app.design.TaskManager import TaskManager
 from app.design.Panel2 import Panel2
 from app.Logic.LogicThread import LogicThread
+from app.Logic.ExecutionRunner import SCHEDULING_CHAIN, DEFAULT_DRAIN_TIMEOUT
 
 
 class MainWindow(QWidget):
@@ -98,6 +99,7 @@ class MainWindow(QWidget):
 
             # Подключение сигналов логирования через LogEmitter
             self.log_emitter.new_log.connect(self.panel2.update_log_output)
+            self.log_emitter.new_logs.connect(self.panel2.update_log_batch)
 
             # Добавляем флаг для отслеживания состояния закрытия
             self.is_closing = False
@@ -139,10 +141,26 @@ class MainWindow(QWidget):
                 execution_count = settings_tab.execution_count_input.value()
             else:
                 execution_count = float('inf')  # Для бесконечного режима
+            max_executions_per_worker = settings_tab.max_executions_per_worker_input.value()
+            scheduling_mode = settings_tab.scheduling_mode_input.currentText()
+            resource_limits = settings_tab.get_resource_limits()
+            autoscale = settings_tab.autoscale_input.isChecked()
+            autoscale_min = settings_tab.autoscale_min_input.value()
+            drain_timeout = settings_tab.drain_timeout_input.value()
+            suspend_on_pause = settings_tab.suspend_on_pause_input.isChecked()
+            worker_concurrency = settings_tab.worker_concurrency_input.value()
         except AttributeError as e:
             thread_count = 5
             mode = "Ограничение"
             execution_count = 10
+            max_executions_per_worker = 0
+            scheduling_mode = SCHEDULING_CHAIN
+            resource_limits = {}
+            autoscale = False
+            autoscale_min = 1
+            drain_timeout = DEFAULT_DRAIN_TIMEOUT
+            suspend_on_pause = True
+            worker_concurrency = 1
             logging.warning(
                 f"Не удалось получить настройки из Panel2. Используются значения по умолчанию. Ошибка: {e}")
 
@@ -157,11 +175,21 @@ class MainWindow(QWidget):
             mode=mode,
             execution_count=execution_count,
             tasks_directory="app/tasks",
-            log_queue=self.log_queue  # Передаём очередь
+            log_queue=self.log_queue,  # Передаём очередь
+            max_executions_per_worker=max_executions_per_worker,
+            scheduling_mode=scheduling_mode,
+            resource_limits=resource_limits,
+            autoscale=autoscale,
+            autoscale_min=autoscale_min,
+            drain_timeout=drain_timeout,
+            suspend_on_pause=suspend_on_pause,
+            worker_concurrency=worker_concurrency
         )
         self.logic_thread.log_signal.connect(self.update_log_output)
         self.logic_thread.status_signal.connect(
             self.control_panel.update_status)
+        self.logic_thread.concurrency_signal.connect(
+            self.control_panel.update_concurrency)
         self.logic_thread.all_executions_completed.connect(
             self.on_all_executions_completed)
         self.logic_thread.finished.connect(self.on_logic_thread_finished)
@@ -198,7 +226,8 @@ class MainWindow(QWidget):
     def cleanup(self):
         self.is_closing = True  # Устанавливаем флаг перед началом очистки
         if self.logic_thread and self.logic_thread.isRunning():
-            self.logic_thread.stop()
+            # При закрытии окна не ждём завершения выполнений
+            self.logic_thread.stop(drain_timeout=0)
             self.logic_thread.wait(5000)  # Ждем максимум 5 секунд
             if self.logic_thread.isRunning():
                 logging.warning(
@@ -299,7 +328,15 @@ class MainWindow(QWidget):
             "general_settings": {
                 "thread_count": 5,
                 "execution_mode": "Ограничение",
-                "execution_count": 10
+                "execution_count": 10,
+                "max_executions_per_worker": 0,
+                "scheduling_mode": SCHEDULING_CHAIN,
+                "resource_limits": {},
+                "autoscale": False,
+                "autoscale_min": 1,
+                "drain_timeout": DEFAULT_DRAIN_TIMEOUT,
+                "suspend_on_pause": True,
+                "worker_concurrency": 1
             },
             "tasks_settings": {}
         }
@@ -328,6 +365,22 @@ class MainWindow(QWidget):
                 general_settings.get("execution_mode", "Ограничение"))
             settings_tab.execution_count_input.setValue(
                 general_settings.get("execution_count", 10))
+            settings_tab.max_executions_per_worker_input.setValue(
+                general_settings.get("max_executions_per_worker", 0))
+            settings_tab.scheduling_mode_input.setCurrentText(
+                general_settings.get("scheduling_mode", SCHEDULING_CHAIN))
+            settings_tab.set_resource_limits(
+                general_settings.get("resource_limits", {}))
+            settings_tab.autoscale_input.setChecked(
+                general_settings.get("autoscale", False))
+            settings_tab.autoscale_min_input.setValue(
+                general_settings.get("autoscale_min", 1))
+            settings_tab.drain_timeout_input.setValue(
+                general_settings.get("drain_timeout", DEFAULT_DRAIN_TIMEOUT))
+            settings_tab.suspend_on_pause_input.setChecked(
+                general_settings.get("suspend_on_pause", True))
+            settings_tab.worker_concurrency_input.setValue(
+                general_settings.get("worker_concurrency", 1))
 
             tasks_settings = config_data.get("tasks_settings", {})
             tasks_tab = self.panel2.tasks_tab
@@ -347,7 +400,15 @@ class MainWindow(QWidget):
         general_settings = {
             "thread_count": settings_tab.processes_input.value(),
             "execution_mode": settings_tab.execution_mode_input.currentText(),
-            "execution_count": settings_tab.execution_count_input.value()
+            "execution_count": settings_tab.execution_count_input.value(),
+            "max_executions_per_worker": settings_tab.max_executions_per_worker_input.value(),
+            "scheduling_mode": settings_tab.scheduling_mode_input.currentText(),
+            "resource_limits": settings_tab.get_resource_limits(),
+            "autoscale": settings_tab.autoscale_input.isChecked(),
+            "autoscale_min": settings_tab.autoscale_min_input.value(),
+            "drain_timeout": settings_tab.drain_timeout_input.value(),
+            "suspend_on_pause": settings_tab.suspend_on_pause_input.isChecked(),
+            "worker_concurrency": settings_tab.worker_concurrency_input.value()
         }
 
         tasks_settings = tasks_tab.task_settings
@@ -360,7 +421,8 @@ class MainWindow(QWidget):
     def cleanup(self):
         self.is_closing = True  # Устанавливаем флаг перед началом очистки
         if self.logic_thread and self.logic_thread.isRunning():
-            self.logic_thread.stop()
+            # При закрытии окна не ждём завершения выполнений
+            self.logic_thread.stop(drain_timeout=0)
             self.logic_thread.wait(5000)  # Ждем максимум 5 секунд
             if self.logic_thread.isRunning():
                 logging.warning(
@@ -39,3 +39,9 @@ class Panel2(QWidget):
         Метод для обновления логов во вкладке LogTab.
         """
         self.log_tab.add_log(timestamp, log_type, message)
+
+    def update_log_batch(self, entries):
+        """
+        Метод для добавления пакета логов во вкладку LogTab.
+        """
+        self.log_tab.add_logs(entries)
@@ -12,6 +12,13 @@ class QTextEditLogger(logging.Handler):
     def emit(self, record):
         try:
             msg = self.format(record)
+            # Записи процессов пула несут номер процесса в структурном поле
+            process_number = getattr(record, 'process_number', None)
+            if process_number is not None:
+                message = record.getMessage()
+                prefix = f"Процесс {process_number}"
+                self.text_edit.append(message if message.startswith(prefix) else f"{prefix}: {message}")
+                return
             # Предполагаем, что сообщение содержит "Процесс {номер}: сообщение"
             # Если нет, то пытаемся его извлечь из полного сообщения
             # Пример полного сообщения: "Задача А: Процесс 1 начал выполнение."
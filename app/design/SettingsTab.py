@@ -1,9 +1,11 @@
 # app/design/SettingsTab.py
 
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QSpinBox, QComboBox
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QSpinBox, QComboBox, QLineEdit, QCheckBox
 from PySide6.QtCore import Qt
 import logging
 
+from app.Logic.ExecutionRunner import SCHEDULING_MODES, SCHEDULING_PIPELINE, DEFAULT_DRAIN_TIMEOUT
+
 
 class SettingsTab(QWidget):
     def __init__(self, parent=None):
@@ -45,13 +47,136 @@ class SettingsTab(QWidget):
         execution_count_layout.addWidget(self.execution_count_input)
         execution_count_layout.addStretch()
 
+        # Перезапуск процесса пула после заданного количества выполнений (0 — никогда)
+        max_executions_layout = QHBoxLayout()
+        max_executions_label = QLabel("Перезапуск процесса после выполнений:")
+        self.max_executions_per_worker_input = QSpinBox()
+        self.max_executions_per_worker_input.setRange(0, 100000)
+        self.max_executions_per_worker_input.setValue(0)
+        self.max_executions_per_worker_input.setToolTip(
+            "0 — процессы не перезапускаются.")
+        max_executions_layout.addWidget(max_executions_label)
+        max_executions_layout.addWidget(self.max_executions_per_worker_input)
+        max_executions_layout.addStretch()
+
+        # Одновременных выполнений в одном процессе (задачи с async def run() и I/O)
+        worker_concurrency_layout = QHBoxLayout()
+        worker_concurrency_label = QLabel("Выполнений на процесс:")
+        self.worker_concurrency_input = QSpinBox()
+        self.worker_concurrency_input.setRange(1, 10000)
+        self.worker_concurrency_input.setValue(1)
+        self.worker_concurrency_input.setToolTip(
+            "Больше 1 — процесс выполняет несколько цепочек одновременно в цикле asyncio.\n"
+            "Лимит для отдельной задачи задаётся resources.concurrency в manifest.yaml.")
+        worker_concurrency_layout.addWidget(worker_concurrency_label)
+        worker_concurrency_layout.addWidget(self.worker_concurrency_input)
+        worker_concurrency_layout.addStretch()
+
+        # Режим планирования: цепочка целиком в одном процессе или конвейер по задачам
+        scheduling_layout = QHBoxLayout()
+        scheduling_label = QLabel("Режим планирования:")
+        self.scheduling_mode_input = QComboBox()
+        self.scheduling_mode_input.addItems(list(SCHEDULING_MODES))
+        self.scheduling_mode_input.setToolTip(
+            "Конвейер: каждая задача выполняется пулом своего вида ресурса.")
+        scheduling_layout.addWidget(scheduling_label)
+        scheduling_layout.addWidget(self.scheduling_mode_input)
+        scheduling_layout.addStretch()
+
+        # Лимиты процессов по видам ресурсов (только для режима "Конвейер")
+        resource_limits_layout = QHBoxLayout()
+        resource_limits_label = QLabel("Лимиты ресурсов:")
+        self.resource_limits_input = QLineEdit()
+        self.resource_limits_input.setPlaceholderText("browser=5, light=50")
+        self.resource_limits_input.setToolTip(
+            "Количество процессов для каждого вида ресурса (resources.kind в manifest.yaml).\n"
+            "Для видов без лимита используется количество процессов.")
+        resource_limits_layout.addWidget(resource_limits_label)
+        resource_limits_layout.addWidget(self.resource_limits_input)
+        resource_limits_layout.addStretch()
+        self.scheduling_mode_input.currentTextChanged.connect(
+            self.update_resource_limits_state)
+        self.update_resource_limits_state(
+            self.scheduling_mode_input.currentText())
+
+        # Автомасштабирование по загрузке CPU и памяти; количество процессов — максимум
+        autoscale_layout = QHBoxLayout()
+        self.autoscale_input = QCheckBox("Автомасштабирование")
+        self.autoscale_input.setToolTip(
+            "Число активных слотов подбирается по загрузке CPU и памяти\n"
+            "в пределах от минимума до количества процессов.")
+        autoscale_min_label = QLabel("Минимум слотов:")
+        self.autoscale_min_input = QSpinBox()
+        self.autoscale_min_input.setRange(1, 100)
+        self.autoscale_min_input.setValue(1)
+        autoscale_layout.addWidget(self.autoscale_input)
+        autoscale_layout.addWidget(autoscale_min_label)
+        autoscale_layout.addWidget(self.autoscale_min_input)
+        autoscale_layout.addStretch()
+        self.autoscale_input.toggled.connect(self.autoscale_min_input.setEnabled)
+        self.autoscale_min_input.setEnabled(False)
+
+        # Время на завершение начатых выполнений после нажатия «Стоп»
+        drain_timeout_layout = QHBoxLayout()
+        drain_timeout_label = QLabel("Ожидание завершения при остановке, с:")
+        self.drain_timeout_input = QSpinBox()
+        self.drain_timeout_input.setRange(0, 3600)
+        self.drain_timeout_input.setValue(DEFAULT_DRAIN_TIMEOUT)
+        self.drain_timeout_input.setToolTip(
+            "По истечении времени процессы и запущенные ими браузеры завершаются принудительно.\n"
+            "0 — завершать сразу.")
+        drain_timeout_layout.addWidget(drain_timeout_label)
+        drain_timeout_layout.addWidget(self.drain_timeout_input)
+        drain_timeout_layout.addStretch()
+
+        # Приостановка процессов пула и браузеров на паузе
+        self.suspend_on_pause_input = QCheckBox("Приостанавливать процессы на паузе")
+        self.suspend_on_pause_input.setChecked(True)
+        self.suspend_on_pause_input.setToolTip(
+            "Процессы и запущенные ими браузеры приостанавливаются и не занимают CPU и сеть.\n"
+            "Иначе на паузе только не запускаются новые выполнения.")
+
         # Добавление всех настроек в макет
         layout.addLayout(processes_layout)
         layout.addLayout(mode_layout)
         layout.addLayout(execution_count_layout)
+        layout.addLayout(max_executions_layout)
+        layout.addLayout(worker_concurrency_layout)
+        layout.addLayout(scheduling_layout)
+        layout.addLayout(resource_limits_layout)
+        layout.addLayout(autoscale_layout)
+        layout.addLayout(drain_timeout_layout)
+        layout.addWidget(self.suspend_on_pause_input)
 
         # Добавление растяжки для выравнивания
         layout.addStretch()
 
         self.setLayout(layout)
         logging.debug("SettingsTab: Интерфейс инициализирован.")
+
+    def update_resource_limits_state(self, scheduling_mode):
+        self.resource_limits_input.setEnabled(
+            scheduling_mode == SCHEDULING_PIPELINE)
+
+    def get_resource_limits(self):
+        """
+        Разбирает поле лимитов ресурсов вида "browser=5, light=50".
+
+        :return: Словарь {вид ресурса: количество процессов}.
+        """
+        limits = {}
+        for part in self.resource_limits_input.text().split(','):
+            kind, _, value = part.partition('=')
+            kind = kind.strip()
+            if not kind:
+                continue
+            try:
+                limits[kind] = max(1, int(value))
+            except ValueError:
+                logging.warning(
+                    f"SettingsTab: Некорректный лимит ресурса '{part.strip()}' пропущен.")
+        return limits
+
+    def set_resource_limits(self, limits):
+        self.resource_limits_input.setText(
+            ", ".join(f"{kind}={value}" for kind, value in (limits or {}).items()))
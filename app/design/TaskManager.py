@@ -1,61 +1,52 @@
 # design/TaskManager.py
 
 import os
-import importlib.util
+import asyncio
+import contextvars
+import inspect
 import logging
-import yaml  # Импортируем PyYAML
+from app.design.TaskRegistry import TaskRegistry, CACHE_FILE_NAME
+from app.utils.cancellation import TaskCancelled
+from app.utils.http_fetcher import task_fetch_backend
+from app.utils.log_fields import EVENT_TASK_FAILED, log_extra
 
 
 class TaskManager:
-    def __init__(self, tasks_directory, log_helper=None):
+    def __init__(self, tasks_directory, log_helper=None, registry_index=None):
         self.tasks_directory = tasks_directory
         self.log_helper = log_helper
-        self.available_tasks = self.load_available_tasks()
+        # Реестр задач строится один раз; в дочерних процессах он
+        # восстанавливается из переданного индекса без импорта задач
+        if registry_index is None:
+            self.registry = TaskRegistry(
+                tasks_directory, cache_path=os.path.join(tasks_directory, CACHE_FILE_NAME))
+        else:
+            self.registry = TaskRegistry.from_index(
+                tasks_directory, registry_index)
+        self.available_tasks = self.load_available_tasks(
+            rescan=registry_index is None)
         logging.debug(f"TaskManager инициализирован с задачами: {
                       self.available_tasks}")
 
-    def load_available_tasks(self):
+    def load_available_tasks(self, rescan=True):
         """
         Загружает доступные задачи из директории tasks_directory, включая их настройки из config.yaml.
+
+        :param rescan: Пересканировать директорию задач (иначе используется текущий реестр).
         """
-        task_names = []
-        self.task_configs = {}  # Словарь для хранения конфигураций задач
-        for task_dir in os.listdir(self.tasks_directory):
-            task_path = os.path.join(self.tasks_directory, task_dir, 'task.py')
-            config_path = os.path.join(
-                self.tasks_directory, task_dir, 'config.yaml')
-            if os.path.isfile(task_path):
-                spec = importlib.util.spec_from_file_location(
-                    "task", task_path)
-                module = importlib.util.module_from_spec(spec)
-                try:
-                    spec.loader.exec_module(module)
-                    task_class = getattr(module, "Task", None)
-                    if task_class:
-                        # Инициализируем экземпляр задачи без аргументов
-                        task_instance = task_class(
-                            shared_resources=None, process_number=None, log_queue=None)
-                        task_name = task_instance.get_task_name()
-                        task_names.append(task_name)
-                        logging.debug(
-                            f"Задача '{task_name}' успешно загружена.")
-
-                        # Загрузка конфигурации, если файл существует
-                        if os.path.isfile(config_path):
-                            with open(config_path, 'r', encoding='utf-8') as config_file:
-                                try:
-                                    config = yaml.safe_load(config_file)
-                                    self.task_configs[task_name] = config
-                                    logging.debug(f"Конфигурация для задачи '{
-                                                  task_name}' загружена.")
-                                except yaml.YAMLError as e:
-                                    logging.error(f"Ошибка при загрузке config.yaml для задачи '{
-                                                  task_name}': {e}")
-                except Exception as e:
-                    logging.error(f"Не удалось загрузить задачу из {
-                                  task_path}: {e}")
+        task_names = self.registry.discover() if rescan else self.registry.names()
+        # Словарь для хранения конфигураций задач
+        self.task_configs = {
+            name: entry['config'] for name, entry in self.registry.entries.items()
+            if entry.get('config') is not None}
         return task_names
 
+    def get_registry_index(self):
+        """
+        Возвращает сериализуемый индекс реестра задач для передачи в дочерние процессы.
+        """
+        return self.registry.to_index()
+
     def get_task_names(self):
         """
         Возвращает список доступных задач.
@@ -66,24 +57,7 @@ class TaskManager:
         """
         Возвращает класс задачи по её имени.
         """
-        for task_dir in os.listdir(self.tasks_directory):
-            task_path = os.path.join(self.tasks_directory, task_dir, 'task.py')
-            if os.path.isfile(task_path):
-                spec = importlib.util.spec_from_file_location(
-                    "task", task_path)
-                module = importlib.util.module_from_spec(spec)
-                try:
-                    spec.loader.exec_module(module)
-                    task_class = getattr(module, "Task", None)
-                    if task_class:
-                        task_instance = task_class(
-                            shared_resources=None, process_number=None, log_queue=None)
-                        if task_instance.get_task_name() == task_name:
-                            return task_class
-                except Exception as e:
-                    logging.error(f"Не удалось загрузить задачу '{
-                                  task_name}' из {task_path}: {e}")
-        raise ValueError(f"Задача с именем '{task_name}' не найдена.")
+        return self.registry.get_task_class(task_name)
 
     def get_task_config(self, task_name):
         """
@@ -91,28 +65,81 @@ class TaskManager:
         """
         return self.task_configs.get(task_name, {})
 
-    def execute_task(self, localized_task_name, shared_resources, thread_number=None, settings=None):
+    def get_task_resources(self, task_name):
+        """
+        Возвращает подсказки о ресурсах задачи из её манифеста.
+        """
+        return self.registry.get_resources(task_name)
+
+    def _create_task_instance(self, localized_task_name, shared_resources, thread_number, settings,
+                              cancel_token):
+        # Получение класса задачи по имени
+        task_class = self.get_task_class(localized_task_name)
+        task_instance = task_class(
+            shared_resources=shared_resources,
+            process_number=thread_number,  # Передаём process_number
+            log_queue=None,  # Убираем, если не используете внутри Task
+            log_helper=self.log_helper,
+            settings=settings  # Передаём настройки
+        )
+        if cancel_token is not None:
+            task_instance.cancel_token = cancel_token
+        # Подсказки манифеста (resources.kind, resources.fetch) доступны задаче
+        task_instance.resources = self.get_task_resources(localized_task_name)
+        return task_instance
+
+    def execute_task(self, localized_task_name, shared_resources, thread_number=None, settings=None,
+                     cancel_token=None):
         """
         Выполняет задачу по имени с переданными настройками.
 
+        Задача с async def run() выполняется в собственном цикле asyncio.
+
         :param localized_task_name: Локализованное имя задачи.
         :param shared_resources: Общие ресурсы (если нужны).
         :param thread_number: Номер процесса (для логирования).
         :param settings: Настройки задачи, полученные из config.yaml.
+        :param cancel_token: CancellationToken выполнения; доступен задаче как self.cancel_token.
         """
         try:
-            # Получение класса задачи по имени
-            task_class = self.get_task_class(localized_task_name)
-            task_instance = task_class(
-                shared_resources=shared_resources,
-                process_number=thread_number,  # Передаём process_number
-                log_queue=None,  # Убираем, если не используете внутри Task
-                log_helper=self.log_helper,
-                settings=settings  # Передаём настройки
-            )
-
-            task_instance.run()
+            task_instance = self._create_task_instance(
+                localized_task_name, shared_resources, thread_number, settings, cancel_token)
+            # fetch_page() без backend использует resources.fetch задачи
+            with task_fetch_backend(task_instance.resources):
+                result = task_instance.run()
+                if inspect.isawaitable(result):
+                    asyncio.run(result)
+        except TaskCancelled:
+            raise
+        except Exception as e:
+            logging.error(f"TaskManager: Ошибка при выполнении задачи '{
+                          localized_task_name}': {e}",
+                          extra=log_extra(thread_number, localized_task_name, EVENT_TASK_FAILED))
+            raise
+
+    async def execute_task_async(self, localized_task_name, shared_resources, thread_number=None,
+                                 settings=None, cancel_token=None, executor=None):
+        """
+        Выполняет задачу в текущем цикле asyncio: async def run() ожидается
+        напрямую, синхронный run() выполняется в executor.
+
+        :param executor: concurrent.futures.Executor для синхронных задач (None — executor цикла).
+        """
+        try:
+            task_instance = self._create_task_instance(
+                localized_task_name, shared_resources, thread_number, settings, cancel_token)
+            with task_fetch_backend(task_instance.resources):
+                if inspect.iscoroutinefunction(task_instance.run):
+                    await task_instance.run()
+                else:
+                    # run_in_executor не переносит контекст: без copy_context записи
+                    # задачи потеряли бы процесс и задачу из log_context
+                    context = contextvars.copy_context()
+                    await asyncio.get_running_loop().run_in_executor(executor, context.run, task_instance.run)
+        except TaskCancelled:
+            raise
         except Exception as e:
             logging.error(f"TaskManager: Ошибка при выполнении задачи '{
-                          localized_task_name}': {e}")
+                          localized_task_name}': {e}",
+                          extra=log_extra(thread_number, localized_task_name, EVENT_TASK_FAILED))
             raise
@@ -0,0 +1,316 @@
+# design/TaskRegistry.py
+
+import os
+import hashlib
+import importlib.util
+import json
+import logging
+import yaml  # Импортируем PyYAML
+
+# Имя файла индекса обнаружения задач внутри tasks_directory
+CACHE_FILE_NAME = '.task_index.json'
+CACHE_VERSION = 3
+# Файлы плагина, изменения которых учитываются в отпечатке
+FINGERPRINT_EXTENSIONS = ('.py', '.yaml', '.yml')
+# Необязательный декларативный манифест задачи рядом с config.yaml
+MANIFEST_FILE_NAME = 'manifest.yaml'
+DEFAULT_ENTRY_POINT = 'task:Task'
+# Файл схемы настроек, если манифест не задаёт другой
+DEFAULT_CONFIG_FILE = 'config.yaml'
+
+
+class TaskRegistry:
+    """
+    Реестр задач: локализованное имя задачи -> модуль, класс и конфигурация.
+
+    Каждый task.py импортируется не более одного раза за жизнь реестра.
+    Индекс реестра (to_index) сериализуем и передаётся в дочерние процессы,
+    где реестр восстанавливается без импорта задач (from_index); модуль
+    конкретной задачи импортируется при первом обращении к её классу.
+
+    Результаты обнаружения сохраняются на диск вместе с отпечатками файлов
+    плагина (mtime, размер, sha1). При следующем запуске импортируются только
+    изменённые плагины, остальные берутся из кэша без выполнения их кода.
+
+    Плагин с manifest.yaml не импортируется при обнаружении вовсе: имя,
+    точка входа, конфигурация и подсказки о ресурсах читаются из манифеста,
+    а модуль задачи загружается только в процессе, который её выполняет.
+
+    Формат manifest.yaml:
+
+        name: "Открыть браузер"      # локализованное имя задачи
+        entry_point: "task:Task"     # модуль плагина и класс задачи
+        config: "config.yaml"        # файл схемы настроек или сама схема
+        resources:                   # подсказки планировщику и задаче
+          kind: browser              # пул процессов в режиме «Конвейер»
+          fetch: http                # http — пул HTTP-соединений, browser — Chrome
+          concurrency: 100           # одновременных выполнений задачи в одном процессе
+    """
+
+    def __init__(self, tasks_directory, cache_path=None):
+        self.tasks_directory = tasks_directory
+        # Путь к файлу кэша обнаружения (None — кэш не используется)
+        self.cache_path = cache_path
+        # Ключ: имя задачи, Значение: {'task_dir', 'task_path', 'class_name', 'config', 'resources'}
+        self.entries = {}
+        self._classes = {}  # Ключ: имя задачи, Значение: класс Task
+
+    @classmethod
+    def from_index(cls, tasks_directory, index):
+        """
+        Восстанавливает реестр из индекса без импорта модулей задач.
+
+        :param tasks_directory: Директория с задачами.
+        :param index: Результат to_index().
+        """
+        registry = cls(tasks_directory)
+        registry.entries = {name: dict(entry) for name, entry in index.items()}
+        return registry
+
+    def to_index(self):
+        """
+        Возвращает сериализуемый индекс реестра для передачи в другие процессы.
+        """
+        return {name: dict(entry) for name, entry in self.entries.items()}
+
+    def discover(self):
+        """
+        Обходит tasks_directory и собирает задачи. Плагины, отпечатки которых
+        совпадают с кэшем, не импортируются; изменённые импортируются однократно,
+        при изменении только файла конфигурации (config.yaml или указанного в
+        манифесте) перечитывается лишь конфигурация.
+
+        :return: Список имён найденных задач.
+        """
+        cached = self._read_cache()
+        plugins = {}  # Ключ: task_dir, Значение: запись для кэша
+        self.entries.clear()
+        self._classes.clear()
+        for task_dir in sorted(os.listdir(self.tasks_directory)):
+            task_path = os.path.join(self.tasks_directory, task_dir, 'task.py')
+            manifest_path = os.path.join(
+                self.tasks_directory, task_dir, MANIFEST_FILE_NAME)
+            has_manifest = os.path.isfile(manifest_path)
+            if not has_manifest and not os.path.isfile(task_path):
+                continue
+
+            previous = cached.get(task_dir, {})
+            # Файл конфигурации из манифеста известен по кэшу; None — схема в манифесте
+            config_file = previous.get('config_file', DEFAULT_CONFIG_FILE)
+            files = self._fingerprint(task_dir, previous.get('files', {}), config_file)
+            changed = {name for name in set(files) | set(previous.get('files', {}))
+                       if files.get(name, [None, None, None])[2]
+                       != previous.get('files', {}).get(name, [None, None, None])[2]}
+
+            if previous and not changed - {config_file}:
+                # Код плагина не менялся — метаданные берём из кэша
+                entry = dict(previous, files=files)
+                if changed and config_file is not None:
+                    entry['config'] = self._load_config(
+                        entry['task_name'], os.path.join(self.tasks_directory, task_dir, config_file))
+                logging.debug(f"Задача '{
+                              entry['task_name']}' загружена из кэша обнаружения.")
+            elif has_manifest:
+                entry = self._read_manifest(task_dir, manifest_path)
+                if entry is None:
+                    continue
+                if entry['config_file'] != config_file:
+                    # Манифест указывает другой файл: он тоже входит в отпечаток
+                    files = self._fingerprint(task_dir, previous.get('files', {}), entry['config_file'])
+                entry['files'] = files
+            else:
+                entry = self._inspect_plugin(
+                    task_dir, task_path, os.path.join(self.tasks_directory, task_dir, DEFAULT_CONFIG_FILE))
+                if entry is None:
+                    continue
+                entry['files'] = files
+
+            plugins[task_dir] = entry
+            self.entries[entry['task_name']] = {
+                'task_dir': task_dir,
+                'task_path': os.path.join(
+                    self.tasks_directory, task_dir, entry.get('module', 'task') + '.py'),
+                'class_name': entry['class_name'],
+                'config': entry['config'],
+                'resources': entry.get('resources', {}),
+            }
+
+        if plugins != cached:
+            self._write_cache(plugins)
+        return list(self.entries)
+
+    def _inspect_plugin(self, task_dir, task_path, config_path):
+        """
+        Импортирует плагин и возвращает запись для кэша обнаружения.
+        """
+        try:
+            task_class = self._import_task_class(task_dir, task_path)
+            if not task_class:
+                return None
+            # Инициализируем экземпляр задачи без аргументов
+            task_instance = task_class(
+                shared_resources=None, process_number=None, log_queue=None)
+            task_name = task_instance.get_task_name()
+        except Exception as e:
+            logging.error(f"Не удалось загрузить задачу из {
+                          task_path}: {e}")
+            return None
+
+        self._classes[task_name] = task_class
+        logging.debug(f"Задача '{task_name}' успешно загружена.")
+        return {
+            'task_name': task_name,
+            'module': 'task',
+            'class_name': 'Task',
+            'config': self._load_config(task_name, config_path),
+            'config_file': DEFAULT_CONFIG_FILE,
+        }
+
+    def _read_manifest(self, task_dir, manifest_path):
+        """
+        Читает manifest.yaml плагина и возвращает запись для кэша обнаружения
+        без импорта кода задачи.
+        """
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as manifest_file:
+                manifest = yaml.safe_load(manifest_file) or {}
+            task_name = manifest['name']
+            module_name, _, class_name = manifest.get(
+                'entry_point', DEFAULT_ENTRY_POINT).partition(':')
+        except (OSError, yaml.YAMLError, KeyError, AttributeError, TypeError) as e:
+            logging.error(f"Некорректный манифест задачи {
+                          manifest_path}: {e}")
+            return None
+
+        config = manifest.get('config', DEFAULT_CONFIG_FILE)
+        inline_config = isinstance(config, dict)
+        config_file = None if inline_config else os.path.normpath(config)
+        if not inline_config:
+            config = self._load_config(
+                task_name, os.path.join(self.tasks_directory, task_dir, config_file))
+
+        logging.debug(f"Задача '{task_name}' загружена из манифеста.")
+        return {
+            'task_name': task_name,
+            'module': module_name,
+            'class_name': class_name or 'Task',
+            'config': config,
+            'config_file': config_file,
+            'resources': manifest.get('resources') or {},
+        }
+
+    def _fingerprint(self, task_dir, previous_files, config_file=None):
+        """
+        Возвращает отпечатки файлов плагина: {имя: [mtime_ns, size, sha1]}.
+        Хэш пересчитывается только для файлов с изменившимися mtime или размером.
+
+        :param config_file: Файл конфигурации относительно папки плагина; входит
+                            в отпечаток, даже если лежит во вложенной папке или
+                            имеет другое расширение.
+        """
+        plugin_dir = os.path.join(self.tasks_directory, task_dir)
+        names = [name for name in os.listdir(plugin_dir) if name.endswith(FINGERPRINT_EXTENSIONS)]
+        if config_file is not None and config_file not in names:
+            names.append(config_file)
+        files = {}
+        for name in sorted(names):
+            path = os.path.join(plugin_dir, name)
+            if not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            previous = previous_files.get(name)
+            if previous and previous[0] == stat.st_mtime_ns and previous[1] == stat.st_size:
+                files[name] = list(previous)
+                continue
+            with open(path, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            files[name] = [stat.st_mtime_ns, stat.st_size, digest]
+        return files
+
+    def _read_cache(self):
+        if not self.cache_path or not os.path.isfile(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Кэш обнаружения задач повреждён и будет перестроен: {e}")
+            return {}
+        if data.get('version') != CACHE_VERSION or data.get('tasks_directory') != os.path.abspath(self.tasks_directory):
+            return {}
+        return data.get('plugins', {})
+
+    def _write_cache(self, plugins):
+        if not self.cache_path:
+            return
+        data = {
+            'version': CACHE_VERSION,
+            'tasks_directory': os.path.abspath(self.tasks_directory),
+            'plugins': plugins,
+        }
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+                json.dump(data, cache_file, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.cache_path)
+            logging.debug(f"Кэш обнаружения задач сохранён: {self.cache_path}")
+        except (OSError, TypeError, ValueError) as e:
+            # Конфигурация, не представимая в JSON, или недоступная директория
+            logging.warning(f"Не удалось сохранить кэш обнаружения задач: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _import_task_class(self, task_dir, task_path, class_name='Task'):
+        spec = importlib.util.spec_from_file_location(
+            f"task_{task_dir}", task_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return getattr(module, class_name, None)
+
+    def _load_config(self, task_name, config_path):
+        # Загрузка конфигурации, если файл существует
+        if not os.path.isfile(config_path):
+            return None
+        with open(config_path, 'r', encoding='utf-8') as config_file:
+            try:
+                config = yaml.safe_load(config_file)
+                logging.debug(f"Конфигурация для задачи '{
+                              task_name}' загружена.")
+                return config
+            except yaml.YAMLError as e:
+                logging.error(f"Ошибка при загрузке {os.path.basename(config_path)} для задачи '{
+                              task_name}': {e}")
+                return None
+
+    def names(self):
+        return list(self.entries)
+
+    def get_resources(self, task_name):
+        """
+        Возвращает подсказки о ресурсах задачи из манифеста (пустой словарь, если их нет).
+        """
+        entry = self.entries.get(task_name) or {}
+        return entry.get('resources') or {}
+
+    def get_task_class(self, task_name):
+        """
+        Возвращает класс задачи по её имени, импортируя модуль не более одного раза.
+        """
+        task_class = self._classes.get(task_name)
+        if task_class is not None:
+            return task_class
+
+        entry = self.entries.get(task_name)
+        if entry is None:
+            raise ValueError(f"Задача с именем '{task_name}' не найдена.")
+        try:
+            task_class = self._import_task_class(
+                entry['task_dir'], entry['task_path'], entry.get('class_name', 'Task'))
+        except Exception as e:
+            logging.error(f"Не удалось загрузить задачу '{
+                          task_name}' из {entry['task_path']}: {e}")
+            raise
+        if task_class is None:
+            raise ValueError(f"Задача с именем '{task_name}' не найдена.")
+        self._classes[task_name] = task_class
+        return task_class
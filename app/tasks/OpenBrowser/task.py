@@ -1,12 +1,9 @@
 # tasks/OpenBrowser/task.py
 
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-import time
-import os
-import psutil
+from app.utils.browser_helper import (BrowserHelper, get_session_pool, get_context_pool, DEFAULT_MAX_USES,
+                                      DEFAULT_MAX_CONTEXTS, BACKEND_CONTEXTS)
+from app.utils.cancellation import CancellationToken, TaskCancelled
 
 
 class Task:
@@ -17,91 +14,55 @@ class Task:
         self.log_helper = log_helper
         self.settings = settings or {}
         self.driver = None
-        self.process = None
+        # Заменяется TaskManager токеном пула при выполнении
+        self.cancel_token = CancellationToken()
 
     def get_task_name(self):
         return "Открыть браузер"
 
     def run(self):
+        browser_options = dict(self.settings.get('browser_options', {}))
+        backend = browser_options.pop('backend', None)
+        max_uses = browser_options.pop('max_uses', DEFAULT_MAX_USES)
+        max_contexts = browser_options.pop('max_contexts', DEFAULT_MAX_CONTEXTS)
+        debugger_address = browser_options.pop('debugger_address', None)
+        # Браузер берётся из пула процесса: Chrome запускается только при
+        # первой выдаче и после перезапуска сессии, а не на каждое выполнение.
+        # Бэкенд "contexts" выдаёт изолированный контекст одного общего Chrome
+        if backend == BACKEND_CONTEXTS:
+            session_pool = get_context_pool(
+                browser_options, max_contexts=max_contexts, debugger_address=debugger_address)
+        else:
+            session_pool = get_session_pool(browser_options, max_uses=max_uses)
 
         try:
-            # Настройка опций для Chrome
-            options = Options()
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            # Настройка режима запуска браузера на основе настроек
-            if self.settings.get('browser_options', {}).get('headless', False):
-                options.headless = True
-            else:
-                options.headless = False
-
-            window_size = self.settings.get(
-                'browser_options', {}).get('window_size', "1920,1080")
-            options.add_argument(f"--window-size={window_size}")
-
-            # Указание путей к Chrome и ChromeDriver
-            chrome_path = os.path.abspath("ChromeApp/Chrome/chrome.exe")
-            chrome_driver_path = os.path.abspath(
-                "ChromeApp/ChromeDriver/chromedriver.exe")
-
-            # Проверка наличия Chrome
-            if not os.path.exists(chrome_path):
-                raise FileNotFoundError(
-                    f"Не найден Chrome по пути: {chrome_path}")
-
-            # Проверка наличия ChromeDriver
-            if not os.path.exists(chrome_driver_path):
-                raise FileNotFoundError(f"Не найден ChromeDriver по пути: {
-                                        chrome_driver_path}")
-
-            # Настройка сервиса для ChromeDriver
-            service = Service(executable_path=chrome_driver_path,
-                              chrome_binary=chrome_path)
-
-            # Инициализация WebDriver
-            self.driver = webdriver.Chrome(service=service, options=options)
-
-            # Сохранение процесса браузера для последующего завершения
-            self.process = psutil.Process(self.driver.service.process.pid)
-
-            logging.info(f"Открыть браузер: Процесс {
-                         self.process_number} запустил браузер.")
+            with session_pool.lease() as driver:
+                self.driver = driver
+                logging.info(f"Открыть браузер: Процесс {
+                             self.process_number} получил браузер.")
+
+                # Открытие пустой вкладки
+                self.driver.get("about:blank")
+                logging.info(f"Открыть браузер: Процесс {
+                             self.process_number} открыл пустую вкладку.")
+
+                # Вместо фиксированной паузы ждём готовности страницы: ожидание
+                # заканчивается сразу, прерывается при остановке, браузер возвращается в пул
+                helper = BrowserHelper(cancel_token=self.cancel_token)
+                helper.wait_for_document_ready(self.driver)
+                for name, (count, seconds) in helper.wait_stats().items():
+                    logging.info(f"Открыть браузер: Процесс {
+                                 self.process_number} ожидание «{name}»: {seconds:.3f} с.")
+                self.cancel_token.raise_if_cancelled()
 
-            # Открытие пустой вкладки
-            self.driver.get("about:blank")
+        except TaskCancelled:
             logging.info(f"Открыть браузер: Процесс {
-                         self.process_number} открыл пустую вкладку.")
-
-            # Симуляция работы браузера (можно заменить на реальные действия)
-            time.sleep(5)
+                         self.process_number} получил отмену.")
+            raise
 
         except Exception as e:
             logging.error(f"Открыть браузер: Процесс {
                           self.process_number} столкнулся с ошибкой: {e}")
 
         finally:
-            # Закрытие браузера и завершение процесса
-            if self.driver:
-                try:
-                    self.driver.quit()
-                    logging.info(f"Открыть браузер: Процесс {
-                                 self.process_number} закрыл браузер.")
-
-                except Exception as e:
-                    logging.error(f"Открыть браузер: Процесс {
-                                  self.process_number} не смог закрыть браузер: {e}")
-
-            if self.process and self.process.is_running():
-                try:
-                    self.process.terminate()
-                    self.process.wait(timeout=5)
-                    logging.info(f"Открыть браузер: Процесс {
-                                 self.process_number} завершён.")
-
-                except psutil.NoSuchProcess:
-                    logging.error(f"Открыть браузер: Процесс {
-                                  self.process_number} уже завершён.")
-
-                except psutil.TimeoutExpired:
-                    logging.error(f"Открыть браузер: Процесс {
-                                  self.process_number} не завершился вовремя.")
+            self.driver = None
@@ -1,7 +1,6 @@
 # tasks/TaskA/task.py
 
-import time
-import logging
+from app.utils.cancellation import CancellationToken
 
 
 class Task:
@@ -10,11 +9,15 @@ class Task:
         self.process_number = process_number
         self.log_queue = log_queue
         self.log_helper = log_helper
+        # Заменяется TaskManager токеном пула при выполнении
+        self.cancel_token = CancellationToken()
 
     def get_task_name(self):
         return "Задача А"
 
-    def run(self):
+    async def run(self):
 
-        # Симуляция выполнения задачи
-        time.sleep(10)
+        # Симуляция выполнения задачи; ожидание прерывается при остановке и
+        # не занимает поток — процесс может выполнять много таких задач сразу
+        await self.cancel_token.wait_async(10)
+        self.cancel_token.raise_if_cancelled()
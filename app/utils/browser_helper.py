@@ -1,35 +1,755 @@
 # app/utils/browser_helper.py
 
 from selenium import webdriver
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from contextlib import contextmanager
+from multiprocessing import util as multiprocessing_util
 import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
 import psutil
+from app.utils import process_tree
+from app.utils.cancellation import TaskCancelled
+from app.utils.http_fetcher import (FetchResult, FETCH_BROWSER, FETCH_HTTP, default_fetch_backend, get_http_fetcher,
+                                    requires_browser)
 
+# Пути к портативному Chrome и ChromeDriver относительно рабочей директории
+CHROME_PATH = "ChromeApp/Chrome/chrome.exe"
+CHROME_DRIVER_PATH = "ChromeApp/ChromeDriver/chromedriver.exe"
 
-class BrowserHelper:
-    def __init__(self):
-        self.driver = None
+# Сессия пула перезапускается после стольких выдач (0 — без ограничения)
+DEFAULT_MAX_USES = 50
+# Максимум одновременных изолированных контекстов на один процесс Chrome
+DEFAULT_MAX_CONTEXTS = 8
+# Способы получения браузера задачами (browser_options.backend)
+BACKEND_SESSION = "session"  # отдельный Chrome на сессию (BrowserSessionPool)
+BACKEND_CONTEXTS = "contexts"  # контексты одного Chrome (BrowserContextPool)
+
+# Ожидания готовности страницы (BrowserHelper.wait_for_*)
+DEFAULT_WAIT_TIMEOUT = 30  # Секунды
+WAIT_POLL_INTERVAL = 0.1  # Период проверки условия в секундах
+NETWORK_IDLE_TIME = 0.5  # Секунды без новых сетевых запросов, после которых сеть считается простаивающей
+
+
+def build_chrome_options(browser_options=None):
+    """
+    Собирает опции Chrome из настроек задачи (browser_options в config.yaml).
+
+    :param browser_options: Словарь {'headless': bool, 'window_size': "1920,1080"}.
+    """
+    browser_options = browser_options or {}
+    options = Options()
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    # Настройка режима запуска браузера на основе настроек
+    if browser_options.get('headless', False):
+        options.add_argument("--headless=new")
+    window_size = browser_options.get('window_size', "1920,1080")
+    options.add_argument(f"--window-size={window_size}")
+    return options
+
+
+def create_driver(browser_options=None):
+    """
+    Запускает Chrome через ChromeDriver из ChromeApp.
+
+    :param browser_options: Настройки браузера (см. build_chrome_options).
+    :return: Экземпляр WebDriver.
+    """
+    chrome_path = os.path.abspath(CHROME_PATH)
+    chrome_driver_path = os.path.abspath(CHROME_DRIVER_PATH)
+
+    # Проверка наличия Chrome и ChromeDriver
+    if not os.path.exists(chrome_path):
+        raise FileNotFoundError(f"Не найден Chrome по пути: {chrome_path}")
+    if not os.path.exists(chrome_driver_path):
+        raise FileNotFoundError(f"Не найден ChromeDriver по пути: {
+                                chrome_driver_path}")
+
+    options = build_chrome_options(browser_options)
+    options.binary_location = chrome_path
+    service = Service(executable_path=chrome_driver_path)
+    return webdriver.Chrome(service=service, options=options)
+
+
+def quit_driver(driver, timeout=5):
+    """
+    Закрывает браузер и завершает процесс ChromeDriver, если он не вышел сам.
+    """
+    process = None
+    try:
+        process = psutil.Process(driver.service.process.pid)
+    except (AttributeError, psutil.Error):
+        pass
+    try:
+        driver.quit()
+    except Exception as e:
+        logging.error(f"Не удалось закрыть браузер: {e}")
+    if process is not None:
+        try:
+            if process.is_running():
+                process.terminate()
+                process.wait(timeout=timeout)
+        except psutil.NoSuchProcess:
+            pass
+        except psutil.TimeoutExpired:
+            logging.error("Не удалось завершить процесс браузера вовремя.")
+
+
+class BrowserSession:
+    """
+    Сессия WebDriver, принадлежащая пулу.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0  # Количество выдач сессии
+        self.created_at = time.monotonic()
+
+
+class BrowserSessionPool:
+    """
+    Пул «тёплых» сессий WebDriver внутри одного процесса пула.
+
+    Задачи получают готовый браузер через lease() вместо запуска Chrome на
+    каждое выполнение. Между выдачами состояние сессии сбрасывается (куки,
+    localStorage/sessionStorage, лишние вкладки); сессия перезапускается
+    после max_uses выдач, а также если браузер упал или сброс не удался.
+
+    Статистика (stats) — доля выдач без холодного старта и время ожидания
+    выдачи — пишется в лог при закрытии пула.
+    """
+
+    def __init__(self, factory, max_sessions=1, max_uses=DEFAULT_MAX_USES, name="браузеров"):
+        """
+        :param factory: Функция без аргументов, возвращающая новый WebDriver.
+        :param max_sessions: Максимальное количество одновременно выданных сессий.
+        :param max_uses: Выдач до перезапуска сессии (0 — без ограничения).
+        :param name: Название пула для логов.
+        """
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.max_uses = max_uses
+        self.name = name
+        self.idle = []  # Свободные сессии
+        self.leased = 0  # Выданные сессии
+        self.closed = False
+        self.condition = threading.Condition()
+
+        # Статистика
+        self.leases = 0
+        self.hits = 0  # Выдачи уже запущенной сессии
+        self.recycled = 0  # Сессии, перезапущенные по лимиту или после сбоя
+        self.wait_seconds = 0.0  # Суммарное время ожидания выдачи
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        Выдаёт WebDriver на время блока with и возвращает его в пул.
+
+        Если в блоке возникла ошибка WebDriver, сессия считается сломанной и
+        не возвращается в пул.
+        """
+        session = self.acquire(timeout)
+        broken = False
+        try:
+            yield session.driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self.release(session, broken=broken)
+
+    def acquire(self, timeout=None):
+        """
+        Возвращает готовую сессию, при необходимости запуская новый браузер.
+
+        :param timeout: Максимальное время ожидания свободной сессии в секундах.
+        :raises TimeoutError: Если свободная сессия не появилась за timeout.
+        """
+        started = time.monotonic()
+        with self.condition:
+            if not self.condition.wait_for(
+                    lambda: self.closed or self.idle or self.leased < self.max_sessions, timeout):
+                raise TimeoutError(f"Пул {self.name}: нет свободной сессии за {timeout} с.")
+            if self.closed:
+                raise RuntimeError(f"Пул {self.name} закрыт.")
+            session = self.idle.pop() if self.idle else None
+            self.leased += 1
+
+        hit = session is not None
+        try:
+            if session is not None and not self._is_alive(session):
+                logging.warning(f"Пул {self.name}: браузер сессии не отвечает и будет перезапущен.")
+                self._discard(session)
+                session = None
+                hit = False
+            if session is None:
+                session = BrowserSession(self.factory())
+        except BaseException:
+            with self.condition:
+                self.leased -= 1
+                self.condition.notify()
+            raise
+
+        wait = time.monotonic() - started
+        with self.condition:
+            session.uses += 1
+            self.leases += 1
+            self.hits += hit
+            self.wait_seconds += wait
+        logging.debug(f"Пул {self.name}: выдана сессия (выдача {
+                      session.uses}), ожидание {wait:.3f} с.")
+        return session
+
+    def release(self, session, broken=False):
+        """
+        Возвращает сессию в пул, предварительно сбросив её состояние.
+
+        :param broken: Сессия сломана и должна быть закрыта.
+        """
+        keep = not broken and not self.closed
+        if keep and self.max_uses and session.uses >= self.max_uses:
+            logging.debug(f"Пул {self.name}: сессия достигла лимита выдач и будет перезапущена.")
+            keep = False
+        if keep and not self._reset(session):
+            keep = False
+        if not keep:
+            self._discard(session)
+
+        with self.condition:
+            self.leased -= 1
+            if keep:
+                self.idle.append(session)
+            self.condition.notify()
+
+    def _reset(self, session):
+        """
+        Сбрасывает куки, кэш, хранилища и вкладки сессии.
+
+        Хранилища (localStorage, IndexedDB, Cache Storage, service workers)
+        в Chrome привязаны к origin, и CDP не умеет очищать их для всех
+        origin сразу. Поэтому до закрытия вкладок собираются origin всех
+        страниц из их истории навигации и всех фреймов, и данные очищаются
+        для каждого; куки и HTTP-кэш очищаются целиком.
+
+        :return: False, если сбросить состояние не удалось.
+        """
+        driver = session.driver
+        try:
+            handles = driver.window_handles
+            origins = set()
+            for handle in reversed(handles):
+                driver.switch_to.window(handle)
+                origins.update(self._visited_origins(driver))
+                if handle != handles[0]:
+                    driver.close()
+            driver.switch_to.window(handles[0])
+            if driver.current_url.startswith("http"):
+                # sessionStorage живёт в истории вкладки, а не в хранилище origin
+                driver.execute_script("window.sessionStorage.clear();")
+            for origin in origins:
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.get("about:blank")
+            # История следующей выдачи начинается с чистого листа
+            driver.execute_cdp_cmd("Page.resetNavigationHistory", {})
+            logging.debug(f"Пул {self.name}: очищены данные {len(origins)} origin.")
+            return True
+        except WebDriverException as e:
+            logging.warning(f"Пул {self.name}: не удалось сбросить состояние сессии: {e}")
+            return False
+
+    @staticmethod
+    def _visited_origins(driver):
+        """
+        Возвращает origin страниц из истории навигации текущей вкладки и её фреймов.
+        """
+        urls = [entry['url'] for entry in
+                driver.execute_cdp_cmd("Page.getNavigationHistory", {})['entries']]
+        frames = [driver.execute_cdp_cmd("Page.getFrameTree", {})['frameTree']]
+        while frames:
+            node = frames.pop()
+            urls.append(node['frame']['url'])
+            frames.extend(node.get('childFrames', ()))
+        origins = set()
+        for url in urls:
+            parts = urlsplit(url)
+            if parts.scheme in ("http", "https") and parts.netloc:
+                origins.add(f"{parts.scheme}://{parts.netloc}")
+        return origins
+
+    @staticmethod
+    def _is_alive(session):
+        try:
+            session.driver.current_window_handle
+            return True
+        except WebDriverException:
+            return False
+
+    def _discard(self, session):
+        with self.condition:
+            self.recycled += 1
+        quit_driver(session.driver)
+
+    def stats(self):
+        """
+        :return: Словарь с количеством выдач, долей попаданий и средним ожиданием.
+        """
+        return {
+            'leases': self.leases,
+            'hits': self.hits,
+            'hit_rate': self.hits / self.leases if self.leases else 0.0,
+            'average_wait': self.wait_seconds / self.leases if self.leases else 0.0,
+            'recycled': self.recycled,
+        }
+
+    def close(self):
+        """
+        Закрывает свободные сессии и пишет статистику пула в лог.
+        """
+        with self.condition:
+            self.closed = True
+            sessions, self.idle = self.idle, []
+            self.condition.notify_all()
+        for session in sessions:
+            quit_driver(session.driver)
+        if self.leases:
+            logging.info("Пул {name}: выдач {leases}, без холодного старта {hit_rate:.0%}, "
+                         "среднее ожидание {average_wait:.2f} с, перезапусков {recycled}".format(
+                             name=self.name, **self.stats()))
+
+
+class ChromeHost:
+    """
+    Процесс Chrome с портом удалённой отладки, к которому подключаются
+    сессии WebDriver (debugger_address). Запускается без ChromeDriver.
+    """
+
+    def __init__(self, browser_options=None, chrome_path=None, startup_timeout=30):
+        self.browser_options = browser_options or {}
+        self.chrome_path = chrome_path or CHROME_PATH
+        self.startup_timeout = startup_timeout
         self.process = None
+        self.user_data_dir = None
+        self.address = None  # "127.0.0.1:порт"
 
-    def start_browser(self):
+    def start(self):
+        chrome_path = os.path.abspath(self.chrome_path)
+        if not os.path.exists(chrome_path):
+            raise FileNotFoundError(f"Не найден Chrome по пути: {chrome_path}")
+        self.user_data_dir = tempfile.mkdtemp(prefix="seoradar-chrome-")
+        arguments = [
+            chrome_path,
+            "--remote-debugging-port=0",  # Порт выбирает Chrome и пишет его в DevToolsActivePort
+            f"--user-data-dir={self.user_data_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            f"--window-size={self.browser_options.get('window_size', '1920,1080')}",
+        ]
+        if self.browser_options.get('headless', False):
+            arguments.append("--headless=new")
+        arguments.append("about:blank")
+        self.process = subprocess.Popen(
+            arguments, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        port_file = os.path.join(self.user_data_dir, "DevToolsActivePort")
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Chrome завершился при запуске с кодом {
+                                   self.process.returncode}.")
+            try:
+                with open(port_file, 'r', encoding='utf-8') as f:
+                    port = f.readline().strip()
+                if port:
+                    self.address = f"127.0.0.1:{port}"
+                    logging.info(f"Общий Chrome запущен: PID {
+                                 self.process.pid}, адрес отладки {self.address}")
+                    return self.address
+            except OSError:
+                pass
+            time.sleep(0.05)
+        self.close()
+        raise TimeoutError(f"Chrome не открыл порт отладки за {self.startup_timeout} с.")
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def rss(self):
         """
-        Запуск браузера и сохранение процесса.
+        Суммарный RSS процесса Chrome и его потомков (рендереры, GPU) в байтах.
         """
-        logging.info("Запуск браузера...")
+        if not self.is_running():
+            return 0
+        total = 0
+        try:
+            processes = [psutil.Process(self.process.pid)] + \
+                process_tree.descendants([self.process.pid])
+        except psutil.Error:
+            return 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    def close(self):
+        if self.process is not None:
+            children = process_tree.descendants([self.process.pid])
+            process_tree.kill_processes(
+                [psutil.Process(self.process.pid)] + children if self.is_running() else children)
+            self.process = None
+        if self.user_data_dir:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+            self.user_data_dir = None
+
+
+class BrowserContextPool:
+    """
+    Много одновременных выполнений поверх одного процесса Chrome.
+
+    Каждая выдача получает собственный изолированный контекст браузера
+    (аналог окна инкогнито: отдельные куки, хранилища и кэш), созданный
+    через CDP Target.createBrowserContext, и вкладку в нём. После выдачи
+    контекст уничтожается (Target.disposeBrowserContext).
+
+    Команды WebDriver выдача выполняет через собственное подключение
+    ChromeDriver к общему Chrome (debugger_address): ChromeDriver
+    обрабатывает команды одной сессии последовательно, поэтому общая
+    сессия выстроила бы загрузки страниц всех выдач в очередь. Подключения
+    переиспользуются между выдачами — их не больше max_contexts, и каждое
+    — лёгкий процесс ChromeDriver, тогда как Chrome с его рендерерами один.
+
+    Не больше max_contexts контекстов одновременно на один Chrome. Chrome
+    запускается при первой выдаче (ChromeHost) или, если задан
+    debugger_address, используется уже запущенный — так один браузер можно
+    разделить между несколькими процессами пула.
+    """
+
+    def __init__(self, browser_options=None, max_contexts=DEFAULT_MAX_CONTEXTS, debugger_address=None,
+                 name="контекстов"):
+        self.browser_options = browser_options or {}
+        self.max_contexts = max_contexts
+        self.debugger_address = debugger_address
+        self.name = name
+        self.host = None  # Собственный ChromeHost (None при внешнем debugger_address)
+        self.host_generation = 0  # Меняется при перезапуске Chrome
+        self.drivers = {}  # Ключ: подключение ChromeDriver, Значение: (вкладка-якорь, поколение Chrome)
+        self.idle_drivers = []  # Свободные подключения
+        self.active = 0  # Выданные контексты
+        self.closed = False
+        self.condition = threading.Condition()
+        self.host_lock = threading.Lock()
+
+        # Статистика
+        self.leases = 0
+        self.peak_active = 0
+        self.wait_seconds = 0.0
+
+    def _address(self):
+        """
+        Возвращает адрес отладки общего Chrome, при необходимости запуская его.
+        """
+        with self.host_lock:
+            if self.debugger_address:
+                return self.debugger_address
+            if self.host is None or not self.host.is_running():
+                if self.host is not None:
+                    logging.warning(f"Пул {self.name}: общий Chrome завершился и будет перезапущен.")
+                    self.host.close()
+                    self.host_generation += 1
+                self.host = ChromeHost(self.browser_options)
+                self.host.start()
+            return self.host.address
+
+    def _acquire_driver(self):
+        """
+        Выдаёт свободное подключение ChromeDriver или подключает новое.
+        """
+        address = self._address()
+        with self.condition:
+            generation = self.host_generation
+            stale = [driver for driver in self.idle_drivers if self.drivers[driver][1] != generation]
+            self.idle_drivers = [driver for driver in self.idle_drivers if driver not in stale]
+            driver = self.idle_drivers.pop() if self.idle_drivers else None
+        for old in stale:
+            self._drop_driver(old)
+        if driver is None:
+            driver = self._attach(address, generation)
+        return driver
+
+    def _attach(self, address, generation):
         options = Options()
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        # Если нужно запустить браузер в фоновом режиме, установите True
-        options.headless = False
+        options.debugger_address = address
+        service = Service(executable_path=os.path.abspath(CHROME_DRIVER_PATH))
+        driver = webdriver.Chrome(service=service, options=options)
+        try:
+            # Своя вкладка в контексте по умолчанию: команды между выдачами
+            # (создание контекстов) не зависят от вкладок других подключений
+            anchor = driver.execute_cdp_cmd("Target.createTarget", {"url": "about:blank"})["targetId"]
+            driver.switch_to.window(anchor)
+        except WebDriverException:
+            quit_driver(driver)
+            raise
+        with self.condition:
+            self.drivers[driver] = (anchor, generation)
+        logging.debug(f"Пул {self.name}: подключена сессия ChromeDriver к {address}.")
+        return driver
+
+    def _release_driver(self, driver, broken):
+        """
+        Возвращает подключение в пул; неработающее или относящееся к
+        завершившемуся Chrome закрывается.
+        """
+        with self.condition:
+            reusable = (not self.closed and driver in self.drivers
+                        and self.drivers[driver][1] == self.host_generation)
+        if reusable and broken and not self._is_alive(driver):
+            logging.warning(f"Пул {self.name}: сессия ChromeDriver не отвечает и будет переподключена.")
+            reusable = False
+        if not reusable:
+            self._drop_driver(driver)
+            return
+        with self.condition:
+            self.idle_drivers.append(driver)
+
+    def _drop_driver(self, driver):
+        with self.condition:
+            anchor, _ = self.drivers.pop(driver, (None, None))
+        if anchor is not None:
+            try:
+                driver.execute_cdp_cmd("Target.closeTarget", {"targetId": anchor})
+            except WebDriverException:
+                pass
+        quit_driver(driver)
+
+    def _is_alive(self, driver):
+        try:
+            driver.execute_cdp_cmd("Browser.getVersion", {})
+            return True
+        except WebDriverException:
+            return False
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        Выдаёт WebDriver, переключённый на вкладку нового изолированного
+        контекста, на время блока with.
+
+        :param timeout: Максимальное время ожидания свободного контекста в секундах.
+        :raises TimeoutError: Если контекст не освободился за timeout.
+        """
+        started = time.monotonic()
+        with self.condition:
+            if not self.condition.wait_for(
+                    lambda: self.closed or self.active < self.max_contexts, timeout):
+                raise TimeoutError(f"Пул {self.name}: нет свободного контекста за {timeout} с.")
+            if self.closed:
+                raise RuntimeError(f"Пул {self.name} закрыт.")
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+
+        driver = None
+        context_id = None
+        broken = False
+        try:
+            driver = self._acquire_driver()
+            context_id = driver.execute_cdp_cmd(
+                "Target.createBrowserContext", {"disposeOnDetach": True})["browserContextId"]
+            target_id = driver.execute_cdp_cmd(
+                "Target.createTarget", {"url": "about:blank", "browserContextId": context_id})["targetId"]
+            # Дескриптор окна в ChromeDriver совпадает с targetId вкладки
+            driver.switch_to.window(target_id)
+            wait = time.monotonic() - started
+            with self.condition:
+                self.leases += 1
+                self.wait_seconds += wait
+            logging.debug(f"Пул {self.name}: выдан контекст {context_id}, ожидание {wait:.3f} с.")
+            yield driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            if driver is not None and context_id is not None:
+                try:
+                    # Вкладки контекста закрываются вместе с ним — подключение
+                    # возвращается на свою вкладку-якорь до этого
+                    driver.switch_to.window(self.drivers[driver][0])
+                    driver.execute_cdp_cmd(
+                        "Target.disposeBrowserContext", {"browserContextId": context_id})
+                except (KeyError, WebDriverException) as e:
+                    logging.warning(f"Пул {self.name}: не удалось закрыть контекст {context_id}: {e}")
+                    broken = True
+            # Ошибка команды выдачи (нет элемента и т.п.) не ломает подключение:
+            # оно закрывается, только если перестало отвечать
+            if driver is not None:
+                self._release_driver(driver, broken)
+            with self.condition:
+                self.active -= 1
+                self.condition.notify()
+
+    def stats(self):
+        return {
+            'leases': self.leases,
+            'peak_active': self.peak_active,
+            'average_wait': self.wait_seconds / self.leases if self.leases else 0.0,
+            'rss': self.host.rss() if self.host else 0,
+            'drivers': len(self.drivers),
+            'driver_rss': self._driver_rss(),
+        }
+
+    def _driver_rss(self):
+        """
+        Суммарный RSS процессов ChromeDriver подключений в байтах (они не потомки Chrome).
+        """
+        total = 0
+        with self.condition:
+            drivers = list(self.drivers)
+        for driver in drivers:
+            try:
+                total += psutil.Process(driver.service.process.pid).memory_info().rss
+            except (AttributeError, psutil.Error):
+                continue
+        return total
+
+    def close(self):
+        """
+        Закрывает подключения ChromeDriver и собственный Chrome, пишет статистику в лог.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+            self.idle_drivers = []
+            drivers = list(self.drivers)
+        stats = self.stats()
+        for driver in drivers:
+            self._drop_driver(driver)
+        if self.host is not None:
+            self.host.close()
+        if self.leases:
+            logging.info("Пул {name}: выдач {leases}, одновременно до {peak_active}, "
+                         "среднее ожидание {average_wait:.2f} с, RSS Chrome {rss_mb:.0f} МБ, "
+                         "ChromeDriver ({drivers}) {driver_rss_mb:.0f} МБ".format(
+                             name=self.name, rss_mb=stats['rss'] / 2 ** 20,
+                             driver_rss_mb=stats['driver_rss'] / 2 ** 20, **stats))
+
+
+_session_pools = {}  # Ключ: (pid, настройки браузера), Значение: BrowserSessionPool или BrowserContextPool
+_session_pools_lock = threading.Lock()
 
-        # Убедитесь, что путь корректен
-        service = Service(executable_path="path_to_your_chromedriver")
 
-        self.driver = webdriver.Chrome(service=service, options=options)
+def get_session_pool(browser_options=None, max_uses=DEFAULT_MAX_USES):
+    """
+    Возвращает пул браузеров текущего процесса для заданных настроек.
+
+    Пул создаётся при первом обращении и закрывается при штатном завершении
+    процесса пула (multiprocessing.util.Finalize).
+
+    :param browser_options: Настройки браузера (см. build_chrome_options).
+    :param max_uses: Выдач до перезапуска сессии.
+    """
+    browser_options = dict(browser_options or {})
+    # После fork словарь наследуется — пулы родителя дочернему процессу не принадлежат
+    key = (os.getpid(), tuple(sorted(browser_options.items())))
+    with _session_pools_lock:
+        pool = _session_pools.get(key)
+        if pool is None:
+            pool = BrowserSessionPool(
+                factory=lambda: create_driver(browser_options), max_uses=max_uses)
+            multiprocessing_util.Finalize(pool, pool.close, exitpriority=10)
+            _session_pools[key] = pool
+        return pool
+
+
+def get_context_pool(browser_options=None, max_contexts=DEFAULT_MAX_CONTEXTS, debugger_address=None):
+    """
+    Возвращает пул контекстов общего Chrome текущего процесса для заданных настроек.
+
+    :param browser_options: Настройки браузера (см. build_chrome_options).
+    :param max_contexts: Максимум одновременных контекстов на один Chrome.
+    :param debugger_address: Адрес отладки уже запущенного Chrome ("host:port") или None.
+    """
+    browser_options = dict(browser_options or {})
+    key = (os.getpid(), 'contexts', debugger_address, tuple(sorted(browser_options.items())))
+    with _session_pools_lock:
+        pool = _session_pools.get(key)
+        if pool is None:
+            pool = BrowserContextPool(
+                browser_options, max_contexts=max_contexts, debugger_address=debugger_address)
+            multiprocessing_util.Finalize(pool, pool.close, exitpriority=10)
+            _session_pools[key] = pool
+        return pool
+
+
+def fetch_page(url, backend=None, browser_options=None, fallback_rule=requires_browser):
+    """
+    Получает страницу способом, объявленным задачей (resources.fetch в манифесте).
+
+    При backend="http" страница загружается пулом HTTP-соединений процесса,
+    а если ответ подходит под fallback_rule (проверка браузера, заглушка
+    «включите JavaScript», пустая оболочка SPA) — повторно открывается в
+    браузере из пула сессий. При backend="browser" сразу используется браузер.
+
+    :param url: Адрес страницы.
+    :param backend: FETCH_HTTP или FETCH_BROWSER (None — resources.fetch выполняемой задачи).
+    :param browser_options: Настройки браузера для перехода на браузер.
+    :param fallback_rule: Функция FetchResult -> bool (None — не переходить на браузер).
+    :return: FetchResult; result.backend показывает, каким способом получена страница.
+    """
+    if backend is None:
+        backend = default_fetch_backend()
+    if backend == FETCH_HTTP:
+        result = get_http_fetcher().fetch(url)
+        if fallback_rule is None or not fallback_rule(result):
+            return result
+        logging.info(f"Страница {url} требует браузера (HTTP {result.status}), открываем в Chrome.")
+
+    started = time.monotonic()
+    with get_session_pool(browser_options).lease() as driver:
+        driver.get(url)
+        return FetchResult(driver.current_url, 200, driver.page_source,
+                           backend=FETCH_BROWSER, elapsed=time.monotonic() - started)
+
+
+class BrowserHelper:
+    """
+    Запуск браузера, открытие страниц и ожидание их готовности.
+
+    Ожидания wait_for_* заменяют фиксированные паузы: они возвращаются, как
+    только условие выполнено, и прерываются по cancel_token. Длительность
+    каждого ожидания записывается в waits, сводка — wait_stats().
+    """
+
+    def __init__(self, browser_options=None, cancel_token=None):
+        """
+        :param browser_options: Настройки браузера.
+        :param cancel_token: CancellationToken задачи (None — ожидания не прерываются).
+        """
+        self.browser_options = browser_options
+        self.cancel_token = cancel_token
+        self.driver = None
+        self.waits = []  # Список (имя ожидания, секунды, условие выполнено)
 
-        # Сохраняем процесс браузера
-        self.process = psutil.Process(self.driver.service.process.pid)
+    def start_browser(self):
+        """
+        Запуск браузера.
+        """
+        logging.info("Запуск браузера...")
+        self.driver = create_driver(self.browser_options)
         logging.info("Браузер запущен успешно.")
         return self.driver
 
@@ -47,6 +767,19 @@ class BrowserHelper:
         driver.get(url)
         logging.info(f"Страница {url} загружена.")
 
+    def fetch_html(self, url, backend=None):
+        """
+        Получение HTML страницы без собственного браузера (см. fetch_page).
+        :param url: URL страницы.
+        :param backend: "http" — пул HTTP-соединений с переходом на браузер, "browser" — сразу браузер,
+                        None — как объявлено в resources.fetch манифеста задачи.
+        :return: FetchResult.
+        """
+        if backend is None:
+            backend = default_fetch_backend()
+        logging.info(f"Получение страницы ({backend}): {url}")
+        return fetch_page(url, backend=backend, browser_options=self.browser_options)
+
     def quit_browser(self, driver):
         """
         Завершение работы с браузером, закрытие процесса.
@@ -54,21 +787,113 @@ class BrowserHelper:
         """
         if driver:
             logging.info("Закрытие браузера...")
-            driver.quit()
-
-            # Убиваем процесс браузера
-            if self.process:
-                try:
-                    logging.info("Завершение процесса браузера...")
-                    self.process.terminate()
-                    self.process.wait(timeout=5)  # Ждем завершения процесса
-                    logging.info("Процесс браузера завершён.")
-                except psutil.NoSuchProcess:
-                    logging.error("Процесс браузера не найден.")
-                except psutil.TimeoutExpired:
-                    logging.error(
-                        "Не удалось завершить процесс браузера вовремя.")
-            else:
-                logging.error("Процесс браузера не найден.")
+            quit_driver(driver)
+            logging.info("Процесс браузера завершён.")
         else:
             logging.error("Браузер не был запущен!")
+
+    def wait_until(self, driver, condition, timeout=DEFAULT_WAIT_TIMEOUT, name="условие",
+                   poll_interval=WAIT_POLL_INTERVAL):
+        """
+        Ждёт, пока condition(driver) не вернёт истинное значение.
+
+        :param driver: WebDriver экземпляр.
+        :param condition: Функция driver -> значение; NoSuchElementException считается «ещё нет».
+        :param timeout: Максимальное время ожидания в секундах.
+        :param name: Имя ожидания для лога и статистики.
+        :param poll_interval: Период проверки условия в секундах.
+        :return: Значение, которое вернуло условие.
+        :raises TimeoutException: Если условие не выполнено за timeout.
+        :raises TaskCancelled: Если выполнение отменено во время ожидания.
+        """
+        started = time.monotonic()
+        deadline = started + timeout
+        while True:
+            try:
+                value = condition(driver)
+            except NoSuchElementException:
+                value = None
+            if value:
+                self._record_wait(name, time.monotonic() - started, True)
+                return value
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._record_wait(name, time.monotonic() - started, False)
+                raise TimeoutException(f"Ожидание «{name}» не завершилось за {timeout} с.")
+            delay = min(poll_interval, remaining)
+            if self.cancel_token is not None:
+                if self.cancel_token.wait(delay):
+                    self._record_wait(name, time.monotonic() - started, False)
+                    raise TaskCancelled(f"Ожидание «{name}» прервано отменой.")
+            else:
+                time.sleep(delay)
+
+    def wait_for_document_ready(self, driver, timeout=DEFAULT_WAIT_TIMEOUT, state="complete"):
+        """
+        Ждёт document.readyState: "interactive" — DOM разобран, "complete" — загружены и ресурсы.
+        """
+        accepted = ("interactive", "complete") if state == "interactive" else ("complete",)
+        return self.wait_until(
+            driver, lambda d: d.execute_script("return document.readyState") in accepted,
+            timeout, name=f"документ {state}")
+
+    def wait_for_network_idle(self, driver, timeout=DEFAULT_WAIT_TIMEOUT, idle_time=NETWORK_IDLE_TIME):
+        """
+        Ждёт, пока документ загружен и страница idle_time секунд не начинает
+        новых сетевых запросов (по записям performance resource timing).
+
+        :param idle_time: Секунды без новых запросов.
+        """
+        observed = {'count': -1, 'since': time.monotonic()}
+
+        def idle(d):
+            state, count = d.execute_script(
+                "return [document.readyState, performance.getEntriesByType('resource').length]")
+            now = time.monotonic()
+            if state != "complete" or count != observed['count']:
+                observed['count'] = count
+                observed['since'] = now
+                return False
+            return now - observed['since'] >= idle_time
+
+        return self.wait_until(driver, idle, timeout, name="простой сети")
+
+    def wait_for_element(self, driver, locator, timeout=DEFAULT_WAIT_TIMEOUT, visible=False):
+        """
+        Ждёт появления элемента в DOM.
+
+        :param locator: CSS-селектор или кортеж (By.*, значение).
+        :param visible: Дополнительно ждать, пока элемент станет видимым.
+        :return: Найденный WebElement.
+        """
+        by, value = (By.CSS_SELECTOR, locator) if isinstance(locator, str) else locator
+
+        def present(d):
+            element = d.find_element(by, value)
+            return element if not visible or element.is_displayed() else None
+
+        return self.wait_until(driver, present, timeout, name=f"элемент {value}")
+
+    def wait_for_url_change(self, driver, previous_url, timeout=DEFAULT_WAIT_TIMEOUT):
+        """
+        Ждёт, пока адрес страницы не станет отличным от previous_url (переход, перенаправление).
+
+        :return: Новый адрес страницы.
+        """
+        return self.wait_until(
+            driver, lambda d: d.current_url if d.current_url != previous_url else None,
+            timeout, name="смена адреса")
+
+    def _record_wait(self, name, seconds, ok):
+        self.waits.append((name, seconds, ok))
+        logging.debug(f"Ожидание «{name}»: {seconds:.3f} с{'' if ok else ' (не дождались)'}")
+
+    def wait_stats(self):
+        """
+        :return: Словарь {имя ожидания: (количество, суммарные секунды)}.
+        """
+        stats = {}
+        for name, seconds, _ in self.waits:
+            count, total = stats.get(name, (0, 0.0))
+            stats[name] = (count + 1, total + seconds)
+        return stats
@@ -0,0 +1,88 @@
+# app/utils/cancellation.py
+
+import asyncio
+import threading
+
+
+class TaskCancelled(Exception):
+    """
+    Исключение, которым задача сообщает о кооперативной отмене выполнения.
+    """
+
+
+class CancellationToken:
+    """
+    Признак отмены выполнения.
+
+    В процессе пула токен отменяет поток, читающий канал отмены от родителя
+    (см. worker_entry.watch_cancellation); задачи проверяют его между
+    шагами (is_cancelled, raise_if_cancelled) и используют wait() вместо
+    time.sleep(), чтобы ожидание прерывалось сразу после запроса остановки.
+    Задачи с async def run() используют await wait_async() вместо asyncio.sleep().
+    """
+
+    def __init__(self, event=None):
+        """
+        :param event: Событие отмены (None — новый threading.Event).
+        """
+        self._event = event if event is not None else threading.Event()
+        self._lock = threading.Lock()
+        # Ожидающие wait_async(): пары (цикл, future), которые будит cancel()
+        self._waiters = set()
+
+    def cancel(self):
+        with self._lock:
+            self._event.set()
+            waiters, self._waiters = self._waiters, set()
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                pass  # Цикл уже закрыт
+
+    def is_cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TaskCancelled("Выполнение отменено.")
+
+    def wait(self, timeout=None):
+        """
+        Прерываемая замена time.sleep().
+
+        :param timeout: Время ожидания в секундах (None — до отмены).
+        :return: True, если выполнение отменено.
+        """
+        return self._event.wait(timeout)
+
+    async def wait_async(self, timeout=None):
+        """
+        Прерываемая замена asyncio.sleep().
+
+        Ожидание — future цикла, которую cancel() завершает через
+        call_soon_threadsafe; потоков не создаётся, и после ожидания
+        (или закрытия цикла) токен не держит ссылок на цикл.
+
+        :param timeout: Время ожидания в секундах (None — до отмены).
+        :return: True, если выполнение отменено.
+        """
+        loop = asyncio.get_running_loop()
+        waiter = (loop, loop.create_future())
+        with self._lock:
+            if self._event.is_set():
+                return True
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1], timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+        return self.is_cancelled()
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(True)
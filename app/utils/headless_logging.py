@@ -0,0 +1,51 @@
+# app/utils/headless_logging.py
+
+import logging
+import logging.handlers
+import sys
+from multiprocessing import Queue
+
+from app.utils.log_gate import set_log_level
+
+
+def setup_headless_logging(log_queue: Queue, log_file=None, level=logging.INFO):
+    """
+    Настраивает логирование без GUI: записи из очереди выводятся в stdout или файл.
+
+    :param log_queue: Очередь для передачи лог-записей (multiprocessing.Queue или PipeLogTransport).
+    :param log_file: Путь к файлу логов (None — вывод в stdout).
+    :param level: Минимальный уровень выводимых записей.
+    :return: Объект QueueListener.
+    """
+    # Создаём обработчик, который отправляет логи в очередь
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setLevel(logging.DEBUG)
+
+    # Получаем корневой логгер и добавляем QueueHandler
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.DEBUG)
+    root_logger.addHandler(queue_handler)
+
+    formatter = logging.Formatter(
+        '%(asctime)s [%(levelname)s] %(message)s', '%Y-%m-%d %H:%M:%S')
+
+    if log_file:
+        # Файловый обработчик с ротацией
+        output_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=10*1024*1024, backupCount=5, encoding='utf-8'
+        )
+    else:
+        output_handler = logging.StreamHandler(sys.stdout)
+    output_handler.setLevel(level)
+    output_handler.setFormatter(formatter)
+
+    # Создаём QueueListener
+    listener = logging.handlers.QueueListener(
+        log_queue, output_handler, respect_handler_level=True
+    )
+    listener.start()
+
+    # Записи ниже level не создаются ни здесь, ни в процессах пула
+    set_log_level(level)
+
+    return listener
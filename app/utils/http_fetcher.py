@@ -0,0 +1,177 @@
+# app/utils/http_fetcher.py
+
+import contextvars
+import logging
+import os
+import re
+import threading
+import time
+import urllib3
+from contextlib import contextmanager
+from urllib3.util.request import ACCEPT_ENCODING
+
+# Способы получения страницы (resources.fetch в manifest.yaml)
+FETCH_HTTP = "http"  # сырой HTML через пул HTTP-соединений
+FETCH_BROWSER = "browser"  # страница, отрисованная Chrome
+
+# Способ, объявленный выполняемой задачей (задаёт TaskManager)
+_task_fetch = contextvars.ContextVar("task_fetch", default=FETCH_HTTP)
+
+DEFAULT_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+
+# Признаки страниц, которым для содержимого нужен JavaScript или проверка браузера
+BROWSER_REQUIRED_STATUSES = (403, 429, 503)
+BROWSER_REQUIRED_PATTERNS = (
+    r"enable javascript",
+    r"включите javascript",
+    r"<noscript>[^<]*(javascript|браузер)",
+    r"cf-browser-verification|challenge-platform|cf_chl_",
+    r"<div id=\"(root|app|__next)\">\s*</div>",
+)
+# Страница без видимого текста короче этого порога считается пустой оболочкой SPA
+MIN_TEXT_LENGTH = 200
+
+
+class FetchResult:
+    """
+    Результат получения страницы.
+    """
+
+    def __init__(self, url, status, html, headers=None, backend=FETCH_HTTP, elapsed=0.0):
+        self.url = url  # Итоговый URL после перенаправлений
+        self.status = status
+        self.html = html
+        self.headers = headers or {}
+        self.backend = backend  # FETCH_HTTP или FETCH_BROWSER
+        self.elapsed = elapsed  # Секунды
+
+
+def requires_browser(result, patterns=BROWSER_REQUIRED_PATTERNS, min_text_length=MIN_TEXT_LENGTH):
+    """
+    Правило перехода на браузер: ответ похож на проверку «я не робот»,
+    заглушку «включите JavaScript» или пустую оболочку одностраничного приложения.
+
+    :param result: FetchResult, полученный по HTTP.
+    :return: True, если страницу нужно открыть в браузере.
+    """
+    if result.status in BROWSER_REQUIRED_STATUSES:
+        return True
+    content_type = result.headers.get('Content-Type', '')
+    if 'html' not in content_type:
+        return False
+    html = result.html.lower()
+    if any(re.search(pattern, html) for pattern in patterns):
+        return True
+    body = re.search(r"<body[^>]*>(.*)</body>", html, re.S)
+    if body is None:
+        return False
+    text = re.sub(r"<script.*?</script>|<style.*?</style>|<[^>]+>", " ", body.group(1), flags=re.S)
+    return len(" ".join(text.split())) < min_text_length
+
+
+class HttpFetcher:
+    """
+    HTTP-клиент с пулом keep-alive соединений для задач, которым не нужен JavaScript.
+
+    Соединения к каждому хосту переиспользуются (urllib3.PoolManager, не
+    больше max_connections_per_host на хост), ответы gzip/deflate, а при
+    установленном пакете brotli и br, распаковываются автоматически.
+    Количество одновременных запросов из процесса ограничено max_concurrency.
+    """
+
+    def __init__(self, max_connections_per_host=10, max_hosts=50, max_concurrency=20, timeout=30.0,
+                 retries=2, headers=None):
+        self.timeout = timeout
+        self.headers = {
+            'User-Agent': DEFAULT_USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Encoding': ACCEPT_ENCODING,
+        }
+        self.headers.update(headers or {})
+        self.pool_manager = urllib3.PoolManager(
+            num_pools=max_hosts,
+            maxsize=max_connections_per_host,
+            block=True,  # Не открывать соединений сверх maxsize — ждать свободного
+            retries=urllib3.Retry(total=retries, backoff_factor=0.3,
+                                  status_forcelist=(502, 504), redirect=10),
+            timeout=urllib3.Timeout(total=timeout))
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+
+        # Статистика
+        self.requests = 0
+        self.bytes_received = 0
+
+    def fetch(self, url, headers=None):
+        """
+        Загружает страницу и возвращает FetchResult с декодированным HTML.
+
+        :raises urllib3.exceptions.HTTPError: При ошибке соединения или таймауте.
+        """
+        request_headers = dict(self.headers)
+        request_headers.update(headers or {})
+        started = time.monotonic()
+        with self.semaphore:
+            response = self.pool_manager.request(
+                'GET', url, headers=request_headers, preload_content=True, decode_content=True)
+        body = response.data
+        self.requests += 1
+        self.bytes_received += len(body)
+        charset = 'utf-8'
+        match = re.search(r"charset=([\w-]+)", response.headers.get('Content-Type', ''))
+        if match:
+            charset = match.group(1)
+        try:
+            html = body.decode(charset, errors='replace')
+        except LookupError:
+            html = body.decode('utf-8', errors='replace')
+        final_url = response.geturl() or url
+        elapsed = time.monotonic() - started
+        logging.debug(f"HTTP {response.status} {final_url}: {len(body)} байт за {elapsed:.3f} с")
+        return FetchResult(final_url, response.status, html, response.headers, FETCH_HTTP, elapsed)
+
+    def close(self):
+        self.pool_manager.clear()
+
+
+_fetchers = {}  # Ключ: pid, Значение: HttpFetcher
+_fetchers_lock = threading.Lock()
+
+
+def get_http_fetcher(**kwargs):
+    """
+    Возвращает HttpFetcher текущего процесса (создаётся при первом обращении),
+    чтобы соединения переиспользовались между выполнениями задач.
+
+    :param kwargs: Параметры HttpFetcher, используются только при создании.
+    """
+    with _fetchers_lock:
+        # После fork клиент родителя (и его сокеты) дочернему процессу не принадлежит
+        fetcher = _fetchers.get(os.getpid())
+        if fetcher is None:
+            fetcher = HttpFetcher(**kwargs)
+            _fetchers[os.getpid()] = fetcher
+        return fetcher
+
+
+@contextmanager
+def task_fetch_backend(resources):
+    """
+    Задаёт способ получения страниц по умолчанию (resources.fetch из
+    манифеста) для кода внутри блока — выполнения одной задачи.
+
+    :param resources: Подсказки о ресурсах задачи.
+    """
+    token = _task_fetch.set((resources or {}).get('fetch', FETCH_HTTP))
+    try:
+        yield
+    finally:
+        _task_fetch.reset(token)
+
+
+def default_fetch_backend():
+    """
+    Возвращает способ получения страниц, объявленный выполняемой задачей
+    (FETCH_HTTP вне выполнения задачи или без resources.fetch).
+    """
+    return _task_fetch.get()
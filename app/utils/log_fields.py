@@ -0,0 +1,85 @@
+# app/utils/log_fields.py
+
+import contextvars
+import logging
+from contextlib import contextmanager
+
+# Структурные поля записей лога: передаются через extra=... и переживают
+# QueueHandler/QueueListener как атрибуты LogRecord
+FIELD_NAMES = ("process_number", "task", "event")
+
+# События выполнения (поле event)
+EVENT_CHAIN_STARTED = "chain_started"
+EVENT_TASK_STARTED = "task_started"
+EVENT_TASK_FINISHED = "task_finished"
+EVENT_TASK_FAILED = "task_failed"
+EVENT_CHAIN_CANCELLED = "chain_cancelled"
+EVENT_CHAIN_FAILED = "chain_failed"
+EVENT_CHAIN_FINISHED = "chain_finished"
+
+# Подписи событий для интерфейса
+EVENT_LABELS = {
+    EVENT_CHAIN_STARTED: "Начало выполнения",
+    EVENT_TASK_STARTED: "Запуск задачи",
+    EVENT_TASK_FINISHED: "Завершение задачи",
+    EVENT_TASK_FAILED: "Ошибка задачи",
+    EVENT_CHAIN_CANCELLED: "Отмена выполнения",
+    EVENT_CHAIN_FAILED: "Ошибка выполнения",
+    EVENT_CHAIN_FINISHED: "Конец выполнения",
+}
+
+# Процесс и задача, выполняющиеся в текущем потоке или корутине
+_process_number = contextvars.ContextVar("log_process_number", default=None)
+_task = contextvars.ContextVar("log_task", default=None)
+
+
+def log_extra(process_number=None, task=None, event=None):
+    """
+    Возвращает словарь для extra= вызова логирования.
+
+    :param process_number: Номер процесса пула.
+    :param task: Локализованное имя задачи.
+    :param event: Событие выполнения (EVENT_*).
+    """
+    return {'process_number': process_number, 'task': task, 'event': event}
+
+
+@contextmanager
+def log_context(process_number=None, task=None):
+    """
+    Задаёт процесс и задачу для всех записей лога внутри блока, в том числе
+    записей самих задач, которые пишут через logging без extra.
+    """
+    tokens = []
+    if process_number is not None:
+        tokens.append((_process_number, _process_number.set(process_number)))
+    if task is not None:
+        tokens.append((_task, _task.set(task)))
+    try:
+        yield
+    finally:
+        for variable, token in reversed(tokens):
+            variable.reset(token)
+
+
+class LogContextFilter(logging.Filter):
+    """
+    Дополняет записи полями process_number и task из log_context, если они
+    не переданы через extra, и гарантирует наличие всех полей FIELD_NAMES.
+    """
+
+    def filter(self, record):
+        if getattr(record, 'process_number', None) is None:
+            record.process_number = _process_number.get()
+        if getattr(record, 'task', None) is None:
+            record.task = _task.get()
+        if not hasattr(record, 'event'):
+            record.event = None
+        return True
+
+
+def record_fields(record):
+    """
+    :return: Кортеж (process_number, task, event) записи; отсутствующие поля — None.
+    """
+    return tuple(getattr(record, name, None) for name in FIELD_NAMES)
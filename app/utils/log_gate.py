@@ -0,0 +1,172 @@
+# app/utils/log_gate.py
+
+import logging
+import multiprocessing
+import threading
+import time
+
+# Как часто процесс пула проверяет общий уровень логирования, секунды
+LEVEL_POLL_INTERVAL = 0.5
+# Лимит записей процесса пула: в среднем столько записей в секунду...
+DEFAULT_RATE = 200
+# ...и не больше стольких подряд
+DEFAULT_BURST = 1000
+# Сводка о пропущенных записях отправляется не чаще раза в столько секунд
+DROP_REPORT_INTERVAL = 1.0
+
+# Общий уровень логирования процессов пула (создаётся в главном процессе)
+_shared_level = None
+
+
+def shared_log_level():
+    """
+    Возвращает общий для процессов пула уровень логирования.
+
+    multiprocessing.Value создаётся при первом вызове в главном процессе и
+    передаётся процессам при запуске; изменение через set_log_level видно им
+    без перезапуска. До настройки логирования уровень — DEBUG.
+    """
+    global _shared_level
+    if _shared_level is None:
+        _shared_level = multiprocessing.Value('i', logging.DEBUG, lock=False)
+    return _shared_level
+
+
+def set_log_level(level, handlers=()):
+    """
+    Устанавливает минимальный уровень записей, которые нужны получателям.
+
+    Процессы пула перестают создавать и отправлять в очередь записи ниже
+    уровня в течение LEVEL_POLL_INTERVAL; главный процесс — сразу.
+
+    :param level: Уровень логирования (logging.INFO, ...).
+    :param handlers: Обработчики QueueListener, получающие этот же уровень.
+    """
+    for handler in handlers:
+        handler.setLevel(level)
+    shared_log_level().value = level
+    logging.getLogger().setLevel(level)
+
+
+def watch_log_level(shared_level, logger, interval=LEVEL_POLL_INTERVAL):
+    """
+    Поток процесса пула: переносит общий уровень на логгер процесса.
+
+    Уровень применяется к логгеру, а не фильтром, поэтому записи ниже него
+    отбрасываются ещё в logger.isEnabledFor — до создания LogRecord,
+    сериализации и передачи в очередь.
+    """
+    while True:
+        level = shared_level.value
+        if logger.level != level:
+            logger.setLevel(level)
+        time.sleep(interval)
+
+
+class LogFloodLimiter(logging.Filter):
+    """
+    Ограничитель потока записей процесса пула (фильтр QueueHandler).
+
+    Подряд идущие одинаковые сообщения (уровень и текст) сворачиваются в
+    одно: повторы не отправляются, а перед следующим другим сообщением
+    отправляется сводка с их числом. Остальные записи проходят через
+    token bucket: в среднем rate записей в секунду с запасом burst; записи
+    сверх лимита отбрасываются (WARNING и выше — никогда), и не чаще раза в
+    DROP_REPORT_INTERVAL отправляется сводка с числом пропущенных.
+
+    Счётчики collapsed и dropped показывают, сколько записей не отправлено.
+    """
+
+    def __init__(self, handler, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        """
+        :param handler: Обработчик, которому отправляются сводки (минуя фильтры).
+        :param rate: Записей в секунду в среднем.
+        :param burst: Наибольшее число записей подряд.
+        """
+        super().__init__()
+        self.handler = handler
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.refilled = time.monotonic()
+        self.collapsed = 0  # Всего свёрнутых повторов
+        self.dropped = 0  # Всего записей, отброшенных лимитом
+        self._last_key = None
+        self._last_record = None
+        self._repeats = 0  # Повторов последнего сообщения, ещё не отражённых в сводке
+        self._pending_drops = 0  # Отброшенных записей, ещё не отражённых в сводке
+        self._drops_reported = 0.0  # time.monotonic() последней сводки о пропусках
+        self._lock = threading.Lock()  # Задачи могут писать из нескольких потоков
+
+    def filter(self, record):
+        key = (record.levelno, record.getMessage())
+        with self._lock:
+            if key == self._last_key:
+                self._repeats += 1
+                self.collapsed += 1
+                return False
+            self._flush_repeats()
+
+            if record.levelno < logging.WARNING and not self._take_token():
+                # Повторы отброшенного сообщения тоже проходят через лимит
+                self._last_key = None
+                self._pending_drops += 1
+                self.dropped += 1
+                return False
+            self._last_key, self._last_record = key, record
+            self._flush_drops(record)
+            return True
+
+    def _take_token(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def _flush_repeats(self):
+        if self._repeats:
+            record = self._last_record
+            self._send(record, record.levelno,
+                       f"{record.getMessage()} (повторено ещё {self._repeats} раз)")
+            self._repeats = 0
+
+    def _flush_drops(self, record, force=False):
+        if not self._pending_drops:
+            return
+        now = time.monotonic()
+        if force or now - self._drops_reported >= DROP_REPORT_INTERVAL:
+            self._drops_reported = now
+            self._send(record, logging.WARNING,
+                       f"Пропущено записей лога: {self._pending_drops} "
+                       f"(превышен лимит {self.rate} записей/с)")
+            self._pending_drops = 0
+
+    def _send(self, source, level, message):
+        # Сводка наследует поля записи, к которой относится (процесс, задача)
+        summary = logging.makeLogRecord({
+            'name': source.name, 'levelno': level, 'levelname': logging.getLevelName(level),
+            'msg': message, 'created': time.time(),
+            'process_number': getattr(source, 'process_number', None),
+            'task': getattr(source, 'task', None), 'event': None})
+        self.handler.acquire()
+        try:
+            self.handler.emit(summary)
+        finally:
+            self.handler.release()
+
+    def flush(self):
+        """
+        Отправляет сводки, ожидающие следующей записи (перед завершением процесса).
+        """
+        with self._lock:
+            self._flush_repeats()
+            if self._last_record is None:
+                return
+            self._flush_drops(self._last_record, force=True)
+            if self.collapsed or self.dropped:
+                self._send(self._last_record, logging.INFO,
+                           f"Не отправлено записей лога: {self.collapsed} повторов, "
+                           f"{self.dropped} сверх лимита")
@@ -0,0 +1,320 @@
+# app/utils/log_transport.py
+
+import logging
+import pickle
+import queue
+import threading
+import time
+from collections import deque
+from multiprocessing import Pipe
+from multiprocessing.connection import wait
+
+from app.utils.log_fields import FIELD_NAMES
+
+# Политики переполнения буфера процесса
+OVERFLOW_BLOCK = "block"  # Процесс ждёт, пока буфер освободится (записи не теряются)
+OVERFLOW_DROP_OLDEST = "drop-oldest"  # Вытесняется самая старая неотправленная запись
+OVERFLOW_DROP_NEWEST = "drop-newest"  # Отбрасывается новая запись
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST)
+
+# Неотправленных записей на процесс не больше...
+DEFAULT_CAPACITY = 10000
+# ...в одном пакете не больше...
+DEFAULT_BATCH_SIZE = 256
+# ...и пакет ждёт добора не дольше стольких секунд
+DEFAULT_FLUSH_INTERVAL = 0.05
+
+# Атрибуты LogRecord, передаваемые из процесса; остальные (args, exc_info)
+# теряют смысл вне процесса — как и в QueueHandler.prepare, они
+# включаются в текст сообщения
+RECORD_ATTRS = (
+    'name', 'levelno', 'levelname', 'msg', 'created', 'msecs', 'relativeCreated',
+    'process', 'processName', 'thread', 'threadName', 'pathname', 'filename',
+    'module', 'funcName', 'lineno') + FIELD_NAMES
+_MSG_INDEX = RECORD_ATTRS.index('msg')
+_FIELD_INDEXES = tuple(RECORD_ATTRS.index(name) for name in FIELD_NAMES)
+# Значения структурных полей, передаваемые как есть; остальные — строкой
+_PLAIN_TYPES = (str, int, float, bool, type(None))
+
+
+class LogChannel:
+    """
+    Канал записей лога одного процесса пула: пишущий конец Pipe и настройки
+    буфера. Передаётся процессу при запуске вместо очереди логирования.
+    """
+
+    def __init__(self, conn, capacity, overflow, batch_size, flush_interval):
+        self.conn = conn
+        self.capacity = capacity
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+    def close(self):
+        """
+        Закрывает копию пишущего конца в родительском процессе (после запуска
+        процесса): иначе родитель не увидит конец канала при выходе процесса.
+        """
+        self.conn.close()
+
+
+class PipeLogTransport:
+    """
+    Транспорт записей лога из процессов пула по отдельным каналам.
+
+    multiprocessing.Queue сериализует каждую запись отдельно, пишет её в
+    общий канал отдельным системным вызовом через поток-фидер и не
+    ограничена по размеру: при потоке записей растёт память родителя.
+    Здесь каждый процесс получает свой канал (open_channel), а его
+    PipeLogHandler копит записи в ограниченном буфере и отправляет пакетами
+    — одна сериализация и одна запись в канал на пакет. Если родитель не
+    успевает читать, канал заполняется, а буфер процесса ведёт себя по
+    политике overflow (OVERFLOW_POLICIES).
+
+    Объект заменяет очередь логирования главного процесса: QueueHandler
+    кладёт в него записи главного процесса (put_nowait), а QueueListener
+    забирает (get) и их, и записи всех каналов. Читатель должен быть один.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, overflow=OVERFLOW_BLOCK,
+                 batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        """
+        :param capacity: Неотправленных записей на процесс.
+        :param overflow: Политика при заполненном буфере процесса (OVERFLOW_POLICIES).
+        :param batch_size: Записей в пакете.
+        :param flush_interval: Наибольшая задержка пакета в секундах.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Неизвестная политика переполнения: {overflow}")
+        self.capacity = capacity
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._readers = []  # Читающие концы открытых каналов
+        self._records = deque()  # Принятые, но ещё не выданные записи
+        self._local = queue.SimpleQueue()  # Записи главного процесса
+        self._lock = threading.Lock()
+        # Канал пробуждения get(): новая запись главного процесса или новый канал
+        self._wakeup_reader, self._wakeup_writer = Pipe(duplex=False)
+        self._wakeup_pending = False
+
+    def open_channel(self):
+        """
+        Создаёт канал для нового процесса пула.
+
+        :return: LogChannel для передачи процессу.
+        """
+        reader, writer = Pipe(duplex=False)
+        with self._lock:
+            self._readers.append(reader)
+        self._wake()
+        return LogChannel(writer, self.capacity, self.overflow, self.batch_size, self.flush_interval)
+
+    def _wake(self):
+        with self._lock:
+            if self._wakeup_pending:
+                return
+            self._wakeup_pending = True
+        self._wakeup_writer.send_bytes(b"\0")
+
+    # Интерфейс очереди для QueueHandler и QueueListener
+
+    def put_nowait(self, record):
+        self._local.put(record)
+        self._wake()
+
+    def put(self, record, block=True, timeout=None):
+        self.put_nowait(record)
+
+    def get(self, block=True, timeout=None):
+        """
+        Возвращает следующую запись главного процесса или любого канала.
+
+        :raises queue.Empty: Записей нет (block=False) или истёк timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._records:
+                return self._records.popleft()
+            try:
+                return self._local.get_nowait()
+            except queue.Empty:
+                pass
+            if not block:
+                wait_time = 0
+            elif deadline is None:
+                wait_time = None
+            else:
+                wait_time = max(0.0, deadline - time.monotonic())
+            with self._lock:
+                readers = self._readers + [self._wakeup_reader]
+            ready = wait(readers, wait_time)
+            if not ready and wait_time is not None:
+                raise queue.Empty
+            for conn in ready:
+                if conn is self._wakeup_reader:
+                    with self._lock:
+                        self._wakeup_pending = False
+                    conn.recv_bytes()
+                else:
+                    self._receive(conn)
+
+    def _receive(self, conn):
+        try:
+            data = conn.recv_bytes()
+        except (EOFError, OSError):
+            # Процесс завершился и закрыл канал
+            with self._lock:
+                self._readers.remove(conn)
+            conn.close()
+            return
+        for values in pickle.loads(data):
+            self._records.append(logging.makeLogRecord(dict(zip(RECORD_ATTRS, values))))
+
+    def close(self):
+        with self._lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            conn.close()
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+
+
+class PipeLogHandler(logging.Handler):
+    """
+    Обработчик процесса пула, отправляющий записи в LogChannel пакетами.
+
+    emit() только подготавливает запись и кладёт её в буфер; сериализацию
+    и запись в канал выполняет отдельный поток. Буфер ограничен
+    channel.capacity записями, при заполнении действует channel.overflow.
+    Счётчик dropped — записи, отброшенные политикой переполнения или не
+    прошедшие сериализацию: ошибка в одной записи не останавливает поток
+    отправки (иначе процесс с политикой block повис бы на полном буфере).
+    """
+
+    def __init__(self, channel):
+        super().__init__()
+        self.conn = channel.conn
+        self.capacity = channel.capacity
+        self.overflow = channel.overflow
+        self.batch_size = channel.batch_size
+        self.flush_interval = channel.flush_interval
+        self.dropped = 0
+        self._pending = deque()
+        self._sending = 0  # Записей в отправляемом сейчас пакете
+        self._condition = threading.Condition()
+        self._closed = False
+        self._sender = threading.Thread(target=self._send_loop, daemon=True, name="log-channel")
+        self._sender.start()
+
+    def prepare(self, record):
+        """
+        Переводит запись в кортеж RECORD_ATTRS, как QueueHandler.prepare:
+        текст сообщения форматируется здесь (с исключением и стеком, если они
+        есть), а args, exc_info и exc_text не передаются. Структурные поля
+        произвольных типов (extra=...) передаются строкой — их объекты могут
+        не сериализоваться.
+        """
+        message = self.format(record)
+        values = [getattr(record, name, None) for name in RECORD_ATTRS]
+        values[_MSG_INDEX] = message
+        for index in _FIELD_INDEXES:
+            if not isinstance(values[index], _PLAIN_TYPES):
+                values[index] = str(values[index])
+        return tuple(values)
+
+    def emit(self, record):
+        try:
+            item = self.prepare(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._condition:
+            if len(self._pending) >= self.capacity:
+                if self.overflow == OVERFLOW_DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                if self.overflow == OVERFLOW_DROP_OLDEST:
+                    self._pending.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._pending) >= self.capacity and not self._closed:
+                        self._condition.wait()
+            if self._closed:
+                return
+            self._pending.append(item)
+            if len(self._pending) == 1 or len(self._pending) >= self.batch_size:
+                self._condition.notify_all()
+
+    def _send_loop(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return  # Закрыт, всё отправлено
+                if len(self._pending) < self.batch_size and not self._closed:
+                    # Даём пакету набраться, но не дольше flush_interval
+                    self._condition.wait(self.flush_interval)
+                count = min(len(self._pending), self.batch_size)
+                batch = [self._pending.popleft() for _ in range(count)]
+                self._sending = count
+                self._condition.notify_all()  # Место в буфере освободилось
+            try:
+                data = self._serialize(batch)
+            except Exception:
+                data = None
+                with self._condition:
+                    self.dropped += len(batch)
+            try:
+                if data is not None:
+                    self.conn.send_bytes(data)
+            except (OSError, ValueError):
+                # Родитель закрыл канал: дальнейшие записи некуда отправлять
+                with self._condition:
+                    self._closed = True
+                    self._pending.clear()
+            with self._condition:
+                self._sending = 0
+                self._condition.notify_all()
+
+    def _serialize(self, batch):
+        """
+        :return: Пакет, сериализованный для канала, или None, если в нём не
+                 осталось записей. Записи, которые не сериализуются, отбрасываются
+                 по одной и учитываются в dropped.
+        """
+        try:
+            return pickle.dumps(batch, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            pass
+        items = []
+        for item in batch:
+            try:
+                pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                with self._condition:
+                    self.dropped += 1
+                continue
+            items.append(item)
+        if not items:
+            return None
+        return pickle.dumps(items, pickle.HIGHEST_PROTOCOL)
+
+    def flush(self):
+        """
+        Ждёт отправки всех записей буфера.
+        """
+        with self._condition:
+            self._condition.notify_all()
+            while (self._pending or self._sending) and self._sender.is_alive():
+                self._condition.wait(self.flush_interval)
+
+    def close(self):
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._sender.join(1)
+        self.conn.close()
+        super().close()
@@ -2,6 +2,8 @@
 
 import logging
 
+from app.utils.log_fields import EVENT_TASK_FAILED, EVENT_TASK_FINISHED, EVENT_TASK_STARTED, log_extra
+
 # Настройка логирования
 logging.basicConfig(level=logging.INFO,
                     format='%(message)s')
@@ -10,18 +12,18 @@ logging.basicConfig(level=logging.INFO,
 def log_task_start(task_name, process_number):
     """Логирует начало выполнения задачи процессом."""
     message = f"Процесс {process_number}: запустил {task_name}"
-    logging.info(message)
+    logging.info(message, extra=log_extra(process_number, task_name, EVENT_TASK_STARTED))
 
 
 def log_task_end(task_name, process_number):
     """Логирует завершение выполнения задачи процессом."""
     message = f"Процесс {
         process_number}: завершил выполнение задачи {task_name}"
-    logging.info(message)
+    logging.info(message, extra=log_extra(process_number, task_name, EVENT_TASK_FINISHED))
 
 
 def log_task_error(task_name, process_number, error_message):
     """Логирует ошибку выполнения задачи процессом."""
     message = f"Процесс {process_number}: ошибка выполнения задачи {
         task_name}: {error_message}"
-    logging.error(message)
+    logging.error(message, extra=log_extra(process_number, task_name, EVENT_TASK_FAILED))
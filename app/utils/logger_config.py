@@ -2,24 +2,28 @@ import logging
 import logging.handlers
 from multiprocessing import Queue
 from PySide6.QtCore import QObject, Signal
+from app.utils.log_fields import LogContextFilter
+from app.utils.log_gate import set_log_level
 from app.utils.qt_log_handler import QtLogHandler
 
 
 class LogEmitter(QObject):
     new_log = Signal(str, str, str)  # timestamp, log_type, message
+    new_logs = Signal(list)  # Пакет записей [(created в секундах эпохи, log_type, message, process_number, task, event), ...]
 
 
 def setup_logging(log_queue: Queue, log_emitter: LogEmitter):
     """
     Настраивает систему логирования с использованием QueueHandler и QueueListener.
 
-    :param log_queue: Очередь для передачи лог-записей.
+    :param log_queue: Очередь для передачи лог-записей (multiprocessing.Queue или PipeLogTransport).
     :param log_emitter: Объект-эмиттер для передачи логов в GUI.
     :return: Объект QueueListener.
     """
     # Создаём обработчик, который отправляет логи в очередь
     queue_handler = logging.handlers.QueueHandler(log_queue)
     queue_handler.setLevel(logging.DEBUG)
+    queue_handler.addFilter(LogContextFilter())
 
     # Создаём форматтер (он теперь не добавляет лишнюю информацию)
     formatter = logging.Formatter('%(message)s')
@@ -39,7 +43,7 @@ def setup_logging(log_queue: Queue, log_emitter: LogEmitter):
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(formatter)
 
-    # Обработчик для LogTab через Qt сигналы
+    # Обработчик для LogTab через Qt сигналы (записи отправляются пакетами)
     qt_handler = QtLogHandler(log_emitter)
     qt_handler.setLevel(logging.INFO)
     qt_handler.setFormatter(formatter)
@@ -50,4 +54,7 @@ def setup_logging(log_queue: Queue, log_emitter: LogEmitter):
     )
     listener.start()
 
+    # Записи ниже уровня обработчиков не создаются ни здесь, ни в процессах пула
+    set_log_level(min(file_handler.level, qt_handler.level))
+
     return listener
@@ -0,0 +1,100 @@
+# app/utils/process_tree.py
+
+import logging
+import psutil
+
+
+def descendants(pids):
+    """
+    Возвращает всех потомков процессов pids (рекурсивно) в виде psutil.Process.
+
+    Снимок нужно делать до завершения родителя: после его смерти потомки
+    переходят к init и связь с деревом теряется.
+    """
+    processes = []
+    for pid in pids:
+        try:
+            processes.extend(psutil.Process(pid).children(recursive=True))
+        except psutil.Error:
+            continue
+    return processes
+
+
+def kill_processes(processes, timeout=3):
+    """
+    Завершает процессы: сначала terminate(), по истечении timeout — kill().
+
+    :param processes: Список psutil.Process (уже завершённые пропускаются).
+    :param timeout: Время на штатное завершение в секундах.
+    :return: Кортеж (количество завершённых, список выживших psutil.Process).
+    """
+    alive = []
+    for process in processes:
+        try:
+            if process.is_running():
+                process.terminate()
+                alive.append(process)
+        except psutil.Error:
+            continue
+    if not alive:
+        return 0, []
+
+    gone, alive = psutil.wait_procs(alive, timeout=timeout)
+    for process in alive:
+        try:
+            process.kill()
+        except psutil.Error:
+            continue
+    killed, survivors = psutil.wait_procs(alive, timeout=timeout)
+    for process in survivors:
+        logging.warning(f"Не удалось завершить процесс PID {process.pid}.")
+    return len(gone) + len(killed), survivors
+
+
+def suspend_tree(pids):
+    """
+    Приостанавливает процессы pids и всех их потомков (SIGSTOP / NtSuspendProcess).
+
+    Сначала приостанавливаются корни, чтобы они не порождали новых потомков,
+    затем потомки; дерево обходится повторно, пока в нём есть новые процессы.
+
+    :return: Список приостановленных psutil.Process в порядке приостановки.
+    """
+    suspended = []
+    seen = set()
+    for pid in pids:
+        try:
+            process = psutil.Process(pid)
+            process.suspend()
+        except psutil.Error:
+            continue
+        suspended.append(process)
+        seen.add(pid)
+    for _ in range(3):
+        new_processes = [process for process in descendants(pids) if process.pid not in seen]
+        if not new_processes:
+            break
+        for process in new_processes:
+            seen.add(process.pid)
+            try:
+                process.suspend()
+            except psutil.Error:
+                continue
+            suspended.append(process)
+    return suspended
+
+
+def resume_processes(processes):
+    """
+    Возобновляет процессы, приостановленные suspend_tree (потомки — первыми).
+
+    :return: Количество возобновлённых процессов.
+    """
+    resumed = 0
+    for process in reversed(processes):
+        try:
+            process.resume()
+            resumed += 1
+        except psutil.Error:
+            continue
+    return resumed
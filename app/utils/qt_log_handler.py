@@ -1,16 +1,42 @@
 import logging
-from datetime import datetime
+import threading
+import time
+
+from app.utils.log_fields import record_fields
+
+# Пакет записей отправляется в GUI не реже, чем раз в столько секунд...
+FLUSH_INTERVAL = 0.05
+# ...или сразу по набору стольких записей
+MAX_BATCH_SIZE = 500
 
 
 class QtLogHandler(logging.Handler):
-    def __init__(self, emitter):
+    """
+    Передаёт записи лога в GUI пакетами.
+
+    Один межпоточный сигнал на запись при десятках процессов, пишущих DEBUG,
+    означает десятки тысяч вызовов слотов в секунду в GUI-потоке. Поэтому
+    записи копятся в буфере потока QueueListener и отправляются сигналом
+    new_logs списком (created, log_type, message, process_number, task,
+    event) по истечении
+    flush_interval после первой записи пакета или по набору max_batch_size.
+    """
+
+    def __init__(self, emitter, flush_interval=FLUSH_INTERVAL, max_batch_size=MAX_BATCH_SIZE):
         super().__init__()
         self.emitter = emitter
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        self._pending = threading.Event()  # В буфере есть записи
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True, name="qt-log-flush")
+        self._flusher.start()
 
     def emit(self, record):
-        # Получаем время логирования
-        timestamp = datetime.fromtimestamp(
-            record.created).strftime('%Y-%m-%d %H:%M:%S')
+        # Время логирования передаётся в секундах эпохи: GUI не разбирает строки
+        timestamp = record.created
 
         # Получаем уровень логирования
         log_type = record.levelname
@@ -18,5 +44,39 @@ class QtLogHandler(logging.Handler):
         # Получаем только само сообщение
         message = record.getMessage()
 
-        # Передаём время, уровень и сообщение в эмиттер
-        self.emitter.new_log.emit(timestamp, log_type, message)
+        # Структурные поля записи (None, если не заданы)
+        process_number, task, event = record_fields(record)
+
+        with self._buffer_lock:
+            self._buffer.append((timestamp, log_type, message, process_number, task, event))
+            full = len(self._buffer) >= self.max_batch_size
+        if full:
+            self.flush()
+        else:
+            self._pending.set()
+
+    def flush(self):
+        """
+        Отправляет накопленные записи в эмиттер одним сигналом.
+        """
+        with self._buffer_lock:
+            batch, self._buffer = self._buffer, []
+            self._pending.clear()
+        if batch:
+            try:
+                self.emitter.new_logs.emit(batch)
+            except RuntimeError:
+                pass  # Эмиттер уже удалён вместе с GUI
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._pending.wait()
+            # Даём пакету набраться, но не дольше flush_interval
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def close(self):
+        self._closed = True
+        self._pending.set()
+        self.flush()
+        super().close()
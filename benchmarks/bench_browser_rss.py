@@ -0,0 +1,115 @@
+# benchmarks/bench_browser_rss.py
+"""
+Бенчмарк памяти на одно одновременное выполнение с браузером.
+
+«Процесс»: у каждого выполнения свой Chrome и ChromeDriver (create_driver),
+как у BrowserSessionPool и прежнего OpenBrowser.Task.
+«Контексты»: все выполнения работают в изолированных контекстах одного
+Chrome (BrowserContextPool), у каждого — своё подключение ChromeDriver.
+
+Для каждого варианта открываются --concurrency выполнений одновременно,
+в каждом загружается страница, после чего суммируется RSS всех процессов
+браузеров и драйверов. Нужен Chrome и ChromeDriver (пути — аргументами).
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_browser_rss --concurrency 8 --headless
+"""
+
+import argparse
+import threading
+import time
+
+import psutil
+
+from app.utils import browser_helper, process_tree
+
+PAGE_URL = "data:text/html,<html><body><h1>SEORADAR</h1><p>" + "текст " * 2000 + "</p></body></html>"
+
+
+def tree_rss(pids):
+    total = 0
+    for pid in pids:
+        try:
+            processes = [psutil.Process(pid)] + process_tree.descendants([pid])
+        except psutil.Error:
+            continue
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+    return total
+
+
+def run_processes(browser_options, concurrency):
+    drivers = []
+    try:
+        for _ in range(concurrency):
+            driver = browser_helper.create_driver(browser_options)
+            driver.get(PAGE_URL)
+            drivers.append(driver)
+        time.sleep(1)  # Даём рендерерам дойти до установившегося объёма памяти
+        return tree_rss([driver.service.process.pid for driver in drivers])
+    finally:
+        for driver in drivers:
+            browser_helper.quit_driver(driver)
+
+
+def run_contexts(browser_options, concurrency):
+    pool = browser_helper.BrowserContextPool(browser_options, max_contexts=concurrency)
+    loaded = threading.Barrier(concurrency + 1)
+    measured = threading.Event()
+    driver_pids = set()
+    errors = []
+
+    def execution():
+        try:
+            with pool.lease() as driver:
+                driver.get(PAGE_URL)
+                driver_pids.add(driver.service.process.pid)
+                loaded.wait()
+                measured.wait()
+        except Exception as e:
+            errors.append(e)
+            loaded.abort()
+
+    threads = [threading.Thread(target=execution) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    try:
+        loaded.wait()
+        time.sleep(1)
+        # Драйвер не является потомком Chrome — считаем его отдельно
+        print(f"{'':>9}  процессов ChromeDriver: {len(driver_pids)}")
+        return pool.host.rss() + tree_rss(driver_pids)
+    except threading.BrokenBarrierError:
+        raise RuntimeError(f"Не удалось открыть контексты: {errors}")
+    finally:
+        measured.set()
+        for thread in threads:
+            thread.join()
+        pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--chrome", default=browser_helper.CHROME_PATH)
+    parser.add_argument("--chromedriver", default=browser_helper.CHROME_DRIVER_PATH)
+    args = parser.parse_args()
+
+    browser_helper.CHROME_PATH = args.chrome
+    browser_helper.CHROME_DRIVER_PATH = args.chromedriver
+    browser_options = {'headless': args.headless}
+
+    print(f"Одновременных выполнений: {args.concurrency}")
+    for name, run in (("процесс", run_processes), ("контексты", run_contexts)):
+        rss = run(browser_options, args.concurrency)
+        print(f"{name:>9}: RSS всего={rss / 2 ** 20:7.1f}MB  "
+              f"на выполнение={rss / args.concurrency / 2 ** 20:6.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
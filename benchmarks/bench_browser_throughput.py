@@ -0,0 +1,109 @@
+# benchmarks/bench_browser_throughput.py
+"""
+Бенчмарк пропускной способности выполнений с браузером: страниц в секунду.
+
+«Процесс»: у каждого выполнения свой Chrome и ChromeDriver (BrowserSessionPool).
+«Контексты»: выполнения работают в изолированных контекстах одного Chrome
+(BrowserContextPool).
+
+Страницы отдаёт локальный HTTP-сервер с задержкой ответа --latency
+(имитация сетевого ожидания). Для каждого числа одновременных выдач из
+--leases выдачи загружают по --pages страниц; выводятся страниц в секунду —
+при независимых выдачах они растут с числом выдач, а не упираются в одну
+очередь команд. Нужен Chrome и ChromeDriver (пути — аргументами).
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_browser_throughput --leases 1 2 4 8 --headless
+"""
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.utils import browser_helper
+
+PAGE_BODY = ("<html><body><h1>SEORADAR</h1><p>" + "текст " * 2000 + "</p></body></html>").encode("utf-8")
+
+
+def start_server(latency):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(PAGE_BODY)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(PAGE_BODY)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(pool, base_url, leases, pages):
+    errors = []
+
+    def execution(number):
+        try:
+            with pool.lease() as driver:
+                for page in range(pages):
+                    driver.get(f"{base_url}/{number}/{page}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=execution, args=(n,)) for n in range(leases)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if errors:
+        raise RuntimeError(f"Ошибки выдач: {errors[:3]}")
+    return leases * pages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--leases", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--chrome", default=browser_helper.CHROME_PATH)
+    parser.add_argument("--chromedriver", default=browser_helper.CHROME_DRIVER_PATH)
+    args = parser.parse_args()
+
+    browser_helper.CHROME_PATH = args.chrome
+    browser_helper.CHROME_DRIVER_PATH = args.chromedriver
+    browser_options = {'headless': args.headless}
+    server = start_server(args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"Задержка ответа {args.latency} с, страниц на выдачу {args.pages}")
+    try:
+        for leases in args.leases:
+            sessions = browser_helper.BrowserSessionPool(
+                lambda: browser_helper.create_driver(browser_options), max_sessions=leases)
+            contexts = browser_helper.BrowserContextPool(browser_options, max_contexts=leases)
+            try:
+                results = {}
+                for name, pool in (("процесс", sessions), ("контексты", contexts)):
+                    run(pool, base_url, leases, 1)  # Прогрев: браузеры и подключения запущены до замера
+                    results[name] = run(pool, base_url, leases, args.pages)
+            finally:
+                sessions.close()
+                contexts.close()
+            print(f"выдач {leases:3d}: " + "  ".join(
+                f"{name} {rate:6.2f} стр/с" for name, rate in results.items()))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_http_fetch.py
+"""
+Бенчмарк HTTP-бэкенда получения страниц на локальном сервере.
+
+«Без пула»: каждый запрос открывает новое соединение (urllib.request),
+ответ не сжимается.
+«HttpFetcher»: пул keep-alive соединений и сжатие gzip.
+
+Сервер отдаёт обычную страницу (/page) и пустую оболочку SPA (/spa);
+дополнительно проверяется, что правило requires_browser срабатывает
+только для оболочки.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_http_fetch --requests 2000 --threads 8
+"""
+
+import argparse
+import gzip
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.utils.http_fetcher import HttpFetcher, requires_browser
+
+PAGE = ("<html><head><title>Страница</title></head><body><h1>Заголовок</h1><p>"
+        + "Текст страницы для проверки SEO. " * 300 + "</p></body></html>").encode("utf-8")
+SPA = (b"<html><head><title>App</title></head><body><div id=\"root\"></div>"
+       b"<script src=\"/app.js\"></script></body></html>")
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    # Заголовки и тело пишутся отдельно: без TCP_NODELAY keep-alive упирается в задержку ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = SPA if self.path == "/spa" else PAGE
+        encoding = None
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            encoding = "gzip"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def fetch_without_pool(url):
+    with urllib.request.urlopen(url) as response:
+        return response.status, len(response.read())
+
+
+def run_case(name, fetch, url, requests, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        results = list(executor.map(lambda _: fetch(url), range(requests)))
+    elapsed = time.perf_counter() - start
+    print(f"{name:>12}: {requests / elapsed:8.0f} запросов/с  ({elapsed:.2f} с)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    fetcher = HttpFetcher(max_connections_per_host=args.threads, max_concurrency=args.threads)
+    page = fetcher.fetch(base_url + "/page")
+    spa = fetcher.fetch(base_url + "/spa")
+    assert page.html.encode("utf-8") == PAGE, "Страница распакована неверно"
+    assert not requires_browser(page), "Обычная страница не должна требовать браузера"
+    assert requires_browser(spa), "Оболочка SPA должна требовать браузера"
+    print("Проверки: gzip распакован, правило перехода на браузер срабатывает только для /spa")
+
+    run_case("без пула", fetch_without_pool, base_url + "/page", args.requests, args.threads)
+    run_case("HttpFetcher", lambda url: fetcher.fetch(url).status, base_url + "/page",
+             args.requests, args.threads)
+    fetcher.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
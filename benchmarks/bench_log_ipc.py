@@ -0,0 +1,136 @@
+# benchmarks/bench_log_ipc.py
+"""
+Бенчмарк передачи записей лога из процессов пула в главный процесс.
+
+«Queue»: прежняя схема — QueueHandler в процессе и общая
+multiprocessing.Queue (сериализация и запись в канал на каждую запись).
+«Pipe»: PipeLogTransport — PipeLogHandler копит записи в ограниченном
+буфере и отправляет пакетами по собственному каналу процесса.
+
+Пропускная способность: --workers процессов пишут по --records записей,
+главный процесс забирает их так же, как QueueListener (get и обработка
+LogRecord). Измеряется время до получения последней записи.
+
+Медленный получатель: главный процесс не читает --stall секунд, пока
+процессы пишут. Для Queue записи копятся в буфере потока-фидера процесса
+без ограничения, для Pipe — не больше capacity записей (block ждёт, drop-*
+отбрасывают). Выводится прирост RSS процессов и число полученных записей.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_log_ipc --workers 8 --records 50000
+"""
+
+import argparse
+import logging
+import logging.handlers
+import multiprocessing
+import multiprocessing.queues
+import queue
+import time
+
+import psutil
+
+from app.utils.log_transport import OVERFLOW_POLICIES, PipeLogHandler, PipeLogTransport
+
+
+def _produce(target, count, ready):
+    logger = logging.getLogger()
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    if isinstance(target, multiprocessing.queues.Queue):
+        handler = logging.handlers.QueueHandler(target)
+    else:
+        handler = PipeLogHandler(target)
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    ready.wait()
+    for i in range(count):
+        logger.info(f"Процесс {multiprocessing.current_process().name}: запись {i} "
+                    f"https://example.org/page/{i % 1000}")
+    # Дожидаемся отправки всего буфера, как flush_worker_logging
+    handler.flush()
+    if isinstance(target, multiprocessing.queues.Queue):
+        target.close()
+        target.join_thread()
+
+
+def _start(transport, workers, records):
+    ready = multiprocessing.Event()
+    processes = []
+    for n in range(workers):
+        target = transport.open_channel() if isinstance(transport, PipeLogTransport) else transport
+        p = multiprocessing.Process(target=_produce, args=(target, records, ready), name=str(n + 1))
+        p.start()
+        if target is not transport:
+            target.close()
+        processes.append(p)
+    return ready, processes
+
+
+def _drain(transport, expected, idle_timeout):
+    # Записи, отброшенные политикой переполнения, не придут: ждём до паузы idle_timeout
+    received = 0
+    while received < expected:
+        try:
+            record = transport.get(True, idle_timeout)
+        except queue.Empty:
+            break
+        record.getMessage()  # Обработка записи, как в QueueListener.handle
+        received += 1
+    return received
+
+
+def throughput(name, transport, workers, records):
+    ready, processes = _start(transport, workers, records)
+    time.sleep(0.5)  # Процессы запущены и ждут сигнала
+    started = time.perf_counter()
+    ready.set()
+    received = _drain(transport, workers * records, idle_timeout=10)
+    elapsed = time.perf_counter() - started
+    for p in processes:
+        p.join()
+    print(f"{name:>18}: {received:8d} записей за {elapsed:6.2f} с — {received / elapsed:9.0f} записей/с")
+
+
+def slow_consumer(name, transport, workers, records, stall):
+    ready, processes = _start(transport, workers, records)
+    time.sleep(0.5)
+    children = [psutil.Process(p.pid) for p in processes]
+    base_rss = sum(child.memory_info().rss for child in children)
+    ready.set()
+    peak_rss = base_rss
+    stall_until = time.monotonic() + stall
+    while time.monotonic() < stall_until:
+        try:
+            peak_rss = max(peak_rss, sum(child.memory_info().rss for child in children))
+        except psutil.NoSuchProcess:
+            pass
+        time.sleep(0.05)
+    received = _drain(transport, workers * records, idle_timeout=2)
+    for p in processes:
+        p.join()
+    print(f"{name:>18}: прирост RSS процессов {(peak_rss - base_rss) / 2**20:7.1f} МБ, "
+          f"получено {received} из {workers * records}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--records", type=int, default=50_000)
+    parser.add_argument("--stall", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print("Пропускная способность:")
+    throughput("Queue", multiprocessing.Queue(), args.workers, args.records)
+    throughput("Pipe", PipeLogTransport(), args.workers, args.records)
+
+    print(f"Медленный получатель (пауза {args.stall} с):")
+    slow_consumer("Queue", multiprocessing.Queue(), args.workers, args.records, args.stall)
+    for overflow in OVERFLOW_POLICIES:
+        slow_consumer(f"Pipe {overflow}", PipeLogTransport(overflow=overflow),
+                      args.workers, args.records, args.stall)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/bench_log_search.py
+"""
+Бенчмарк поиска текста по истории логов.
+
+«Перебор»: прежняя схема filter_logs — search_text in message.lower() для
+каждой записи. «Индекс»: filter_rows с LogSearchIndex — кандидаты из самой
+короткой очереди триграмм запроса с проверкой подстроки; записи старше
+окна индекса (--window последних) перебираются.
+
+История заполняется с вытеснением (2 × capacity записей), затем для
+каждого запроса сравниваются результаты и время — по всей истории и за
+последние 10 минут. Также выводятся прирост RSS, размер индекса и
+стоимость его ведения при добавлении.
+
+Ёмкость по умолчанию — как у вкладки логов (LogTab.MAX_LOGS). Запуск из
+корня репозитория:
+
+    python -m benchmarks.bench_log_search --capacity 1000000
+"""
+
+import argparse
+import gc
+import random
+import time
+
+import psutil
+
+from app.design.LogTab.LogFilters import filter_rows
+from app.design.LogTab.LogSearchIndex import DEFAULT_WINDOW, LogSearchIndex
+from app.design.LogTab.LogStore import LogStore
+
+# Как LogTab.MAX_LOGS (модуль вкладки не импортируется, чтобы не тянуть Qt)
+APP_CAPACITY = 1_000_000
+
+TASKS = ["Открыть браузер", "Проверка SEO", "Сбор ссылок", "Скриншот"]
+EVENTS = ["начал выполнение задачи", "завершил задачу", "получил отмену", "ожидание страницы"]
+QUERIES = ["процесс 17:", "скриншот", "timeout 30", "ошибка https://example.org/page/4242", "ожидание"]
+
+
+def make_entries(count, seed=1):
+    rng = random.Random(seed)
+    base = 1_700_000_000  # Одинаковое время в обоих хранилищах
+    for i in range(count):
+        if rng.random() < 0.01:
+            message = (f"Процесс {rng.randrange(50)}: ошибка https://example.org/page/{rng.randrange(10000)}: "
+                       f"Timeout {rng.choice([10, 30, 60])} с")
+        else:
+            message = (f"Процесс {rng.randrange(50)}: {rng.choice(EVENTS)} "
+                       f"«{rng.choice(TASKS)}» (выполнение {i})")
+        yield base + i // 1000, "INFO", message
+
+
+def fill(store, count):
+    batch = []
+    for entry in make_entries(count):
+        batch.append(entry)
+        if len(batch) == 500:
+            store.extend(batch)
+            batch = []
+    store.extend(batch)
+
+
+def scan(store, text, start=None):
+    text = text.lower()
+    return [store.first_seq + row for row, (timestamp, _, message) in enumerate(store)
+            if (start is None or timestamp >= start) and text in message.lower()]
+
+
+def filled_store(capacity, search_index):
+    gc.collect()
+    rss_before = psutil.Process().memory_info().rss
+    store = LogStore(capacity, search_index)
+    started = time.perf_counter()
+    fill(store, 2 * capacity)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    return store, 2 * capacity / elapsed, psutil.Process().memory_info().rss - rss_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--capacity", type=int, default=APP_CAPACITY)
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW)
+    args = parser.parse_args()
+
+    plain, plain_rate, plain_rss = filled_store(args.capacity, None)
+    indexed, indexed_rate, indexed_rss = filled_store(args.capacity, LogSearchIndex(args.window))
+
+    index = indexed.search_index
+    print(f"Ёмкость {args.capacity}, окно индекса {args.window}")
+    print(f"Добавление: без индекса {plain_rate:8.0f} записей/с, с индексом {indexed_rate:8.0f} записей/с")
+    print(f"RSS: без индекса {plain_rss / 2**20:6.0f} МБ, с индексом {indexed_rss / 2**20:6.0f} МБ")
+    print(f"Индекс: {len(index.postings)} триграмм, {index.postings_count} ссылок, "
+          f"очереди {index.memory_size() / 2**20:.0f} МБ")
+
+    # Последние 10 минут истории (1000 записей в секунду)
+    recent = plain.timestamp_at(len(plain) - 1) - 600
+    for query in QUERIES:
+        for label, start in (("вся история", None), ("10 минут", recent)):
+            started = time.perf_counter()
+            expected = scan(plain, query, start)
+            scan_elapsed = time.perf_counter() - started
+            started = time.perf_counter()
+            found = filter_rows(indexed, "Все", query.lower(), start, None)
+            index_elapsed = time.perf_counter() - started
+            assert found == expected, f"Результаты поиска «{query}» не совпадают"
+            print(f"«{query}» ({label}): найдено {len(found):7d}, перебор {scan_elapsed * 1000:8.1f} мс, "
+                  f"индекс {index_elapsed * 1000:8.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/bench_log_store.py
+"""
+Бенчмарк хранения истории логов.
+
+«Список словарей»: прежняя схема LogTabLogic — словарь из трёх строк на
+запись, обрезка через del logs[:excess] после каждого пакета.
+«LogStore»: кольцевой буфер с временем в array('q') и кодами уровней.
+
+Оба хранилища получают 2 × capacity записей пакетами по 500 (вторая
+половина — с вытеснением); записи создаются по ходу, поэтому в память
+после заполнения (tracemalloc) входят и тексты сообщений. Измеряются
+записи в секунду, включая создание записей, одинаковое для обоих случаев.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_log_store --capacity 1000000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+
+from app.design.LogTab.LogStore import LogStore
+
+LEVELS = ["DEBUG", "INFO", "INFO", "WARNING", "ERROR"]
+BATCH_SIZE = 500
+
+
+def make_batches(count, as_text=False):
+    """
+    :param as_text: Время строкой "YYYY-MM-DD HH:MM:SS", как в прежней схеме.
+    """
+    base = int(time.time())
+    timestamp_text = {}
+    batch = []
+    for i in range(count):
+        timestamp = base + i // 1000
+        if as_text:
+            if timestamp not in timestamp_text:
+                timestamp_text = {timestamp: datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')}
+            timestamp = timestamp_text[timestamp]
+        batch.append((timestamp, LEVELS[i % len(LEVELS)],
+                      f"Процесс {i % 50}: выполнил шаг {i} задачи «Открыть браузер»."))
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class DictList:
+    """
+    Прежняя схема хранения.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.logs = []
+
+    def extend(self, entries):
+        self.logs.extend(
+            {'timestamp': timestamp, 'log_type': log_type, 'message': message}
+            for timestamp, log_type, message in entries)
+        if len(self.logs) > self.capacity:
+            del self.logs[:len(self.logs) - self.capacity]
+
+    def __len__(self):
+        return len(self.logs)
+
+
+def run_case(name, factory, capacity, as_text=False):
+    gc.collect()
+    store = factory(capacity)
+    started = time.perf_counter()
+    for batch in make_batches(capacity, as_text):
+        store.extend(batch)
+    fill_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    for batch in make_batches(capacity, as_text):
+        store.extend(batch)
+    evict_elapsed = time.perf_counter() - started
+    assert len(store) == capacity
+    del store
+
+    # Память измеряется отдельным заполнением: tracemalloc замедляет выделения
+    gc.collect()
+    tracemalloc.start()
+    store = factory(capacity)
+    for batch in make_batches(capacity, as_text):
+        store.extend(batch)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"{name:>16}: заполнение {capacity / fill_elapsed:10.0f} записей/с, "
+          f"с вытеснением {capacity / evict_elapsed:10.0f} записей/с, "
+          f"память {memory / 2**20:7.1f} МБ ({memory / capacity:.0f} Б на запись)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--capacity", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    run_case("список словарей", DictList, args.capacity, as_text=True)
+    run_case("LogStore", LogStore, args.capacity)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/bench_log_transport.py
+"""
+Бенчмарк доставки записей лога из потока QueueListener во вкладку логов.
+
+«По записи»: прежний обработчик, один межпоточный сигнал new_log на запись.
+«Пакетами»: QtLogHandler, сигнал new_logs раз в 50 мс или на 500 записей.
+
+Записи принимает настоящий LogTab (его таймер отрисовки остановлен, чтобы
+измерялась только доставка). Измеряется процессорное время GUI-потока
+(time.thread_time) и полное время доставки в пересчёте на 100 000 записей.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_log_transport --records 100000
+"""
+
+import argparse
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QTimer  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from app.design.LogTab.LogTab import LogTab  # noqa: E402
+from app.utils.logger_config import LogEmitter  # noqa: E402
+from app.utils.qt_log_handler import QtLogHandler  # noqa: E402
+
+
+class PerRecordHandler(logging.Handler):
+    """
+    Прежняя схема: сигнал на каждую запись.
+    """
+
+    def __init__(self, emitter):
+        super().__init__()
+        self.emitter = emitter
+
+    def emit(self, record):
+        self.emitter.new_log.emit(
+            time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record.created)),
+            record.levelname, record.getMessage())
+
+
+def run_case(app, name, make_handler, records):
+    tab = LogTab()
+    tab.logic.log_timer.stop()
+    emitter = LogEmitter()
+    emitter.new_log.connect(tab.add_log)
+    emitter.new_logs.connect(tab.add_logs)
+    handler = make_handler(emitter)
+
+    log_queue = queue.SimpleQueue()
+    for i in range(records):
+        log_queue.put(logging.LogRecord(
+            "bench", logging.DEBUG, __file__, 0, "Процесс %d: шаг %d", (i % 50, i), None))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+
+    def check_done():
+        if len(tab.logic.pending_logs) >= records:
+            app.quit()
+
+    timer = QTimer()
+    timer.timeout.connect(check_done)
+    timer.start(5)
+
+    started = time.perf_counter()
+    cpu_started = time.thread_time()
+    listener.start()
+    app.exec()
+    gui_cpu = time.thread_time() - cpu_started
+    elapsed = time.perf_counter() - started
+    listener.stop()
+    handler.close()
+    timer.stop()
+
+    scale = 100_000 / records
+    print(f"{name:>10}: GUI-поток {gui_cpu * scale:6.3f} с ЦП на 100k записей, "
+          f"доставка {elapsed * scale:6.3f} с на 100k записей")
+    tab.deleteLater()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=100_000)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    run_case(app, "по записи", PerRecordHandler, args.records)
+    run_case(app, "пакетами", QtLogHandler, args.records)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# benchmarks/bench_supervision.py
+"""
+Бенчмарк супервизора пула процессов.
+
+Сравнивает прежнюю схему (опрос раз в 100 мс) и событийную (блокирующее
+ожидание sentinel/каналов) на 100 слотах. Измеряются:
+
+* задержка перезаполнения слота — интервал между записью
+  «все задачи завершены» и следующей «начал выполнение задач» того же процесса;
+* процессорное время потока супервизора (time.thread_time).
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_supervision --slots 100 --rounds 5
+"""
+
+import argparse
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+
+from app.Logic.WorkerPool import WorkerPool
+
+BENCH_TASK = '''
+import time
+
+
+class Task:
+    def __init__(self, shared_resources, process_number, log_queue, log_helper=None, settings=None):
+        self.process_number = process_number
+
+    def get_task_name(self):
+        return "Бенчмарк"
+
+    def run(self):
+        time.sleep({duration})
+'''
+
+
+class _RecordCollector(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.finished = defaultdict(list)  # process_number -> [created]
+        self.started = defaultdict(list)
+
+    def emit(self, record):
+        message = record.getMessage()
+        if not message.startswith("Процесс "):
+            return
+        number, _, text = message[len("Процесс "):].partition(":")
+        if "начал выполнение задач" in text:
+            self.started[int(number)].append(record.created)
+        elif "все задачи завершены" in text:
+            self.finished[int(number)].append(record.created)
+
+    def refill_latencies(self):
+        latencies = []
+        for number, finished in self.finished.items():
+            started = self.started[number]
+            # Выполнение k завершилось -> выполнение k+1 началось
+            for done, nxt in zip(finished, started[1:]):
+                latencies.append(nxt - done)
+        return latencies
+
+
+def _supervise(pool, total, polling):
+    submitted = 0
+    completed = 0
+    cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+    while completed < total:
+        while pool.has_idle_slot() and submitted < total:
+            submitted += 1
+            pool.submit(submitted, ["Бенчмарк"])
+        if polling:
+            completed += len(pool.poll(0))
+            time.sleep(0.1)
+        else:
+            completed += len(pool.poll())
+    return time.thread_time() - cpu_start, time.perf_counter() - wall_start
+
+
+def run_case(tasks_directory, slots, rounds, polling):
+    log_queue = multiprocessing.Queue()
+    collector = _RecordCollector()
+    listener = logging.handlers.QueueListener(log_queue, collector)
+    listener.start()
+
+    pool = WorkerPool(slots, log_queue, tasks_directory)
+    pool.start()
+    try:
+        cpu, wall = _supervise(pool, slots * rounds, polling)
+    finally:
+        pool.shutdown()
+        listener.stop()
+
+    latencies = collector.refill_latencies()
+    name = "опрос 100 мс" if polling else "событийный"
+    print(f"{name:>14}: wall={wall:6.2f}s  cpu супервизора={cpu * 1000:7.1f}ms  "
+          f"задержка перезаполнения: медиана={statistics.median(latencies) * 1000:6.1f}ms "
+          f"p95={statistics.quantiles(latencies, n=20)[-1] * 1000:6.1f}ms "
+          f"max={max(latencies) * 1000:6.1f}ms (n={len(latencies)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--slots", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--duration", type=float, default=0.2,
+                        help="Длительность одной задачи в секундах")
+    args = parser.parse_args()
+
+    # Без обработчиков logging.info() в супервизоре вызвал бы basicConfig()
+    logging.getLogger().addHandler(logging.NullHandler())
+
+    with tempfile.TemporaryDirectory() as tasks_directory:
+        task_dir = os.path.join(tasks_directory, "Bench")
+        os.makedirs(task_dir)
+        with open(os.path.join(task_dir, "task.py"), "w", encoding="utf-8") as f:
+            f.write(BENCH_TASK.format(duration=args.duration))
+
+        print(f"Слотов: {args.slots}, выполнений: {args.slots * args.rounds}, "
+              f"длительность задачи: {args.duration}s")
+        run_case(tasks_directory, args.slots, args.rounds, polling=True)
+        run_case(tasks_directory, args.slots, args.rounds, polling=False)
+
+
+if __name__ == "__main__":
+    main()
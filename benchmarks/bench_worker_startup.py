@@ -0,0 +1,76 @@
+# benchmarks/bench_worker_startup.py
+"""
+Бенчмарк запуска дочернего процесса пула при методе spawn.
+
+«До»: дочерний процесс загружает граф модулей прежнего main.py (PySide6,
+MainWindow, logger_config) и TaskManager — так происходило, когда main.py
+импортировал интерфейс на верхнем уровне.
+«После»: дочерний процесс загружает только app.Logic.worker_entry.
+
+Для каждого варианта измеряются время от Process.start() до готовности
+процесса, время импортов внутри процесса и RSS после импортов.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_worker_startup --children 10
+"""
+
+import argparse
+import importlib
+import multiprocessing
+import statistics
+import time
+
+BEFORE_MODULES = [
+    "PySide6.QtWidgets",
+    "app.utils.logger_config",
+    "app.design.MainWindow",
+    "app.design.TaskManager",
+]
+AFTER_MODULES = [
+    "app.Logic.worker_entry",
+]
+
+
+def _child(modules, result_queue):
+    import psutil
+
+    start = time.perf_counter()
+    for name in modules:
+        importlib.import_module(name)
+    import_time = time.perf_counter() - start
+    rss = psutil.Process().memory_info().rss
+    result_queue.put((import_time, rss))
+
+
+def run_case(ctx, name, modules, children):
+    result_queue = ctx.Queue()
+    startup, imports, rss = [], [], []
+    for _ in range(children):
+        start = time.perf_counter()
+        p = ctx.Process(target=_child, args=(modules, result_queue))
+        p.start()
+        import_time, child_rss = result_queue.get()
+        startup.append(time.perf_counter() - start)
+        imports.append(import_time)
+        rss.append(child_rss)
+        p.join()
+
+    print(f"{name:>6}: старт процесса медиана={statistics.median(startup) * 1000:7.1f}ms  "
+          f"импорты медиана={statistics.median(imports) * 1000:7.1f}ms  "
+          f"RSS медиана={statistics.median(rss) / 2 ** 20:6.1f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--children", type=int, default=10)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    print(f"Метод запуска: spawn, процессов на вариант: {args.children}")
+    run_case(ctx, "до", BEFORE_MODULES, args.children)
+    run_case(ctx, "после", AFTER_MODULES, args.children)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,17 +4,23 @@ import sys
 import logging
 import multiprocessing
 import signal
-from PySide6.QtWidgets import QApplication
-from logging.handlers import QueueHandler
-from app.design.MainWindow import MainWindow
-from app.utils.logger_config import setup_logging, LogEmitter
+
+# PySide6 и модули интерфейса импортируются внутри main(): при методе запуска
+# spawn дочерние процессы заново выполняют этот модуль как __mp_main__, и
+# импорты верхнего уровня загружали бы Qt в каждый процесс пула.
 
 
 def main():
     multiprocessing.freeze_support()  # Необходимо для Windows
 
-    # Создание очереди для логирования
-    log_queue = multiprocessing.Queue()
+    from PySide6.QtWidgets import QApplication
+    from app.design.MainWindow import MainWindow
+    from app.utils.logger_config import setup_logging, LogEmitter
+    from app.utils.log_transport import PipeLogTransport
+
+    # Транспорт логов: процессы пула пишут пакетами в собственные каналы с
+    # ограниченным буфером, записи главного процесса передаются напрямую
+    log_queue = PipeLogTransport()
 
     # Создание эмиттера для логов в GUI
     log_emitter = LogEmitter()
@@ -49,6 +55,7 @@ def main():
         sys.exit(app.exec())
     finally:
         listener.stop()
+        log_queue.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,39 @@
+# tests/support.py
+
+import os
+import shutil
+import tempfile
+
+
+def make_tasks_directory(test_case):
+    """
+    Создаёт временную директорию задач, удаляемую после теста.
+
+    :param test_case: unittest.TestCase, которому добавляется очистка.
+    :return: Путь к директории.
+    """
+    tasks_directory = tempfile.mkdtemp()
+    test_case.addCleanup(shutil.rmtree, tasks_directory, ignore_errors=True)
+    return tasks_directory
+
+
+def write_task(tasks_directory, task_dir, code, manifest=None, files=None):
+    """
+    Пишет плагин задачи: task.py, при необходимости manifest.yaml и другие файлы.
+
+    :param tasks_directory: Директория задач.
+    :param task_dir: Имя директории плагина.
+    :param code: Текст task.py.
+    :param manifest: Текст manifest.yaml (None — без манифеста).
+    :param files: Словарь {имя файла: текст} дополнительных файлов плагина.
+    :return: Путь к директории плагина.
+    """
+    path = os.path.join(tasks_directory, task_dir)
+    os.makedirs(path, exist_ok=True)
+    contents = {"task.py": code, **(files or {})}
+    if manifest is not None:
+        contents["manifest.yaml"] = manifest
+    for name, text in contents.items():
+        with open(os.path.join(path, name), "w", encoding="utf-8") as f:
+            f.write(text)
+    return path
@@ -0,0 +1,94 @@
+# tests/test_browser_context_pool.py
+
+import itertools
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from app.utils.browser_helper import BrowserContextPool
+
+PAGE_LOAD_TIME = 0.3
+
+
+class FakeChrome:
+    """
+    Подключение ChromeDriver: команды одной сессии выполняются по очереди.
+    """
+
+    ids = itertools.count()
+
+    def __init__(self, service=None, options=None):
+        self.service = None
+        self.lock = threading.Lock()
+        self.window = "initial"
+        self.switch_to = SimpleNamespace(window=self._switch)
+        self.quit = mock.Mock()
+
+    def _switch(self, handle):
+        self.window = handle
+
+    def execute_cdp_cmd(self, command, params):
+        with self.lock:
+            if command == "Target.createTarget":
+                return {"targetId": f"target-{next(self.ids)}"}
+            if command == "Target.createBrowserContext":
+                return {"browserContextId": f"context-{next(self.ids)}"}
+            return {}
+
+    def get(self, url):
+        with self.lock:
+            time.sleep(PAGE_LOAD_TIME)
+
+
+class BrowserContextPoolTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("app.utils.browser_helper.webdriver.Chrome", FakeChrome)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = BrowserContextPool(max_contexts=4, debugger_address="127.0.0.1:9222")
+        self.addCleanup(self.pool.close)
+
+    def load_pages(self, leases):
+        windows = []
+
+        def execution():
+            with self.pool.lease() as driver:
+                driver.get("https://example.org/")
+                windows.append(driver.window)
+
+        threads = [threading.Thread(target=execution) for _ in range(leases)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.monotonic() - started, windows
+
+    def test_leases_load_pages_concurrently(self):
+        elapsed, windows = self.load_pages(4)
+        # Загрузки разных выдач не ждут друг друга
+        self.assertLess(elapsed, PAGE_LOAD_TIME * 2)
+        self.assertEqual(len(set(windows)), 4)
+        self.assertEqual(self.pool.stats()['drivers'], 4)
+
+    def test_drivers_are_reused_and_return_to_anchor(self):
+        self.load_pages(4)
+        self.load_pages(4)
+        self.assertEqual(self.pool.stats()['drivers'], 4)
+        self.assertEqual(self.pool.leases, 8)
+        for driver, (anchor, _) in self.pool.drivers.items():
+            self.assertEqual(driver.window, anchor)
+
+    def test_close_quits_drivers(self):
+        self.load_pages(2)
+        drivers = list(self.pool.drivers)
+        self.pool.close()
+        self.assertEqual(self.pool.drivers, {})
+        for driver in drivers:
+            driver.quit.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+# tests/test_cancellation.py
+
+import asyncio
+import threading
+import time
+import unittest
+
+from app.utils.cancellation import CancellationToken
+
+
+class CancellationTokenAsyncTest(unittest.TestCase):
+    def test_wait_async_does_not_leave_threads(self):
+        token = CancellationToken()
+        threads = threading.active_count()
+        # Как TaskManager.execute_task: новый цикл asyncio на каждое выполнение
+        for _ in range(20):
+            self.assertFalse(asyncio.run(token.wait_async(0.001)))
+        self.assertEqual(threading.active_count(), threads)
+        self.assertEqual(token._waiters, set())
+
+    def test_cancel_from_another_thread_wakes_waiters(self):
+        token = CancellationToken()
+
+        async def wait_all():
+            return await asyncio.gather(*(token.wait_async(10) for _ in range(100)))
+
+        timer = threading.Timer(0.1, token.cancel)
+        timer.start()
+        started = time.monotonic()
+        results = asyncio.run(wait_all())
+        timer.join()
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertTrue(all(results))
+        self.assertEqual(token._waiters, set())
+
+    def test_wait_after_cancel_returns_at_once(self):
+        token = CancellationToken()
+        token.cancel()
+        self.assertTrue(asyncio.run(token.wait_async()))
+
+    def test_closed_loop_drops_waiter(self):
+        token = CancellationToken()
+
+        async def abandon():
+            asyncio.get_running_loop().create_task(token.wait_async())
+            await asyncio.sleep(0)
+
+        # asyncio.run отменяет незавершённое ожидание при закрытии цикла
+        asyncio.run(abandon())
+        self.assertEqual(token._waiters, set())
+        token.cancel()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# tests/test_concurrency_controller.py
+
+import unittest
+
+from app.Logic.ConcurrencyController import ConcurrencyController
+
+GB = 2 ** 30
+
+
+class StubController(ConcurrencyController):
+    """
+    Контроллер с подставленными замерами системы и дерева процессов.
+    """
+
+    def __init__(self, system, tree, cpu_count=4, **kwargs):
+        super().__init__(sample_interval=0, cooldown=0, **kwargs)
+        self._cpu_count = cpu_count
+        self.system = system  # (CPU %, память %, объём памяти)
+        self.tree = tree  # (CPU % дерева, RSS дерева)
+
+    def sample_system(self):
+        return self.system
+
+    def sample_tree(self, root_pids):
+        return self.tree
+
+
+class ConcurrencyControllerTest(unittest.TestCase):
+    def test_grows_when_slot_cost_fits_thresholds(self):
+        # Слот: 50% одного ядра из 4 и 1 ГБ из 16 ГБ
+        controller = StubController((30.0, 40.0, 16 * GB), (100.0, 2 * GB), min_slots=2, max_slots=8)
+        self.assertEqual(controller.update([]), 3)
+
+    def test_rss_budget_blocks_growth(self):
+        # Память ниже нижнего порога, но ещё один слот (4 ГБ из 16 ГБ) вывел бы её за верхний
+        controller = StubController((30.0, 65.0, 16 * GB), (100.0, 8 * GB), min_slots=2, max_slots=8)
+        self.assertIsNone(controller.update([]))
+        self.assertEqual(controller.target, 2)
+
+    def test_cpu_share_blocks_growth(self):
+        # Слот занимает полтора ядра из 4: 50% + 37.5% > cpu_high
+        controller = StubController((50.0, 40.0, 16 * GB), (300.0, 2 * GB), min_slots=2, max_slots=8)
+        self.assertIsNone(controller.update([]))
+
+    def test_shrinks_above_high_threshold(self):
+        controller = StubController((95.0, 40.0, 16 * GB), (300.0, 2 * GB), min_slots=1, max_slots=8)
+        controller.target = 4
+        self.assertEqual(controller.update([]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+# tests/test_execution_runner.py
+
+import logging
+import logging.handlers
+import multiprocessing
+import threading
+import time
+import unittest
+from unittest import mock
+
+from app.Logic.ExecutionRunner import ExecutionRunner
+from tests.support import make_tasks_directory, write_task
+
+TASK_NAME = "Тестовая задача"
+
+TASK_CODE = '''
+from app.utils.cancellation import CancellationToken
+
+
+class Task:
+    def __init__(self, shared_resources, process_number, log_queue, log_helper=None, settings=None):
+        self.cancel_token = CancellationToken()
+
+    def get_task_name(self):
+        return "{name}"
+
+    def run(self):
+        self.cancel_token.wait({duration})
+        self.cancel_token.raise_if_cancelled()
+'''
+
+
+class ExecutionRunnerTest(unittest.TestCase):
+    """
+    Запуск настоящего пула процессов на задаче, которая ждёт duration секунд
+    (ожидание прерывается отменой) и завершается ошибкой, если получила отмену.
+    """
+
+    def setUp(self):
+        self.tasks_directory = make_tasks_directory(self)
+        self.log_queue = multiprocessing.Queue()
+        self.listener = logging.handlers.QueueListener(self.log_queue, logging.NullHandler())
+        self.listener.start()
+
+    def tearDown(self):
+        self.listener.stop()
+
+    def start_runner(self, duration, execution_count, thread_count=2, **kwargs):
+        write_task(self.tasks_directory, "Test", TASK_CODE.format(name=TASK_NAME, duration=duration))
+        runner = ExecutionRunner(thread_count, [TASK_NAME], "Ограничение", execution_count,
+                                 self.tasks_directory, self.log_queue, **kwargs)
+        thread = threading.Thread(target=runner.run)
+        thread.start()
+        self.addCleanup(thread.join, 30)
+        return runner, thread
+
+    @staticmethod
+    def wait_until(predicate, timeout=15):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() > deadline:
+                raise AssertionError("Условие не выполнено за отведённое время")
+            time.sleep(0.01)
+
+    def test_stop_lets_execution_finish_before_deadline(self):
+        runner, thread = self.start_runner(duration=0.5, execution_count=2)
+        self.wait_until(lambda: runner.busy_count() == 2)
+        runner.stop(drain_timeout=10)
+        thread.join(30)
+        self.assertFalse(thread.is_alive())
+        # Выполнения доработали без отмены и завершились успешно
+        self.assertEqual(runner.executions_finished, 2)
+        self.assertEqual(runner.executions_failed, 0)
+        self.assertEqual(runner.stop_report['interrupted'], 0)
+        self.assertEqual(runner.stop_report['workers_killed'], 0)
+
+    def test_stop_cancels_at_deadline(self):
+        runner, thread = self.start_runner(duration=5, execution_count=2)
+        self.wait_until(lambda: runner.busy_count() == 2)
+        runner.stop(drain_timeout=0.2)
+        thread.join(30)
+        self.assertFalse(thread.is_alive())
+        # Задачи прервали ожидание по отмене, процессы не добивались
+        self.assertLess(runner.stop_report['latency'], 1.0)
+        self.assertEqual(runner.stop_report['workers_killed'], 0)
+        self.assertEqual(runner.executions_finished, 2)
+        self.assertEqual(runner.executions_failed, 2)
+
+    def test_runs_with_connection_wait(self):
+        # Путь Windows: события пулов ждёт multiprocessing.connection.wait
+        with mock.patch("app.Logic.WorkerPool.USE_SELECTOR", False):
+            runner, thread = self.start_runner(duration=0.1, execution_count=4)
+            thread.join(30)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(runner._waiter.use_selector)
+        self.assertEqual(runner.executions_finished, 4)
+        self.assertEqual(runner.executions_failed, 0)
+
+    def test_pause_applies_while_draining_last_executions(self):
+        # Все запуски выданы сразу: пауза приходится на ожидание последних выполнений
+        runner, thread = self.start_runner(duration=0.5, execution_count=2)
+        self.wait_until(lambda: runner.executions_started == 2 and runner.busy_count() == 2)
+        runner.pause()
+        time.sleep(1.0)
+        self.assertEqual(runner.executions_finished, 0)
+        self.assertTrue(runner.resume())
+        thread.join(30)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(runner.executions_finished, 2)
+        self.assertGreater(runner.paused_seconds, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# tests/test_fetch_backend.py
+
+import asyncio
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+
+from app.design.TaskManager import TaskManager
+from app.utils.http_fetcher import FETCH_BROWSER, FETCH_HTTP, FetchResult
+from tests.support import make_tasks_directory, write_task
+
+TASK_CODE = '''
+from app.utils.browser_helper import BrowserHelper
+
+
+class Task:
+    def __init__(self, shared_resources, process_number, log_queue, log_helper=None, settings=None):
+        self.shared_resources = shared_resources
+
+    def get_task_name(self):
+        return "{name}"
+
+    {prefix}def run(self):
+        self.shared_resources.append(BrowserHelper().fetch_html("https://example.org/").backend)
+'''
+
+MANIFEST = '''name: "{name}"
+entry_point: "task:Task"
+resources:
+  fetch: {fetch}
+'''
+
+
+class FakeDriver:
+    current_url = "https://example.org/"
+    page_source = "<html></html>"
+
+    def get(self, url):
+        pass
+
+
+class FakeSessionPool:
+    @contextmanager
+    def lease(self, timeout=None):
+        yield FakeDriver()
+
+
+class FetchBackendTest(unittest.TestCase):
+    """
+    Способ получения страницы по умолчанию берётся из resources.fetch манифеста задачи.
+    """
+
+    def setUp(self):
+        self.tasks_directory = make_tasks_directory(self)
+        for task_dir, name, fetch, prefix in (("Browser", "Браузерная", FETCH_BROWSER, ""),
+                                              ("BrowserAsync", "Браузерная async", FETCH_BROWSER, "async "),
+                                              ("Http", "HTTP", FETCH_HTTP, "")):
+            write_task(self.tasks_directory, task_dir, TASK_CODE.format(name=name, prefix=prefix),
+                       manifest=MANIFEST.format(name=name, fetch=fetch))
+        self.task_manager = TaskManager(self.tasks_directory)
+
+        self.http_fetcher = mock.Mock()
+        self.http_fetcher.fetch.return_value = FetchResult(
+            "https://example.org/", 200, "<html>" + "текст " * 100 + "</html>",
+            headers={'Content-Type': 'text/html'})
+        for target, value in (("get_http_fetcher", mock.Mock(return_value=self.http_fetcher)),
+                              ("get_session_pool", mock.Mock(return_value=FakeSessionPool()))):
+            patcher = mock.patch(f"app.utils.browser_helper.{target}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_browser_task_skips_http(self):
+        backends = []
+        self.task_manager.execute_task("Браузерная", backends)
+        self.assertEqual(backends, [FETCH_BROWSER])
+        self.http_fetcher.fetch.assert_not_called()
+
+    def test_async_browser_task_skips_http(self):
+        backends = []
+        asyncio.run(self.task_manager.execute_task_async("Браузерная async", backends))
+        self.assertEqual(backends, [FETCH_BROWSER])
+        self.http_fetcher.fetch.assert_not_called()
+
+    def test_http_task_uses_http(self):
+        backends = []
+        self.task_manager.execute_task("HTTP", backends)
+        self.assertEqual(backends, [FETCH_HTTP])
+        self.http_fetcher.fetch.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
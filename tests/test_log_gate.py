@@ -0,0 +1,133 @@
+# tests/test_log_gate.py
+
+import logging
+import multiprocessing
+import threading
+import unittest
+from unittest import mock
+
+from app.utils import log_gate
+from app.utils.log_gate import LogFloodLimiter, set_log_level, shared_log_level, watch_log_level
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def messages(self):
+        return [record.getMessage() for record in self.records]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class LogFloodLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(log_gate.time, "monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_logger(self, **limits):
+        handler = ListHandler()
+        limiter = LogFloodLimiter(handler, **limits)
+        handler.addFilter(limiter)
+        logger = logging.Logger("flood-test", logging.DEBUG)
+        logger.addHandler(handler)
+        return logger, handler, limiter
+
+    def test_repeats_collapse_into_summary(self):
+        logger, handler, limiter = self.make_logger()
+        for _ in range(5):
+            logger.info("страница загружена", extra={'task': "А"})
+        logger.info("готово")
+
+        self.assertEqual(handler.messages(), ["страница загружена",
+                                              "страница загружена (повторено ещё 4 раз)",
+                                              "готово"])
+        # Сводка наследует поля свёрнутой записи
+        self.assertEqual(handler.records[1].task, "А")
+        self.assertEqual(limiter.collapsed, 4)
+        self.assertEqual(limiter.dropped, 0)
+
+    def test_token_bucket_drops_and_reports(self):
+        logger, handler, limiter = self.make_logger(rate=2, burst=3)
+        for i in range(10):
+            logger.info(f"запись {i}")
+        logger.warning("предупреждение")  # WARNING и выше не ограничиваются
+
+        self.assertEqual(handler.messages()[:3], ["запись 0", "запись 1", "запись 2"])
+        self.assertEqual(limiter.dropped, 7)
+        summary = handler.records[3]
+        self.assertEqual(summary.levelno, logging.WARNING)
+        self.assertEqual(summary.getMessage(), "Пропущено записей лога: 7 (превышен лимит 2 записей/с)")
+        self.assertEqual(handler.messages()[4], "предупреждение")
+
+        # Новые пропуски сообщаются не чаще DROP_REPORT_INTERVAL
+        logger.info("сверх лимита")
+        self.clock.now += log_gate.DROP_REPORT_INTERVAL
+        logger.info("после паузы")
+        self.assertEqual(handler.messages()[5:], ["Пропущено записей лога: 1 (превышен лимит 2 записей/с)",
+                                                  "после паузы"])
+
+    def test_flush_sends_pending_summaries(self):
+        logger, handler, limiter = self.make_logger(rate=1, burst=1)
+        logger.info("первая")
+        logger.info("первая")
+        logger.info("вторая")  # Отброшена лимитом
+        limiter.flush()
+
+        self.assertEqual(handler.messages(), [
+            "первая",
+            "первая (повторено ещё 1 раз)",
+            "Пропущено записей лога: 1 (превышен лимит 1 записей/с)",
+            "Не отправлено записей лога: 1 повторов, 1 сверх лимита",
+        ])
+
+
+def _watch_level(shared_level, ready, results):
+    logger = logging.getLogger("log-gate-worker")
+    logger.setLevel(shared_level.value)
+    threading.Thread(target=watch_log_level, args=(shared_level, logger, 0.01), daemon=True).start()
+    ready.set()
+    for _ in range(500):
+        if logger.level == logging.WARNING:
+            break
+        threading.Event().wait(0.01)
+    results.put((logger.level, logger.isEnabledFor(logging.INFO)))
+
+
+class SharedLogLevelTest(unittest.TestCase):
+    def test_level_change_reaches_worker(self):
+        shared_level = shared_log_level()
+        root = logging.getLogger()
+        previous = (shared_level.value, root.level)
+        self.addCleanup(lambda: (setattr(shared_level, 'value', previous[0]), root.setLevel(previous[1])))
+        set_log_level(logging.DEBUG)
+
+        handler = ListHandler()
+        ready = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(target=_watch_level, args=(shared_level, ready, results))
+        process.start()
+        self.addCleanup(process.join, 10)
+        self.assertTrue(ready.wait(10))
+
+        set_log_level(logging.WARNING, handlers=[handler])
+        self.assertEqual(results.get(timeout=10), (logging.WARNING, False))
+        # Главный процесс и обработчики получают уровень сразу
+        self.assertEqual(root.level, logging.WARNING)
+        self.assertEqual(handler.level, logging.WARNING)
+
+
+if __name__ == "__main__":
+    unittest.main()
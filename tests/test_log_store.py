@@ -0,0 +1,195 @@
+# tests/test_log_store.py
+
+import random
+import unittest
+
+from app.design.LogTab.LogFilters import filter_rows
+from app.design.LogTab.LogSearchIndex import LogSearchIndex
+from app.design.LogTab.LogStore import LogStore
+
+WORDS = ["запуск", "задача", "ошибка", "timeout", "страница", "скриншот", "готово"]
+LEVELS = ["INFO", "WARNING", "ERROR"]
+
+
+def make_entries(count, seed=0):
+    # Время растёт с повторами и редкими опозданиями записей
+    rng = random.Random(seed)
+    entries = []
+    timestamp = 1_700_000_000
+    for i in range(count):
+        timestamp += rng.choice((0, 0, 1))
+        late = rng.random() < 0.05
+        message = f"{' '.join(rng.sample(WORDS, 3))} #{i}"
+        entries.append((timestamp - 3 if late else timestamp, rng.choice(LEVELS), message,
+                        rng.randint(1, 3), rng.choice(("А", "Б", None)), None))
+    return entries
+
+
+def brute_force(store, selected_filter, search_text, start, end, fields=None):
+    """
+    Эталон: проверка каждой хранимой записи без индексов.
+    """
+    result = []
+    for row in range(len(store)):
+        timestamp, level, message = store.get(row)
+        record_fields = dict(zip(("process_number", "task", "event"), store.fields_at(row)))
+        key = store.sort_key_at(row)
+        if selected_filter != "Все" and level != selected_filter:
+            continue
+        if search_text and search_text not in message.lower():
+            continue
+        if start is not None and key < start or end is not None and key > end:
+            continue
+        if fields and any(value is not None and record_fields[name] != value
+                          for name, value in fields.items()):
+            continue
+        result.append(store.first_seq + row)
+    return result
+
+
+class LogStoreTimestampTest(unittest.TestCase):
+    def test_out_of_order_record_keeps_its_time(self):
+        store = LogStore(capacity=3)
+        store.extend([(100, "INFO", "первая"), (200, "INFO", "вторая"), (150, "INFO", "опоздавшая")])
+
+        # Показывается исходное время записи, а не время предыдущей
+        self.assertEqual([store.timestamp_at(row) for row in range(3)], [100, 200, 150])
+        # Интервалы по-прежнему находятся двоичным поиском по неубывающему ключу
+        self.assertEqual(store.row_range(200, None), (1, 3))
+        self.assertEqual(store.row_range(None, 199), (0, 1))
+
+    def test_sort_key_survives_eviction(self):
+        store = LogStore(capacity=2)
+        store.extend([(300, "INFO", "a"), (100, "INFO", "b"), (200, "INFO", "c")])
+
+        self.assertEqual([store.timestamp_at(row) for row in range(2)], [100, 200])
+        self.assertEqual(store.row_range(300, 300), (0, 2))
+        store.append(250, "INFO", "d")
+        self.assertEqual(store.timestamp_at(1), 250)
+        self.assertEqual(store.row_range(301, None), (2, 2))
+
+
+class LogSearchWindowTest(unittest.TestCase):
+    """
+    Поиск по индексу окна последних записей и перебор более старых дают то же,
+    что и перебор всей истории.
+    """
+
+    QUERIES = ["ошибка", "timeout", "скриншот готово", "#1", "#12", "задача запуск", "нет такого", "за"]
+
+    def make_store(self, capacity=400, window=50):
+        return LogStore(capacity, LogSearchIndex(window=window))
+
+    def check(self, store):
+        first_time = store.timestamp_at(0) if len(store) else 0
+        # Интервалы по обе стороны от границы окна и поперёк неё
+        intervals = [(None, None), (first_time + 5, None), (None, first_time + 40),
+                     (first_time + 20, first_time + 30)]
+        boundary = store.search_index.first_seq - store.first_seq
+        if 0 < boundary < len(store):
+            key = store.sort_key_at(boundary)
+            intervals += [(key, None), (None, key), (key - 1, key + 1)]
+        for text in self.QUERIES:
+            for selected_filter in ("Все", "ERROR"):
+                for start, end in intervals:
+                    with self.subTest(text=text, level=selected_filter, start=start, end=end):
+                        self.assertEqual(filter_rows(store, selected_filter, text, start, end),
+                                         brute_force(store, selected_filter, text, start, end))
+
+    def test_history_longer_than_window(self):
+        store = self.make_store()
+        store.extend(make_entries(300))
+        self.assertGreater(store.search_index.first_seq, store.first_seq)
+        self.check(store)
+
+    def test_ring_buffer_eviction(self):
+        store = self.make_store()
+        # Записи добавляются пакетами разного размера: сжатие очередей
+        # индекса приходится на разные места
+        entries = make_entries(1500, seed=1)
+        position = 0
+        for size in (1, 7, 49, 50, 51, 333, 400, 559):
+            store.extend(entries[position:position + size])
+            position += size
+            self.check(store)
+        self.assertEqual(len(store), 400)
+        # Очереди индекса хранят не больше compact_after последних записей
+        index = store.search_index
+        self.assertLess(store.next_seq - 1 - index._stored_from, index.compact_after)
+        self.assertTrue(all(posting[0] >= index._stored_from for posting in index.postings.values()))
+
+    def test_evict_and_clear(self):
+        store = self.make_store(window=30)
+        store.extend(make_entries(200, seed=2))
+        store.evict(185)  # Вытеснено и то, что индекс ещё покрывал
+        self.assertGreater(store.first_seq, store.search_index.first_seq)
+        self.check(store)
+
+        store.clear()
+        self.assertEqual(filter_rows(store, "Все", "ошибка", None, None), [])
+        store.extend(make_entries(80, seed=3))
+        self.check(store)
+
+    def test_window_covers_whole_history(self):
+        store = self.make_store(window=1000)
+        store.extend(make_entries(300, seed=4))
+        self.assertEqual(store.search_index.first_seq, store.first_seq)
+        self.check(store)
+
+
+class LogFieldSearchTest(unittest.TestCase):
+    """
+    Выборка по структурным полям через field_postings.
+    """
+
+    FIELD_FILTERS = [{'process_number': 2}, {'task': "А"}, {'task': "Б", 'process_number': 3},
+                     {'task': "В"}, {'process_number': 2, 'task': None}]
+
+    def check(self, store):
+        first_time = store.timestamp_at(0)
+        intervals = [(None, None), (first_time + 10, None), (None, first_time + 30),
+                     (first_time + 15, first_time + 25), (first_time + 10**6, None)]
+        for fields in self.FIELD_FILTERS:
+            for selected_filter, text in (("Все", ""), ("ERROR", ""), ("Все", "ошибка")):
+                for start, end in intervals:
+                    with self.subTest(fields=fields, level=selected_filter, text=text, start=start, end=end):
+                        self.assertEqual(
+                            filter_rows(store, selected_filter, text, start, end, fields),
+                            brute_force(store, selected_filter, text, start, end, fields))
+
+    def test_postings_follow_ring_buffer_eviction(self):
+        store = LogStore(capacity=100)
+        entries = make_entries(1000, seed=5)
+        for position in range(0, 1000, 37):
+            store.extend(entries[position:position + 37])
+            # В очередях — только хранимые записи, по возрастанию seq
+            for key, posting in store.field_postings.items():
+                with self.subTest(position=position, key=key):
+                    self.assertTrue(posting)
+                    self.assertGreaterEqual(posting[0], store.first_seq)
+                    self.assertEqual(list(posting), sorted(posting))
+                    self.assertEqual(store.field_search(dict([key])),
+                                     brute_force(store, "Все", "", None, None, dict([key])))
+        self.check(store)
+
+    def test_evicted_value_disappears(self):
+        store = LogStore(capacity=3)
+        store.extend([(1, "INFO", "a", 1, "старая", None), (2, "INFO", "b", 2, "новая", None)])
+        store.extend([(3, "INFO", "c", 2, "новая", None), (4, "INFO", "d", 2, "новая", None)])
+        self.assertNotIn(('task', "старая"), store.field_postings)
+        self.assertEqual(store.field_search({'task': "старая"}), [])
+        self.assertEqual(store.field_search({'task': "новая"}), [1, 2, 3])
+
+        store.evict(2)
+        self.assertEqual(store.field_search({'process_number': 2}), [3])
+        store.clear()
+        self.assertEqual(store.field_postings, {})
+
+    def test_fields_with_search_index_and_time(self):
+        store = LogStore(capacity=300, search_index=LogSearchIndex(window=40))
+        store.extend(make_entries(700, seed=6))
+        self.check(store)
+
+
+if __name__ == "__main__":
+    unittest.main()
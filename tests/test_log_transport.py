@@ -0,0 +1,48 @@
+# tests/test_log_transport.py
+
+import logging
+import threading
+import unittest
+
+from app.utils.log_transport import OVERFLOW_BLOCK, PipeLogHandler, PipeLogTransport
+
+
+def _record(message, **fields):
+    return logging.makeLogRecord({'name': 'test', 'levelno': logging.INFO, 'levelname': 'INFO',
+                                  'msg': message, **fields})
+
+
+class PipeLogHandlerTest(unittest.TestCase):
+    def setUp(self):
+        self.transport = PipeLogTransport(capacity=2, overflow=OVERFLOW_BLOCK, flush_interval=0.01)
+        self.handler = PipeLogHandler(self.transport.open_channel())
+
+    def tearDown(self):
+        self.handler.close()
+        self.transport.close()
+
+    def test_unpicklable_field_is_sent_as_text(self):
+        lock = threading.Lock()
+        self.handler.handle(_record("запись", task=lock))
+
+        record = self.transport.get(timeout=5)
+        self.assertEqual(record.getMessage(), "запись")
+        self.assertEqual(record.task, str(lock))
+
+    def test_unpicklable_record_does_not_stop_sender(self):
+        prepare = self.handler.prepare
+        self.handler.prepare = lambda record: prepare(record) + (lambda: None,)
+        self.handler.handle(_record("не сериализуется"))
+        self.handler.flush()
+        self.handler.prepare = prepare
+
+        # Буфер на две записи: при остановленном потоке отправки block повис бы
+        for i in range(5):
+            self.handler.handle(_record(f"запись {i}"))
+        received = [self.transport.get(timeout=5).getMessage() for _ in range(5)]
+        self.assertEqual(received, [f"запись {i}" for i in range(5)])
+        self.assertEqual(self.handler.dropped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+# tests/test_ready_waiter.py
+
+import multiprocessing
+import time
+import unittest
+from multiprocessing import Pipe
+
+from app.Logic.WorkerPool import ReadyWaiter
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+
+
+class ReadyWaiterTest(unittest.TestCase):
+    """
+    Оба способа ожидания: постоянный селектор (POSIX) и
+    multiprocessing.connection.wait (Windows и запасной путь).
+    """
+
+    def check_wait(self, use_selector):
+        waiter = ReadyWaiter(use_selector=use_selector)
+        self.addCleanup(waiter.close)
+        reader, writer = Pipe(duplex=False)
+        process = multiprocessing.Process(target=_sleep, args=(0.2,))
+        process.start()
+        self.addCleanup(process.join)
+        objects = [reader, process.sentinel]
+
+        self.assertEqual(waiter.wait([objects], 0), [])
+        writer.send_bytes(b"\0")
+        self.assertEqual(waiter.wait([objects], 5), [reader])
+        reader.recv_bytes()
+
+        # Завершение процесса будит ожидание без таймаута
+        self.assertEqual(waiter.wait([objects], None), [process.sentinel])
+
+        # Новый список объектов (смена процессов) учитывается
+        other_reader, other_writer = Pipe(duplex=False)
+        other_writer.send_bytes(b"\0")
+        self.assertEqual(waiter.wait([[reader, other_reader]], 5), [other_reader])
+
+    def test_selector(self):
+        self.check_wait(use_selector=True)
+
+    def test_connection_wait(self):
+        self.check_wait(use_selector=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+# tests/test_task_registry.py
+
+import json
+import os
+import unittest
+from unittest import mock
+
+from app.design import TaskRegistry as task_registry
+from app.design.TaskRegistry import CACHE_FILE_NAME, TaskRegistry
+from tests.support import make_tasks_directory, write_task
+
+TASK_CODE = '''
+class Task:
+    def __init__(self, shared_resources, process_number, log_queue, log_helper=None, settings=None):
+        pass
+
+    def get_task_name(self):
+        return "{name}"
+
+    def run(self):
+        return {version}
+'''
+
+MANIFEST = '''name: "{name}"
+entry_point: "task:Task"
+{config}
+'''
+
+
+def touch(path, content):
+    # Новое содержимое и сдвинутый mtime: изменение видно и при грубом разрешении времени файлов
+    mtime = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+class TaskRegistryCacheTest(unittest.TestCase):
+    """
+    Кэш обнаружения: какие плагины импортируются при повторном discover().
+    """
+
+    def setUp(self):
+        self.tasks_directory = make_tasks_directory(self)
+        self.cache_path = os.path.join(self.tasks_directory, CACHE_FILE_NAME)
+        for task_dir, name in (("First", "Первая"), ("Second", "Вторая")):
+            write_task(self.tasks_directory, task_dir, TASK_CODE.format(name=name, version=1),
+                       files={"config.yaml": "timeout: 10\n"})
+
+    def discover(self):
+        """
+        :return: Кортеж (реестр, отсортированный список папок импортированных плагинов).
+        """
+        registry = TaskRegistry(self.tasks_directory, cache_path=self.cache_path)
+        with mock.patch.object(TaskRegistry, "_import_task_class", autospec=True,
+                               side_effect=TaskRegistry._import_task_class) as import_task_class:
+            registry.discover()
+        return registry, sorted(call.args[1] for call in import_task_class.call_args_list)
+
+    def test_unchanged_plugins_come_from_cache(self):
+        registry, imported = self.discover()
+        self.assertEqual(imported, ["First", "Second"])
+        self.assertEqual(registry.names(), ["Первая", "Вторая"])
+
+        registry, imported = self.discover()
+        self.assertEqual(imported, [])
+        self.assertEqual(registry.names(), ["Первая", "Вторая"])
+        self.assertEqual(registry.entries["Первая"]["config"], {"timeout": 10})
+        # Класс из кэшированной записи импортируется при первом обращении
+        self.assertEqual(registry.get_task_class("Вторая")(None, None, None).run(), 1)
+
+    def test_config_change_rereads_config_only(self):
+        self.discover()
+        touch(os.path.join(self.tasks_directory, "First", "config.yaml"), "timeout: 25\n")
+
+        registry, imported = self.discover()
+        self.assertEqual(imported, [])
+        self.assertEqual(registry.entries["Первая"]["config"], {"timeout": 25})
+        self.assertEqual(registry.entries["Вторая"]["config"], {"timeout": 10})
+
+    def test_code_change_reimports_that_plugin(self):
+        self.discover()
+        touch(os.path.join(self.tasks_directory, "Second", "task.py"),
+              TASK_CODE.format(name="Вторая (новая)", version=2))
+
+        registry, imported = self.discover()
+        self.assertEqual(imported, ["Second"])
+        self.assertEqual(registry.names(), ["Первая", "Вторая (новая)"])
+        self.assertEqual(registry.get_task_class("Вторая (новая)")(None, None, None).run(), 2)
+
+    def test_new_and_removed_plugins(self):
+        self.discover()
+        write_task(self.tasks_directory, "Third", TASK_CODE.format(name="Третья", version=1))
+        os.remove(os.path.join(self.tasks_directory, "First", "task.py"))
+
+        registry, imported = self.discover()
+        self.assertEqual(imported, ["Third"])
+        self.assertEqual(registry.names(), ["Вторая", "Третья"])
+        with open(self.cache_path, encoding="utf-8") as f:
+            self.assertEqual(sorted(json.load(f)["plugins"]), ["Second", "Third"])
+
+    def test_cache_version_mismatch_reimports_all(self):
+        self.discover()
+        with mock.patch.object(task_registry, "CACHE_VERSION", task_registry.CACHE_VERSION + 1):
+            _, imported = self.discover()
+            self.assertEqual(imported, ["First", "Second"])
+            # Кэш перезаписан в новой версии
+            _, imported = self.discover()
+            self.assertEqual(imported, [])
+
+    def test_other_directory_cache_is_ignored(self):
+        self.discover()
+        with open(self.cache_path, encoding="utf-8") as f:
+            data = json.load(f)
+        data["tasks_directory"] = os.path.join(self.tasks_directory, "elsewhere")
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+        _, imported = self.discover()
+        self.assertEqual(imported, ["First", "Second"])
+
+    def test_corrupt_cache_is_rebuilt(self):
+        self.discover()
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            f.write('{"version": 3, "plugins": {')
+
+        with self.assertLogs(level="WARNING"):
+            registry, imported = self.discover()
+        self.assertEqual(imported, ["First", "Second"])
+        self.assertEqual(registry.names(), ["Первая", "Вторая"])
+        _, imported = self.discover()
+        self.assertEqual(imported, [])
+
+
+class TaskRegistryManifestTest(unittest.TestCase):
+    """
+    Плагины с manifest.yaml: обнаружение без импорта кода задачи.
+    """
+
+    def setUp(self):
+        self.tasks_directory = make_tasks_directory(self)
+        self.cache_path = os.path.join(self.tasks_directory, CACHE_FILE_NAME)
+
+    def write(self, task_dir, name, config="", files=None):
+        return write_task(self.tasks_directory, task_dir, TASK_CODE.format(name=name, version=1),
+                          manifest=MANIFEST.format(name=name, config=config), files=files)
+
+    def discover(self):
+        """
+        :return: Кортеж (реестр, папки плагинов, чьи манифесты прочитаны, число импортов).
+        """
+        registry = TaskRegistry(self.tasks_directory, cache_path=self.cache_path)
+        with mock.patch.object(TaskRegistry, "_read_manifest", autospec=True,
+                               side_effect=TaskRegistry._read_manifest) as read_manifest, \
+                mock.patch.object(TaskRegistry, "_import_task_class", autospec=True,
+                                  side_effect=TaskRegistry._import_task_class) as import_task_class:
+            registry.discover()
+        return (registry, sorted(call.args[1] for call in read_manifest.call_args_list),
+                import_task_class.call_count)
+
+    def test_inline_config(self):
+        self.write("Inline", "Встроенная", config="config:\n  timeout: 5\n  retries: 2")
+
+        registry, manifests, imports = self.discover()
+        self.assertEqual(manifests, ["Inline"])
+        self.assertEqual(imports, 0)
+        self.assertEqual(registry.entries["Встроенная"]["config"], {"timeout": 5, "retries": 2})
+
+        registry, manifests, _ = self.discover()
+        self.assertEqual(manifests, [])
+        self.assertEqual(registry.entries["Встроенная"]["config"], {"timeout": 5, "retries": 2})
+
+    def test_custom_config_path_change_is_picked_up(self):
+        plugin_dir = self.write("Custom", "Своя схема", config='config: "settings/schema.txt"')
+        os.makedirs(os.path.join(plugin_dir, "settings"))
+        schema_path = os.path.join(plugin_dir, "settings", "schema.txt")
+        touch(schema_path, "timeout: 10\n")
+
+        registry, _, imports = self.discover()
+        self.assertEqual(imports, 0)
+        self.assertEqual(registry.entries["Своя схема"]["config"], {"timeout": 10})
+
+        # Файл вне FINGERPRINT_EXTENSIONS и во вложенной папке всё равно входит в отпечаток
+        touch(schema_path, "timeout: 30\n")
+        registry, manifests, imports = self.discover()
+        self.assertEqual((manifests, imports), ([], 0))
+        self.assertEqual(registry.entries["Своя схема"]["config"], {"timeout": 30})
+
+    def test_manifest_switches_config_file(self):
+        plugin_dir = self.write("Switch", "Переключение", files={
+            "config.yaml": "timeout: 1\n", "other.yaml": "timeout: 2\n"})
+        registry, _, _ = self.discover()
+        self.assertEqual(registry.entries["Переключение"]["config"], {"timeout": 1})
+
+        touch(os.path.join(plugin_dir, "manifest.yaml"),
+              MANIFEST.format(name="Переключение", config='config: "other.yaml"'))
+        registry, manifests, _ = self.discover()
+        self.assertEqual(manifests, ["Switch"])
+        self.assertEqual(registry.entries["Переключение"]["config"], {"timeout": 2})
+
+        touch(os.path.join(plugin_dir, "other.yaml"), "timeout: 3\n")
+        registry, manifests, _ = self.discover()
+        self.assertEqual(manifests, [])
+        self.assertEqual(registry.entries["Переключение"]["config"], {"timeout": 3})
+
+    def test_malformed_manifest_is_skipped(self):
+        self.write("Good", "Рабочая")
+        write_task(self.tasks_directory, "BrokenYaml", TASK_CODE.format(name="Сломанная", version=1),
+                   manifest='name: "Сломанная\nentry_point: [')
+        write_task(self.tasks_directory, "NoName", TASK_CODE.format(name="Без имени", version=1),
+                   manifest='entry_point: "task:Task"\n')
+        write_task(self.tasks_directory, "NotMapping", TASK_CODE.format(name="Список", version=1),
+                   manifest='- name\n')
+
+        with self.assertLogs(level="ERROR") as logs:
+            registry, manifests, imports = self.discover()
+        self.assertEqual(registry.names(), ["Рабочая"])
+        self.assertEqual(imports, 0)
+        self.assertEqual(len(logs.records), 3)
+        # Некорректные манифесты не кэшируются и перечитываются при следующем обнаружении
+        with self.assertLogs(level="ERROR"):
+            _, manifests, _ = self.discover()
+        self.assertEqual(manifests, ["BrokenYaml", "NoName", "NotMapping"])
+
+
+if __name__ == "__main__":
+    unittest.main()